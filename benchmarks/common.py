@@ -0,0 +1,62 @@
+import contextlib
+import os
+import statistics
+
+import django
+
+
+def setup_django(settings_module="theater_service_api.settings.prod"):
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+    django.setup()
+
+
+@contextlib.contextmanager
+def test_database():
+    """Create a throwaway database and drop it afterwards"""
+    from django.db import connection
+    from django.test.utils import (
+        setup_test_environment,
+        teardown_test_environment,
+    )
+
+    setup_test_environment()
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+@contextlib.contextmanager
+def throttling_disabled():
+    """Let benchmark traffic through the request throttles"""
+    from theater.throttling import CounterRateThrottle
+
+    allow_request = CounterRateThrottle.allow_request
+    CounterRateThrottle.allow_request = lambda self, request, view: True
+    try:
+        yield
+    finally:
+        CounterRateThrottle.allow_request = allow_request
+
+
+def percentile(values, percent):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, int(len(values) * percent / 100))
+    return values[index]
+
+
+def report_latencies(title, latencies):
+    """Print count, mean and tail latencies in milliseconds"""
+    milliseconds = [latency * 1000 for latency in latencies]
+    print(
+        f"{title}: n={len(milliseconds)} "
+        f"mean={statistics.fmean(milliseconds) if milliseconds else 0:.2f}ms "
+        f"p50={percentile(milliseconds, 50):.2f}ms "
+        f"p95={percentile(milliseconds, 95):.2f}ms "
+        f"p99={percentile(milliseconds, 99):.2f}ms"
+    )
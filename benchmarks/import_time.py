@@ -0,0 +1,98 @@
+"""
+Cold-start import time of an API worker per settings profile.
+
+Each profile is started in a fresh interpreter under ``python -X importtime``
+that loads the WSGI application and the URLconf, which is what a worker
+does before it can serve its first request. The report shows the total
+import time and the heaviest top-level packages.
+
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --profiles prod --runs 10 --top 15
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+WORKER_STARTUP = (
+    "from theater_service_api.wsgi import application; "
+    "from django.urls import get_resolver; "
+    "get_resolver().url_patterns"
+)
+
+
+def import_times(settings_module):
+    """Self import time in microseconds of every module, in import order"""
+    env = {
+        **os.environ,
+        "DJANGO_SETTINGS_MODULE": settings_module,
+        "DJANGO_SECRET_KEY": os.getenv("DJANGO_SECRET_KEY") or "benchmark",
+    }
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", WORKER_STARTUP],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, _, module = line[len("import time:"):].split("|")
+        times.append((module.strip(), int(self_us)))
+    return times
+
+
+def measure(settings_module, runs):
+    totals = []
+    by_package = defaultdict(list)
+
+    for _ in range(runs):
+        times = import_times(settings_module)
+        totals.append(sum(self_us for _, self_us in times) / 1000)
+
+        packages = defaultdict(int)
+        for module, self_us in times:
+            packages[module.split(".")[0]] += self_us
+        for package, self_us in packages.items():
+            by_package[package].append(self_us / 1000)
+
+    return totals, {
+        package: statistics.median(values)
+        for package, values in by_package.items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument(
+        "--profiles",
+        nargs="+",
+        default=["dev", "prod"],
+        choices=["dev", "prod"],
+    )
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    for profile in args.profiles:
+        totals, packages = measure(
+            f"theater_service_api.settings.{profile}", args.runs
+        )
+        print(
+            f"{profile}: median={statistics.median(totals):.1f}ms "
+            f"min={min(totals):.1f}ms max={max(totals):.1f}ms "
+            f"packages={len(packages)}"
+        )
+        heaviest = sorted(packages.items(), key=lambda item: -item[1])
+        for package, milliseconds in heaviest[: args.top]:
+            print(f"  {package:<32} {milliseconds:8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
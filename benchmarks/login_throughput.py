@@ -0,0 +1,161 @@
+"""
+Login throughput and its effect on concurrent reservation latency.
+
+Reservation latency is measured once on an idle server and once while
+login threads hammer the token endpoint. Run it against PostgreSQL (the
+POSTGRES_* variables from .env); data goes to a throwaway test database.
+
+    python -m benchmarks.login_throughput
+    python -m benchmarks.login_throughput --no-pool
+"""
+
+import argparse
+import threading
+import time
+from datetime import timedelta
+
+from benchmarks.common import (
+    report_latencies,
+    setup_django,
+    test_database,
+    throttling_disabled,
+)
+
+setup_django()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.urls import reverse  # noqa: E402
+from django.utils import timezone  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from theater.models import Performance, Play, TheaterHall  # noqa: E402
+from user.hashing import hashing_pool  # noqa: E402
+
+TOKEN_URL = reverse("user:token_obtain_pair")
+RESERVATION_URL = reverse("theater:reservation-list")
+PASSWORD = "1qazcde3"
+
+
+def create_fixtures(args):
+    users = [
+        get_user_model().objects.create_user(
+            email=f"user_{index}@test.com", password=PASSWORD
+        )
+        for index in range(max(args.login_threads, args.booking_threads))
+    ]
+    hall = TheaterHall.objects.create(
+        name="benchmark_hall",
+        rows=args.booking_threads,
+        seats_in_row=args.reservations * 2,
+    )
+    performance = Performance.objects.create(
+        play=Play.objects.create(title="benchmark_play"),
+        theater_hall=hall,
+        show_time=timezone.now() + timedelta(days=1),
+    )
+    return users, performance
+
+
+def book_seats(user, performance, row, seats, latencies):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    try:
+        for seat in seats:
+            payload = {
+                "tickets": [
+                    {"row": row, "seat": seat, "performance": performance.id}
+                ]
+            }
+            started = time.perf_counter()
+            client.post(RESERVATION_URL, payload, format="json")
+            latencies.append(time.perf_counter() - started)
+    finally:
+        connection.close()
+
+
+def log_in(user, stop, statuses):
+    client = APIClient()
+    payload = {"email": user.email, "password": PASSWORD}
+    try:
+        while not stop.is_set():
+            response = client.post(TOKEN_URL, payload)
+            statuses.append(response.status_code)
+    finally:
+        connection.close()
+
+
+def run_bookings(users, performance, args, first_seat):
+    latencies = []
+    seats = range(first_seat, first_seat + args.reservations)
+    threads = [
+        threading.Thread(
+            target=book_seats,
+            args=(users[index], performance, index + 1, seats, latencies),
+        )
+        for index in range(args.booking_threads)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--login-threads", type=int, default=16)
+    parser.add_argument("--booking-threads", type=int, default=4)
+    parser.add_argument("--reservations", type=int, default=50)
+    parser.add_argument(
+        "--no-pool",
+        action="store_true",
+        help="hash passwords inline to compare against the pool",
+    )
+    args = parser.parse_args()
+
+    if args.no_pool:
+        hashing_pool.run = lambda func, *func_args: func(*func_args)
+
+    with test_database(), throttling_disabled():
+        users, performance = create_fixtures(args)
+
+        report_latencies(
+            "reservations, idle",
+            run_bookings(users, performance, args, first_seat=1),
+        )
+
+        stop = threading.Event()
+        statuses = []
+        login_threads = [
+            threading.Thread(
+                target=log_in, args=(users[index], stop, statuses)
+            )
+            for index in range(args.login_threads)
+        ]
+        started = time.perf_counter()
+        for thread in login_threads:
+            thread.start()
+
+        latencies = run_bookings(
+            users, performance, args, first_seat=args.reservations + 1
+        )
+
+        stop.set()
+        for thread in login_threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        report_latencies("reservations, during login spike", latencies)
+        succeeded = statuses.count(200)
+        print(
+            f"logins: {succeeded / elapsed:.1f}/s succeeded, "
+            f"{statuses.count(503)} shed with 503 "
+            f"out of {len(statuses)} in {elapsed:.1f}s"
+        )
+
+    hashing_pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
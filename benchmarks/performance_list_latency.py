@@ -0,0 +1,123 @@
+"""
+Per-request latency of the performance list endpoint.
+
+Requests go through Django's WSGI handler with the request_started and
+request_finished signals intact, so connections are opened, reused or
+returned to the pool exactly like in production. Run it against
+PostgreSQL once per connection setup and compare the reports:
+
+    POSTGRES_CONN_MAX_AGE=0 python -m benchmarks.performance_list_latency
+    POSTGRES_CONN_MAX_AGE=60 python -m benchmarks.performance_list_latency
+    POSTGRES_POOL=true python -m benchmarks.performance_list_latency
+"""
+
+import argparse
+import io
+import threading
+import time
+from datetime import timedelta
+
+from benchmarks.common import (
+    report_latencies,
+    setup_django,
+    test_database,
+    throttling_disabled,
+)
+
+setup_django()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.core.handlers.wsgi import WSGIHandler  # noqa: E402
+from django.urls import reverse  # noqa: E402
+from django.utils import timezone  # noqa: E402
+from rest_framework_simplejwt.tokens import AccessToken  # noqa: E402
+
+from theater.models import Performance, Play, TheaterHall  # noqa: E402
+
+PERFORMANCE_URL = reverse("theater:performance-list")
+
+
+def create_fixtures(performances):
+    user = get_user_model().objects.create_user(
+        email="user@test.com", password="1qazcde3"
+    )
+    play = Play.objects.create(title="benchmark_play", duration=60)
+    hall = TheaterHall.objects.create(
+        name="benchmark_hall", rows=20, seats_in_row=20
+    )
+    tomorrow = timezone.now() + timedelta(days=1)
+    Performance.objects.bulk_create(
+        Performance(
+            play=play,
+            theater_hall=hall,
+            show_time=tomorrow + timedelta(hours=index),
+            end_time=tomorrow + timedelta(hours=index + 1),
+        )
+        for index in range(performances)
+    )
+    return AccessToken.for_user(user)
+
+
+def request(handler, token):
+    environ = {
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": PERFORMANCE_URL,
+        "QUERY_STRING": "",
+        "SERVER_NAME": "testserver",
+        "SERVER_PORT": "80",
+        "HTTP_HOST": "testserver",
+        "HTTP_AUTHORIZATION": f"Bearer {token}",
+        "wsgi.url_scheme": "http",
+        "wsgi.input": io.BytesIO(),
+        "wsgi.errors": io.StringIO(),
+    }
+    started = time.perf_counter()
+    response = handler(environ, lambda status, headers: None)
+    b"".join(response)
+    response.close()
+    return time.perf_counter() - started
+
+
+def run_client(handler, token, requests, latencies):
+    for _ in range(requests):
+        latencies.append(request(handler, token))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--performances", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    database = settings.DATABASES["default"]
+    print(
+        f"CONN_MAX_AGE={database['CONN_MAX_AGE']} "
+        f"pool={database['OPTIONS'].get('pool')} "
+        f"server_side_binding={database['OPTIONS'].get('server_side_binding')}"
+    )
+
+    with test_database(), throttling_disabled():
+        token = create_fixtures(args.performances)
+        handler = WSGIHandler()
+        request(handler, token)
+
+        latencies = []
+        threads = [
+            threading.Thread(
+                target=run_client,
+                args=(handler, token, args.requests, latencies),
+            )
+            for _ in range(args.threads)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        report_latencies("GET performances", latencies)
+
+
+if __name__ == "__main__":
+    main()
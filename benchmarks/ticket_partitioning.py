@@ -0,0 +1,198 @@
+"""
+Booking and availability latency with a large ticket table.
+
+Fills a throwaway PostgreSQL database with --tickets tickets spread over
+--days days of performances, optionally converts the ticket table to a
+partitioned one, then times reservations and the availability reads that
+hit the ticket table. Compare a plain and a partitioned run:
+
+    python -m benchmarks.ticket_partitioning
+    python -m benchmarks.ticket_partitioning --partitioned
+"""
+
+import argparse
+import math
+import time
+from datetime import timedelta
+
+from benchmarks.common import (
+    report_latencies,
+    setup_django,
+    test_database,
+    throttling_disabled,
+)
+
+setup_django()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.urls import reverse  # noqa: E402
+from django.utils import timezone  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from theater.models import Performance, Play, TheaterHall  # noqa: E402
+from theater.rollups import refresh_days, show_date  # noqa: E402
+
+RESERVATION_URL = reverse("theater:reservation-list")
+PERFORMANCE_URL = reverse("theater:performance-list")
+
+# Performances of a day are a minute apart, as long as the play lasts
+INSERT_PERFORMANCES_SQL = """
+    INSERT INTO theater_performance
+        (play_id, theater_hall_id, show_time, end_time)
+    SELECT %(play)s, %(hall)s, show_time, show_time + interval '1 minute'
+    FROM (
+        SELECT %(start)s::timestamptz
+            + mod(i, %(days)s) * interval '1 day'
+            + (i / %(days)s) * interval '1 minute' AS show_time
+        FROM generate_series(0, %(count)s - 1) AS i
+    ) AS schedule
+"""
+
+INSERT_RESERVATIONS_SQL = """
+    INSERT INTO theater_reservation (created_at, user_id)
+    SELECT now(), %(user)s FROM generate_series(1, %(count)s)
+"""
+
+# Every row but the last is sold, the last one is left for bookings
+INSERT_TICKETS_SQL = """
+    INSERT INTO theater_ticket
+        ("row", seat, performance_id, reservation_id, show_date)
+    SELECT seat_row, seat, performance.id, reservation.id,
+        (performance.show_time AT TIME ZONE %(time_zone)s)::date
+    FROM (
+        SELECT id, show_time, row_number() OVER (ORDER BY id) AS number
+        FROM theater_performance
+    ) AS performance
+    JOIN (
+        SELECT id, row_number() OVER (ORDER BY id) AS number
+        FROM theater_reservation
+    ) AS reservation ON reservation.number = performance.number
+    CROSS JOIN generate_series(1, %(rows)s - 1) AS seat_row
+    CROSS JOIN generate_series(1, %(seats)s) AS seat
+    LIMIT %(tickets)s
+"""
+
+
+def create_fixtures(args):
+    user = get_user_model().objects.create_user(
+        email="user@test.com", password="1qazcde3"
+    )
+    play = Play.objects.create(title="benchmark_play", duration=1)
+    hall = TheaterHall.objects.create(
+        name="benchmark_hall", rows=args.rows, seats_in_row=args.seats
+    )
+    count = math.ceil(args.tickets / ((args.rows - 1) * args.seats))
+    params = {
+        "play": play.id,
+        "hall": hall.id,
+        "user": user.id,
+        "start": timezone.now() - timedelta(days=args.days // 2),
+        "days": args.days,
+        "count": count,
+        "rows": args.rows,
+        "seats": args.seats,
+        "tickets": args.tickets,
+        "time_zone": settings.TIME_ZONE,
+    }
+
+    started = time.perf_counter()
+    with connection.cursor() as cursor:
+        cursor.execute(INSERT_PERFORMANCES_SQL, params)
+        cursor.execute(INSERT_RESERVATIONS_SQL, params)
+        cursor.execute(INSERT_TICKETS_SQL, params)
+        cursor.execute("ANALYZE")
+    print(
+        f"loaded {args.tickets} tickets for {count} performances "
+        f"in {time.perf_counter() - started:.1f}s"
+    )
+    return user
+
+
+def timed(func, *args):
+    started = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--tickets", type=int, default=10_000_000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--rows", type=int, default=20)
+    parser.add_argument("--seats", type=int, default=25)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument(
+        "--partitioned",
+        action="store_true",
+        help="convert the ticket table to monthly partitions first",
+    )
+    args = parser.parse_args()
+
+    with test_database(), throttling_disabled():
+        user = create_fixtures(args)
+
+        if args.partitioned:
+            started = time.perf_counter()
+            call_command("partition_tickets", convert=True)
+            print(f"partitioned in {time.perf_counter() - started:.1f}s")
+
+        client = APIClient()
+        client.force_authenticate(user=user)
+        upcoming = list(
+            Performance.objects.filter(show_time__gt=timezone.now())
+            .order_by("id")
+            .values_list("id", "show_time")[: args.requests]
+        )
+
+        report_latencies(
+            "book a seat",
+            [
+                timed(
+                    client.post,
+                    RESERVATION_URL,
+                    {
+                        "tickets": [
+                            {
+                                "row": args.rows,
+                                "seat": 1,
+                                "performance": performance_id,
+                            }
+                        ]
+                    },
+                    "json",
+                )
+                for performance_id, _ in upcoming
+            ],
+        )
+        report_latencies(
+            "performance list for a day",
+            [
+                timed(
+                    client.get,
+                    PERFORMANCE_URL,
+                    {"date": show_time.date().isoformat()},
+                )
+                for _, show_time in upcoming
+            ],
+        )
+        report_latencies(
+            "performance detail with taken seats",
+            [
+                timed(client.get, f"{PERFORMANCE_URL}{performance_id}/")
+                for performance_id, _ in upcoming
+            ],
+        )
+        report_latencies(
+            "daily availability refresh",
+            [
+                timed(refresh_days, [show_date(show_time)])
+                for _, show_time in upcoming
+            ],
+        )
+
+
+if __name__ == "__main__":
+    main()
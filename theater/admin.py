@@ -1,6 +1,14 @@
-from django.contrib import admin
+from collections import defaultdict
+
+from django.contrib import admin, messages
 from django.contrib.auth.models import Group
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils import timezone
+from django.utils.functional import cached_property
 
+from theater.cancellation import cancel_tickets
+from theater.rollups import record_tickets
 from theater.models import (
     Actor,
     TheaterHall,
@@ -9,14 +17,195 @@ from theater.models import (
     Ticket,
     Genre,
     Play,
+    ArchivedReservation,
+    ArchivedTicket,
+    SalesRollup,
 )
 
+# Tables estimated to hold fewer rows than this are counted exactly
+EXACT_COUNT_THRESHOLD = 10_000
+
+# Planner row estimate of a table, summed over its partitions if any
+ESTIMATED_COUNT_SQL = """
+    SELECT coalesce(sum(greatest(reltuples, 0)), 0)::bigint
+    FROM pg_class
+    WHERE oid = %s::regclass
+        OR oid IN (
+            SELECT inhrelid FROM pg_inherits WHERE inhparent = %s::regclass
+        )
+"""
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator reading the row count of unfiltered changelists from the
+    PostgreSQL planner statistics instead of running ``COUNT(*)``.
+
+    Filtered changelists, small tables and other databases are counted
+    exactly.
+    """
+
+    def _estimated_count(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if connection.vendor != "postgresql" or queryset.query.where:
+            return None
+
+        table = queryset.model._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(ESTIMATED_COUNT_SQL, [table, table])
+            estimate = cursor.fetchone()[0]
+        return estimate if estimate >= EXACT_COUNT_THRESHOLD else None
+
+    @cached_property
+    def count(self):
+        estimate = self._estimated_count()
+        if estimate is None:
+            return super().count
+        return estimate
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """Changelist settings for tables growing with every booking"""
+
+    paginator = EstimatedCountPaginator
+    # Skip the second, unfiltered count on filtered changelists
+    show_full_result_count = False
+
+
 admin.site.unregister(Group)
 
-admin.site.register(Actor)
-admin.site.register(Genre)
-admin.site.register(Play)
-admin.site.register(TheaterHall)
-admin.site.register(Performance)
-admin.site.register(Reservation)
-admin.site.register(Ticket)
+
+@admin.register(Actor)
+class ActorAdmin(admin.ModelAdmin):
+    list_display = ("first_name", "last_name")
+    search_fields = ("first_name", "last_name")
+
+
+@admin.register(Genre)
+class GenreAdmin(admin.ModelAdmin):
+    search_fields = ("name",)
+
+
+@admin.register(Play)
+class PlayAdmin(admin.ModelAdmin):
+    list_display = ("title",)
+    search_fields = ("title",)
+    autocomplete_fields = ("actors", "genres")
+
+
+@admin.register(TheaterHall)
+class TheaterHallAdmin(admin.ModelAdmin):
+    list_display = ("name", "rows", "seats_in_row")
+    search_fields = ("name",)
+
+
+@admin.register(Performance)
+class PerformanceAdmin(admin.ModelAdmin):
+    list_display = ("id", "play", "theater_hall", "show_time")
+    list_select_related = ("play", "theater_hall")
+    list_filter = ("theater_hall",)
+    date_hierarchy = "show_time"
+    search_fields = ("play__title",)
+    autocomplete_fields = ("play", "theater_hall")
+
+
+@admin.register(Reservation)
+class ReservationAdmin(LargeTableAdmin):
+    list_display = ("id", "user", "created_at")
+    list_select_related = ("user",)
+    raw_id_fields = ("user",)
+    actions = ("cancel_reservations",)
+
+    @admin.action(description="Cancel selected reservations")
+    def cancel_reservations(self, request, queryset):
+        # Like the API, leave tickets of started performances alone
+        started = set(
+            queryset.filter(
+                tickets__performance__show_time__lte=timezone.now()
+            ).values_list("id", flat=True)
+        )
+        released = sum(
+            len(cancel_tickets(reservation))
+            for reservation in queryset.exclude(id__in=started)
+        )
+        self.message_user(request, f"Released {released} seats.")
+        if started:
+            self.message_user(
+                request,
+                f"Skipped {len(started)} reservations of performances "
+                "that have started.",
+                messages.WARNING,
+            )
+
+    def delete_model(self, request, obj):
+        # Release the seats through the rollups
+        if not cancel_tickets(obj):
+            super().delete_model(request, obj)
+
+    def delete_queryset(self, request, queryset):
+        for reservation in queryset:
+            self.delete_model(request, reservation)
+
+
+@admin.register(Ticket)
+class TicketAdmin(LargeTableAdmin):
+    list_display = ("id", "performance", "row", "seat", "show_date")
+    list_select_related = ("performance__play",)
+    list_filter = ("show_date",)
+    date_hierarchy = "show_date"
+    autocomplete_fields = ("performance",)
+    raw_id_fields = ("reservation",)
+
+    def save_model(self, request, obj, form, change):
+        # Count the ticket in the rollups like a sale through the API
+        moved = {"performance", "reservation"} & set(form.changed_data)
+        if change and not moved:
+            return super().save_model(request, obj, form, change)
+
+        if change:
+            previous = Ticket.objects.select_related(
+                "performance", "reservation"
+            ).get(pk=obj.pk)
+        super().save_model(request, obj, form, change)
+        if change:
+            record_tickets(
+                [previous], sign=-1, moment=previous.reservation.created_at
+            )
+        record_tickets([obj], moment=obj.reservation.created_at)
+
+    def delete_model(self, request, obj):
+        cancel_tickets(obj.reservation, [obj.id])
+
+    def delete_queryset(self, request, queryset):
+        ticket_ids = defaultdict(list)
+        for reservation_id, ticket_id in queryset.values_list(
+            "reservation_id", "id"
+        ):
+            ticket_ids[reservation_id].append(ticket_id)
+
+        for reservation in Reservation.objects.filter(id__in=ticket_ids):
+            cancel_tickets(reservation, ticket_ids[reservation.id])
+
+
+@admin.register(ArchivedReservation)
+class ArchivedReservationAdmin(LargeTableAdmin):
+    list_display = ("id", "user", "created_at", "archived_at")
+    list_select_related = ("user",)
+    raw_id_fields = ("user",)
+
+
+@admin.register(ArchivedTicket)
+class ArchivedTicketAdmin(LargeTableAdmin):
+    list_display = ("id", "performance", "row", "seat")
+    list_select_related = ("performance__play",)
+    autocomplete_fields = ("performance",)
+    raw_id_fields = ("reservation",)
+
+
+@admin.register(SalesRollup)
+class SalesRollupAdmin(LargeTableAdmin):
+    list_display = ("performance", "hour", "tickets")
+    list_select_related = ("performance__play",)
+    date_hierarchy = "hour"
+    autocomplete_fields = ("performance",)
@@ -0,0 +1,103 @@
+"""
+Sales reports served from the hourly SalesRollup table.
+
+Every report aggregates rollup rows, joined to performances, plays and
+halls where needed, and never reads tickets.
+"""
+
+from datetime import timedelta
+
+from django.db.models import F, FloatField, Sum
+from django.db.models.functions import Cast, Coalesce, NullIf, TruncDate
+from django.utils import timezone
+
+from theater.models import Performance, SalesRollup
+from theater.rollups import sale_hour
+
+
+def sales_between(date_from=None, date_to=None):
+    """Rollup rows of sales made between the two dates, both inclusive"""
+    queryset = SalesRollup.objects.all()
+    if date_from:
+        queryset = queryset.filter(hour__date__gte=date_from)
+    if date_to:
+        queryset = queryset.filter(hour__date__lte=date_to)
+    return queryset
+
+
+def sales_by_play(sales):
+    return (
+        sales.values(play=F("performance__play_id"))
+        .annotate(
+            title=F("performance__play__title"),
+            tickets_sold=Sum("tickets"),
+        )
+        .order_by("-tickets_sold", "title")
+    )
+
+
+def sales_by_hall(sales):
+    return (
+        sales.values(theater_hall=F("performance__theater_hall_id"))
+        .annotate(
+            name=F("performance__theater_hall__name"),
+            tickets_sold=Sum("tickets"),
+        )
+        .order_by("-tickets_sold", "name")
+    )
+
+
+def sales_by_day(sales):
+    return (
+        sales.annotate(date=TruncDate("hour"))
+        .values("date")
+        .annotate(tickets_sold=Sum("tickets"))
+        .order_by("date")
+    )
+
+
+def performance_occupancy(performances=None):
+    """Share of each performance's hall sold, from all rollup rows"""
+    if performances is None:
+        performances = Performance.objects.all()
+    capacity = F("theater_hall__rows") * F("theater_hall__seats_in_row")
+    return (
+        performances.annotate(
+            title=F("play__title"),
+            capacity=capacity,
+            tickets_sold=Coalesce(Sum("sales__tickets"), 0),
+        )
+        .annotate(
+            occupancy=Cast("tickets_sold", FloatField())
+            / NullIf(Cast("capacity", FloatField()), 0.0)
+        )
+        .values(
+            "id", "title", "show_time", "capacity", "tickets_sold", "occupancy"
+        )
+        .order_by("show_time")
+    )
+
+
+def sales_velocity(now=None) -> dict:
+    """
+    Tickets sold over the last hour, estimated from the hourly buckets.
+
+    The current bucket counts fully and the previous one in proportion to
+    the part of it still inside the sliding hour.
+    """
+    now = now or timezone.now()
+    current = sale_hour(now)
+    previous = current - timedelta(hours=1)
+    totals = dict(
+        SalesRollup.objects.filter(hour__in=[previous, current])
+        .values_list("hour")
+        .annotate(tickets=Sum("tickets"))
+        .order_by()
+    )
+
+    elapsed = (now - current) / timedelta(hours=1)
+    tickets = totals.get(current, 0) + totals.get(previous, 0) * (1 - elapsed)
+    return {
+        "tickets_last_hour": round(tickets),
+        "tickets_per_minute": round(tickets / 60, 2),
+    }
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class TheaterConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "theater"
+
+    def ready(self):
+        from theater import signals  # noqa: F401
+        from theater_service_api import schema  # noqa: F401
@@ -0,0 +1,69 @@
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+
+from theater.models import (
+    ArchivedReservation,
+    ArchivedTicket,
+    Reservation,
+    Ticket,
+)
+
+
+def archivable_reservations(cutoff):
+    """Reservations whose every ticket is for a performance before cutoff"""
+    tickets = Ticket.objects.filter(reservation=OuterRef("pk"))
+    return Reservation.objects.filter(
+        Exists(tickets.filter(performance__show_time__lt=cutoff)),
+        ~Exists(tickets.filter(performance__show_time__gte=cutoff)),
+    )
+
+
+def archive_batch(reservation_ids) -> tuple[int, int]:
+    """
+    Move the reservations and their tickets to the archive tables.
+
+    Runs in one transaction so a batch is either fully archived or left
+    in place. Returns the number of reservations and tickets moved.
+    """
+    with transaction.atomic():
+        reservations = list(
+            Reservation.objects.select_for_update()
+            .filter(id__in=reservation_ids)
+            .values("id", "created_at", "user_id")
+        )
+        ids = [reservation["id"] for reservation in reservations]
+        tickets = list(
+            Ticket.objects.filter(reservation_id__in=ids).values(
+                "id", "row", "seat", "performance_id", "reservation_id"
+            )
+        )
+
+        ArchivedReservation.objects.bulk_create(
+            ArchivedReservation(**reservation) for reservation in reservations
+        )
+        ArchivedTicket.objects.bulk_create(
+            ArchivedTicket(**ticket) for ticket in tickets
+        )
+
+        Ticket.objects.filter(reservation_id__in=ids).delete()
+        Reservation.objects.filter(id__in=ids).delete()
+
+    return len(reservations), len(tickets)
+
+
+def archive_reservations(cutoff, batch_size):
+    """Archive reservations before cutoff, yields totals of every batch"""
+    last_id = 0
+
+    while True:
+        reservation_ids = list(
+            archivable_reservations(cutoff)
+            .filter(id__gt=last_id)
+            .order_by("id")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        if not reservation_ids:
+            return
+
+        last_id = reservation_ids[-1]
+        yield archive_batch(reservation_ids)
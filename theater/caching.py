@@ -0,0 +1,118 @@
+import contextvars
+import threading
+import time
+
+from django.core.cache import cache
+from django.db import connections
+
+CATALOG_VERSION_KEY = "theater:catalog-version"
+
+# Seconds a refresh may hold a key before another worker may take over
+REFRESH_LOCK_TIMEOUT = 30
+
+# How long and how often callers missing a key poll for the value being
+# computed by another worker, before computing it themselves
+MISS_WAIT_TIMEOUT = 3.0
+MISS_POLL_INTERVAL = 0.05
+
+
+def _get_version(key: str) -> int:
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def _bump_version(key: str) -> None:
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+def _performance_version_key(performance_id) -> str:
+    return f"theater:performance-version:{performance_id}"
+
+
+def get_catalog_version() -> int:
+    """Version of the catalog data, part of derived cache keys"""
+    return _get_version(CATALOG_VERSION_KEY)
+
+
+def bump_catalog_version() -> None:
+    """Invalidate every cache entry derived from the catalog"""
+    _bump_version(CATALOG_VERSION_KEY)
+
+
+def get_performance_version(performance_id) -> int:
+    """Version of the taken seats of one performance"""
+    return _get_version(_performance_version_key(performance_id))
+
+
+def bump_performance_version(performance_id) -> None:
+    """Invalidate the cached seat map of a performance"""
+    _bump_version(_performance_version_key(performance_id))
+
+
+def _lock_key(key: str) -> str:
+    return f"{key}:refresh-lock"
+
+
+def _store(key: str, value, soft_ttl: float, hard_ttl: float):
+    cache.set(key, (value, time.time() + soft_ttl), hard_ttl)
+    return value
+
+
+def _refresh_in_background(key, compute, soft_ttl, hard_ttl):
+    context = contextvars.copy_context()
+
+    def refresh():
+        try:
+            _store(key, context.run(compute), soft_ttl, hard_ttl)
+        finally:
+            cache.delete(_lock_key(key))
+            connections.close_all()
+
+    thread = threading.Thread(target=refresh, daemon=True)
+    thread.start()
+    return thread
+
+
+def get_or_refresh(key: str, compute, soft_ttl: float, hard_ttl: float):
+    """
+    Value of a hot cache key, computed by one caller at a time.
+
+    A value is fresh for ``soft_ttl`` seconds. After that it is still
+    served, stale, while the first caller to notice refreshes it in a
+    background thread, until it expires after ``hard_ttl`` seconds. On a
+    miss one caller computes the value and the others wait for it instead
+    of running the same query, falling back to computing it themselves
+    after ``MISS_WAIT_TIMEOUT`` seconds.
+    """
+    entry = cache.get(key)
+    if entry is not None:
+        value, fresh_until = entry
+        if time.time() >= fresh_until and cache.add(
+            _lock_key(key), 1, REFRESH_LOCK_TIMEOUT
+        ):
+            _refresh_in_background(key, compute, soft_ttl, hard_ttl)
+        return value
+
+    if cache.add(_lock_key(key), 1, REFRESH_LOCK_TIMEOUT):
+        try:
+            return _store(key, compute(), soft_ttl, hard_ttl)
+        finally:
+            cache.delete(_lock_key(key))
+
+    deadline = time.monotonic() + MISS_WAIT_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(MISS_POLL_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry[0]
+        if cache.get(_lock_key(key)) is None:
+            # The computing caller failed, e.g. with a 404
+            break
+
+    return compute()
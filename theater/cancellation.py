@@ -0,0 +1,69 @@
+from collections import defaultdict
+from functools import partial
+
+from django.db import transaction
+
+from theater.models import Performance, Reservation, Ticket
+from theater.rollups import record_tickets
+from theater.signals import seats_released
+
+
+def _publish(released) -> None:
+    seats = defaultdict(list)
+    for ticket in released:
+        seats[ticket.performance_id].append((ticket.row, ticket.seat))
+
+    for performance_id, performance_seats in seats.items():
+        seats_released.send(
+            sender=Performance,
+            performance_id=performance_id,
+            seats=performance_seats,
+        )
+
+
+def cancel_tickets(reservation, ticket_ids=None) -> list[Ticket]:
+    """
+    Cancel the tickets of a reservation, all of them unless ticket_ids is
+    given, and return the cancelled ones.
+
+    The seats are released with a single DELETE, which together with the
+    rollup updates runs in one transaction. A reservation left without
+    tickets is deleted with them. Once committed, ``seats_released`` is
+    sent for each performance.
+    """
+    if ticket_ids is not None:
+        ticket_ids = set(ticket_ids)
+
+    with transaction.atomic():
+        # Serializes concurrent cancellations of the reservation
+        reservation = Reservation.objects.select_for_update().get(
+            pk=reservation.pk
+        )
+        tickets = list(
+            Ticket.objects.filter(reservation=reservation).select_related(
+                "performance"
+            )
+        )
+        released = [
+            ticket
+            for ticket in tickets
+            if ticket_ids is None or ticket.id in ticket_ids
+        ]
+        if not released:
+            return []
+
+        if len(released) == len(tickets):
+            # Cascades to the tickets with one DELETE ... WHERE reservation_id
+            reservation.delete()
+        else:
+            # show_date lets a partitioned table skip the other partitions
+            Ticket.objects.filter(
+                id__in=[ticket.id for ticket in released],
+                show_date__in={ticket.show_date for ticket in released},
+            ).delete()
+
+        # Sales drop out of the hour they were made in
+        record_tickets(released, sign=-1, moment=reservation.created_at)
+        transaction.on_commit(partial(_publish, released))
+
+    return released
@@ -0,0 +1,68 @@
+import hashlib
+
+from django.core.cache import cache
+from django.db.models import Count
+
+from theater.caching import get_catalog_version
+from theater.models import Play
+
+FACETS_CACHE_TIMEOUT = 300
+
+# facet name -> (through model, related id column, related value fields)
+PLAY_FACETS = {
+    "genres": (Play.genres.through, "genre_id", ("genre__name",)),
+    "actors": (
+        Play.actors.through,
+        "actor_id",
+        ("actor__first_name", "actor__last_name"),
+    ),
+}
+
+
+def facets_signature(query_params) -> str:
+    """Stable hash of the filters that shape the facet counts"""
+    items = sorted(
+        (key, value)
+        for key in query_params
+        if key not in ("facets", "page", "page-size")
+        for value in query_params.getlist(key)
+    )
+    return hashlib.md5(repr(items).encode()).hexdigest()
+
+
+def _count_facet(play_ids, name) -> list[dict]:
+    through, id_field, value_fields = PLAY_FACETS[name]
+    rows = (
+        through.objects.filter(play_id__in=play_ids)
+        .values(id_field, *value_fields)
+        .annotate(count=Count("play_id"))
+        .order_by("-count", id_field)
+    )
+    return [
+        {
+            "id": row[id_field],
+            "name": " ".join(row[field] for field in value_fields),
+            "count": row["count"],
+        }
+        for row in rows
+    ]
+
+
+def get_play_facets(queryset, names, signature) -> dict:
+    """
+    Count plays per facet value under the filters of the queryset.
+
+    Each facet is one grouped query over its M2M table. Results are
+    cached per filter signature until the catalog changes.
+    """
+    key = f"theater:play-facets:{get_catalog_version()}:{signature}"
+    facets = cache.get(key, {})
+    missing = [name for name in names if name not in facets]
+
+    if missing:
+        play_ids = queryset.order_by().values("pk")
+        for name in missing:
+            facets[name] = _count_facet(play_ids, name)
+        cache.set(key, facets, FACETS_CACHE_TIMEOUT)
+
+    return {name: facets[name] for name in names}
@@ -0,0 +1,59 @@
+"""
+Idempotency keys for create requests.
+
+A client that may retry a POST sends an ``Idempotency-Key`` header. The
+first request with a key inserts its row before doing any work, in the
+same transaction as the work, and stores its response there. A retry
+finds the row and gets the stored response back. A duplicate that
+arrives while the first request is still running blocks on the unique
+constraint until the first one commits, then replays its response. When
+the first request fails, its row is rolled back with it and the
+duplicate does the work instead.
+"""
+
+import hashlib
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from theater.models import IdempotencyKey
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = IdempotencyKey._meta.get_field("key").max_length
+
+
+def request_hash(data) -> str:
+    """Fingerprint of a parsed request body"""
+    payload = json.dumps(data, sort_keys=True, cls=DjangoJSONEncoder)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def claim_key(user, key: str, fingerprint: str):
+    """
+    Row of the key, inserted unless a live one exists, and whether it was.
+
+    Must run in the transaction that does the work the key guards.
+    """
+    now = timezone.now()
+    IdempotencyKey.objects.filter(
+        user=user, key=key, expires_at__lte=now
+    ).delete()
+    return IdempotencyKey.objects.get_or_create(
+        user=user,
+        key=key,
+        defaults={
+            "request_hash": fingerprint,
+            "expires_at": now
+            + timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL),
+        },
+    )
+
+
+def purge_expired_keys() -> int:
+    deleted, _ = IdempotencyKey.objects.filter(
+        expires_at__lte=timezone.now()
+    ).delete()
+    return deleted
@@ -0,0 +1,50 @@
+from datetime import timedelta
+
+from django.core.management import BaseCommand
+from django.utils import timezone
+
+from theater.archive import archive_reservations
+
+
+class Command(BaseCommand):
+    """Moves reservations of past performances to the archive tables"""
+
+    help = (
+        "Archive reservations whose tickets are all for performances "
+        "older than --days"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=30,
+            help="Archive performances that took place this many days ago",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Reservations moved per transaction",
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options["days"])
+        self.stdout.write(f"Archiving performances before {cutoff}...")
+
+        reservations_total = tickets_total = 0
+        for reservations, tickets in archive_reservations(
+            cutoff, options["batch_size"]
+        ):
+            reservations_total += reservations
+            tickets_total += tickets
+            self.stdout.write(
+                f"Archived {reservations} reservations, {tickets} tickets"
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Archived {reservations_total} reservations and "
+                f"{tickets_total} tickets!"
+            )
+        )
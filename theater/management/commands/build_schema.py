@@ -0,0 +1,21 @@
+from django.core.management import BaseCommand
+
+from theater_service_api.schema import build_schema, schema_dir
+
+
+class Command(BaseCommand):
+    """Prebuilds the OpenAPI schema served at /api/doc/"""
+
+    help = "Render the OpenAPI schema to JSON and YAML with gzip copies"
+    # The openapi check fails until this command has run
+    requires_system_checks = []
+
+    def handle(self, *args, **options):
+        manifest = build_schema()
+
+        for schema_file in manifest["files"].values():
+            self.stdout.write(
+                f"{schema_dir() / schema_file['name']} "
+                f"(ETag {schema_file['etag']})"
+            )
+        self.stdout.write(self.style.SUCCESS("OpenAPI schema built!"))
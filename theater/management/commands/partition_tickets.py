@@ -0,0 +1,52 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import BaseCommand, CommandError
+
+from theater.partitioning import (
+    convert_to_partitioned,
+    create_partitions,
+    is_partitioned,
+)
+
+
+class Command(BaseCommand):
+    """Maintains monthly partitions of the ticket table on PostgreSQL"""
+
+    help = (
+        "Create ticket partitions for the coming months, or convert the "
+        "ticket table to a partitioned one with --convert"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--convert",
+            action="store_true",
+            help="Rebuild theater_ticket as a partitioned table (locks it)",
+        )
+        parser.add_argument(
+            "--months-ahead",
+            type=int,
+            default=3,
+            help="Months after the current one to create partitions for",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            partitioned = is_partitioned()
+        except ImproperlyConfigured as error:
+            raise CommandError(str(error))
+
+        if options["convert"]:
+            if partitioned:
+                raise CommandError("Ticket table is already partitioned.")
+            self.stdout.write("Converting ticket table...")
+            created = convert_to_partitioned(options["months_ahead"])
+        elif not partitioned:
+            raise CommandError(
+                "Ticket table is not partitioned, run with --convert first."
+            )
+        else:
+            created = create_partitions(options["months_ahead"])
+
+        for name in created:
+            self.stdout.write(f"Created partition {name}")
+        self.stdout.write(self.style.SUCCESS("Ticket partitions are ready!"))
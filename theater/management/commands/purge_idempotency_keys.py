@@ -0,0 +1,15 @@
+from django.core.management import BaseCommand
+
+from theater.idempotency import purge_expired_keys
+
+
+class Command(BaseCommand):
+    """Deletes stored responses of expired idempotency keys"""
+
+    help = "Delete idempotency keys older than IDEMPOTENCY_KEY_TTL"
+
+    def handle(self, *args, **options):
+        deleted = purge_expired_keys()
+        self.stdout.write(
+            self.style.SUCCESS(f"Deleted {deleted} expired idempotency keys!")
+        )
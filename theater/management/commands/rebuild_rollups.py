@@ -0,0 +1,24 @@
+from django.core.management import BaseCommand
+from django.db import transaction
+
+from theater.rollups import rebuild_daily_availability, rebuild_sales
+
+
+class Command(BaseCommand):
+    """Recomputes the availability and sales rollups from tickets"""
+
+    help = (
+        "Rebuild the daily availability and hourly sales rollups from live "
+        "and archived tickets"
+    )
+
+    def handle(self, *args, **options):
+        self.stdout.write("Rebuilding daily availability...")
+        with transaction.atomic():
+            rebuild_daily_availability()
+
+        self.stdout.write("Rebuilding hourly sales...")
+        with transaction.atomic():
+            rebuild_sales()
+
+        self.stdout.write(self.style.SUCCESS("Rollups rebuilt!"))
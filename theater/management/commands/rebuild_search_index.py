@@ -0,0 +1,27 @@
+from django.core.management import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from theater.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    """Rebuilds the full-text search documents of every play"""
+
+    help = (
+        "Rebuild the play search index, e.g. after loaddata, which skips "
+        "the signals that keep it up to date"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="Database to rebuild the index in",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write("Rebuilding the play search index...")
+        with transaction.atomic(using=options["database"]):
+            rebuild_search_index(using=options["database"])
+
+        self.stdout.write(self.style.SUCCESS("Search index rebuilt!"))
@@ -0,0 +1,107 @@
+# Generated by Django 5.2 on 2026-10-19 03:23
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+# The SQL is frozen here rather than imported from theater.search, so the
+# migration keeps working when the search module and models change
+
+POSTGRES_UPDATE_SQL = """
+    UPDATE theater_play SET search_vector =
+        setweight(to_tsvector('english', coalesce(theater_play.title, '')),
+                  'A')
+        || setweight(
+            to_tsvector('english', coalesce(theater_play.description, '')),
+            'B'
+        )
+        || setweight(to_tsvector('english', coalesce((
+            SELECT string_agg(
+                theater_actor.first_name || ' ' || theater_actor.last_name,
+                ' '
+            )
+            FROM theater_actor
+            JOIN theater_play_actors
+                ON theater_play_actors.actor_id = theater_actor.id
+            WHERE theater_play_actors.play_id = theater_play.id
+        ), '')), 'C')
+        || setweight(to_tsvector('english', coalesce((
+            SELECT string_agg(theater_genre.name, ' ')
+            FROM theater_genre
+            JOIN theater_play_genres
+                ON theater_play_genres.genre_id = theater_genre.id
+            WHERE theater_play_genres.play_id = theater_play.id
+        ), '')), 'C')
+"""
+
+SQLITE_INSERT_SQL = """
+    INSERT INTO theater_play_fts (rowid, title, description, actors, genres)
+    SELECT
+        theater_play.id,
+        theater_play.title,
+        theater_play.description,
+        (
+            SELECT group_concat(
+                theater_actor.first_name || ' ' || theater_actor.last_name,
+                ' '
+            )
+            FROM theater_actor
+            JOIN theater_play_actors
+                ON theater_play_actors.actor_id = theater_actor.id
+            WHERE theater_play_actors.play_id = theater_play.id
+        ),
+        (
+            SELECT group_concat(theater_genre.name, ' ')
+            FROM theater_genre
+            JOIN theater_play_genres
+                ON theater_play_genres.genre_id = theater_genre.id
+            WHERE theater_play_genres.play_id = theater_play.id
+        )
+    FROM theater_play
+"""
+
+
+def build_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+
+    if vendor == "postgresql":
+        schema_editor.execute(
+            "CREATE INDEX theater_play_search_vector_gin "
+            "ON theater_play USING gin (search_vector)"
+        )
+        schema_editor.execute(POSTGRES_UPDATE_SQL)
+    elif vendor == "sqlite":
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE theater_play_fts USING fts5("
+            "title, description, actors, genres, "
+            "tokenize = 'porter unicode61')"
+        )
+        schema_editor.execute(SQLITE_INSERT_SQL)
+
+
+def remove_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+
+    if vendor == "postgresql":
+        schema_editor.execute(
+            "DROP INDEX IF EXISTS theater_play_search_vector_gin"
+        )
+    elif vendor == "sqlite":
+        schema_editor.execute("DROP TABLE IF EXISTS theater_play_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("theater", "0006_alter_performance_options"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="play",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.RunPython(build_search_index, remove_search_index),
+    ]
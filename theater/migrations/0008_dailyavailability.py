@@ -0,0 +1,61 @@
+# Generated by Django 5.2 on 2026-10-19 03:28
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.utils import timezone
+
+
+def backfill_daily_availability(apps, schema_editor):
+    Performance = apps.get_model("theater", "Performance")
+    DailyAvailability = apps.get_model("theater", "DailyAvailability")
+    alias = schema_editor.connection.alias
+    days = {}
+
+    performances = (
+        Performance.objects.using(alias)
+        .select_related("theater_hall")
+        .annotate(tickets_sold=Count("tickets"))
+    )
+    for performance in performances:
+        date = timezone.localdate(performance.show_time)
+        day = days.setdefault(date, DailyAvailability(date=date))
+        day.performances += 1
+        day.capacity += (
+            performance.theater_hall.rows * performance.theater_hall.seats_in_row
+        )
+        day.tickets_sold += performance.tickets_sold
+
+    DailyAvailability.objects.using(alias).bulk_create(days.values())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("theater", "0007_play_search_vector"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyAvailability",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField(unique=True)),
+                ("performances", models.PositiveIntegerField(default=0)),
+                ("capacity", models.PositiveIntegerField(default=0)),
+                ("tickets_sold", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name_plural": "daily availability",
+                "ordering": ["date"],
+            },
+        ),
+        migrations.RunPython(backfill_daily_availability, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2 on 2026-10-19 03:52
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def backfill_show_date(apps, schema_editor):
+    Performance = apps.get_model("theater", "Performance")
+    Ticket = apps.get_model("theater", "Ticket")
+    alias = schema_editor.connection.alias
+
+    for performance_id, show_time in (
+        Performance.objects.using(alias)
+        .filter(tickets__isnull=False)
+        .distinct()
+        .values_list("id", "show_time")
+    ):
+        Ticket.objects.using(alias).filter(
+            performance_id=performance_id
+        ).update(show_date=timezone.localdate(show_time))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("theater", "0009_archivedreservation_archivedticket"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ticket",
+            name="show_date",
+            field=models.DateField(editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_show_date, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2 on 2026-10-19 03:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("theater", "0010_ticket_show_date"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="ticket",
+            name="show_date",
+            field=models.DateField(editable=False),
+        ),
+        migrations.AlterUniqueTogether(
+            name="ticket",
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name="ticket",
+            constraint=models.UniqueConstraint(
+                fields=("performance", "row", "seat", "show_date"),
+                name="theater_ticket_unique_seat",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="ticket",
+            index=models.Index(
+                fields=["show_date"], name="theater_ticket_date_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,77 @@
+# Generated by Django 5.2 on 2026-10-19 03:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncHour
+
+
+def backfill_sales_rollup(apps, schema_editor):
+    SalesRollup = apps.get_model("theater", "SalesRollup")
+    alias = schema_editor.connection.alias
+    sales = {}
+
+    for model_name in ("Ticket", "ArchivedTicket"):
+        model = apps.get_model("theater", model_name)
+        rows = (
+            model.objects.using(alias)
+            .annotate(hour=TruncHour("reservation__created_at"))
+            .values("performance_id", "hour")
+            .annotate(tickets=Count("id"))
+            .order_by()
+        )
+        for row in rows:
+            key = (row["performance_id"], row["hour"])
+            sales[key] = sales.get(key, 0) + row["tickets"]
+
+    SalesRollup.objects.using(alias).bulk_create(
+        SalesRollup(performance_id=performance_id, hour=hour, tickets=tickets)
+        for (performance_id, hour), tickets in sales.items()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("theater", "0011_ticket_unique_seat"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SalesRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("hour", models.DateTimeField()),
+                ("tickets", models.IntegerField(default=0)),
+                (
+                    "performance",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="sales",
+                        to="theater.performance",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["hour"],
+                "indexes": [
+                    models.Index(fields=["hour"], name="theater_salesrollup_hour_idx")
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("performance", "hour"),
+                        name="theater_salesrollup_unique_hour",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_sales_rollup, migrations.RunPython.noop),
+    ]
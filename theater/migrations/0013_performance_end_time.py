@@ -0,0 +1,80 @@
+# Generated by Django 5.2 on 2026-10-19 04:07
+
+from datetime import timedelta
+
+from django.db import migrations, models
+from django.db.models import F
+
+# Exclusion constraint behind theater.scheduling.OVERLAP_CONSTRAINT_NAME,
+# btree_gist provides the GiST operator class for "theater_hall_id WITH ="
+POSTGRES_CONSTRAINT_SQL = """
+    ALTER TABLE theater_performance
+    ADD CONSTRAINT theater_performance_no_overlap
+    EXCLUDE USING gist (
+        theater_hall_id WITH =,
+        tstzrange(show_time, end_time, '[)') WITH &&
+    )
+"""
+
+
+def backfill_end_time(apps, schema_editor):
+    Play = apps.get_model("theater", "Play")
+    Performance = apps.get_model("theater", "Performance")
+    alias = schema_editor.connection.alias
+
+    for play_id, duration in Play.objects.using(alias).values_list(
+        "id", "duration"
+    ):
+        Performance.objects.using(alias).filter(play_id=play_id).update(
+            end_time=F("show_time") + timedelta(minutes=duration)
+        )
+
+
+def add_overlap_constraint(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+        schema_editor.execute(POSTGRES_CONSTRAINT_SQL)
+
+
+def remove_overlap_constraint(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(
+            "ALTER TABLE theater_performance "
+            "DROP CONSTRAINT IF EXISTS theater_performance_no_overlap"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("theater", "0012_salesrollup"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="play",
+            name="duration",
+            field=models.PositiveIntegerField(default=120),
+        ),
+        migrations.AddField(
+            model_name="performance",
+            name="end_time",
+            field=models.DateTimeField(editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_end_time, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="performance",
+            name="end_time",
+            field=models.DateTimeField(editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="performance",
+            index=models.Index(
+                fields=["theater_hall", "show_time"],
+                name="theater_performance_hall_idx",
+            ),
+        ),
+        migrations.RunPython(
+            add_overlap_constraint, remove_overlap_constraint
+        ),
+    ]
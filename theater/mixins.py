@@ -0,0 +1,421 @@
+"""
+Viewset mixins shared by the theater API.
+"""
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import transaction
+from django.utils.functional import cached_property
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.relations import ManyRelatedField, RelatedField
+from rest_framework.response import Response
+
+from theater.idempotency import (
+    IDEMPOTENCY_HEADER,
+    MAX_KEY_LENGTH,
+    claim_key,
+    request_hash,
+)
+from theater.serializers import ExpandableSerializerMixin
+
+MULTI_GET_MAX_IDS = 100
+
+
+def _select_related_paths(tree: dict, prefix: str = "") -> list[str]:
+    """Flatten the ``query.select_related`` dict into lookup paths"""
+    paths = []
+    for name, children in tree.items():
+        path = f"{prefix}{name}"
+        paths.extend(_select_related_paths(children, f"{path}__") or [path])
+    return paths
+
+
+def _lookup_root(lookup) -> str:
+    path = getattr(lookup, "prefetch_to", lookup)
+    return path.split("__")[0]
+
+
+class SparseFieldsetMixin:
+    """
+    ``?fields=id,title`` limits the fields rendered by read actions.
+
+    Besides trimming the serializer, the queryset is pruned to what the
+    remaining fields need: ``select_related`` and ``prefetch_related``
+    lookups of relations no field reads are dropped, and when every field
+    maps to a model field only those columns are loaded.
+    """
+
+    fields_param = "fields"
+
+    @cached_property
+    def requested_fields(self) -> set[str] | None:
+        """Names given in ``?fields=``, None when all fields are rendered"""
+        request = getattr(self, "request", None)
+        if request is None or request.method not in SAFE_METHODS:
+            return None
+
+        fields = request.query_params.get(self.fields_param)
+        if not fields:
+            return None
+
+        names = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = names - set(self._serializer_fields)
+        if unknown:
+            raise ValidationError(
+                {
+                    self.fields_param: (
+                        f"Unknown fields: {', '.join(sorted(unknown))}."
+                    )
+                }
+            )
+        return names
+
+    @cached_property
+    def _serializer_fields(self) -> dict:
+        return self.get_serializer_class()().fields
+
+    def rendered_fields(self) -> dict:
+        """Serializer fields of the action that end up in the response"""
+        fields = self._serializer_fields
+        if self.requested_fields is None:
+            return dict(fields)
+        return {
+            name: field
+            for name, field in fields.items()
+            if name in self.requested_fields
+        }
+
+    def renders_field(self, name: str) -> bool:
+        return name in self.rendered_fields()
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+
+        if self.requested_fields is not None:
+            fields = getattr(serializer, "child", serializer).fields
+            for name in set(fields) - self.requested_fields:
+                fields.pop(name)
+
+        return serializer
+
+    def prune_queryset(self, queryset):
+        """Drop joins, prefetches and columns the rendered fields skip"""
+        if self.requested_fields is None:
+            return queryset
+
+        sources = [
+            field.source_attrs[0] if field.source_attrs else "*"
+            for field in self.rendered_fields().values()
+        ]
+        roots = set(sources)
+
+        if isinstance(queryset.query.select_related, dict):
+            paths = [
+                path
+                for path in _select_related_paths(
+                    queryset.query.select_related
+                )
+                if _lookup_root(path) in roots
+            ]
+            # select_related() without paths would follow every relation
+            queryset = queryset.select_related(None)
+            if paths:
+                queryset = queryset.select_related(*paths)
+
+        lookups = queryset._prefetch_related_lookups
+        if lookups:
+            queryset = queryset.prefetch_related(None).prefetch_related(
+                *(
+                    lookup
+                    for lookup in lookups
+                    if _lookup_root(lookup) in roots
+                )
+            )
+
+        columns = self._columns(queryset, sources)
+        if columns is not None:
+            queryset = queryset.only(*columns)
+
+        return queryset
+
+    @staticmethod
+    def _columns(queryset, sources) -> list[str] | None:
+        """
+        Model fields to load for the sources, None when a source is a
+        property or the whole object, as its columns are unknown
+        """
+        opts = queryset.model._meta
+        columns = [opts.pk.name]
+
+        for source in sources:
+            if source in queryset.query.annotations:
+                continue
+            try:
+                field = opts.get_field(source)
+            except FieldDoesNotExist:
+                return None
+            if field.concrete and not field.many_to_many:
+                columns.append(field.name)
+
+        return columns
+
+    def prepare_queryset(self, queryset):
+        """Annotations and lookups of the rendered fields, added before
+        the queryset is pruned"""
+        return queryset
+
+    def get_queryset(self):
+        return self.prune_queryset(
+            self.prepare_queryset(super().get_queryset())
+        )
+
+
+def parse_expand(value: str) -> dict:
+    """``play.actors,theater_hall`` -> {"play": {"actors": {}}, ...}"""
+    tree = {}
+    for path in value.split(","):
+        node = tree
+        for name in path.strip().split("."):
+            if name:
+                node = node.setdefault(name, {})
+    return tree
+
+
+def _expanded_serializer(serializer_class, name):
+    """Serializer class and source of the expandable field, or Nones"""
+    declared = serializer_class._declared_fields.get(name)
+    nested = getattr(declared, "child", declared)
+    if isinstance(nested, ExpandableSerializerMixin):
+        return type(nested), declared.source or name
+
+    expandable = getattr(serializer_class, "expandable_fields", {})
+    if name in expandable:
+        return expandable[name][0], name
+
+    return None, None
+
+
+def _queried_relations(serializer_class):
+    """
+    Relation fields the serializer renders from related objects rather
+    than from the foreign key column, as (name, source) pairs
+    """
+    for name, field in serializer_class().fields.items():
+        if isinstance(field, ManyRelatedField) or (
+            isinstance(field, RelatedField)
+            and not field.use_pk_only_optimization()
+        ):
+            yield name, field.source_attrs[0]
+
+
+def plan_expansion(serializer_class, tree, prefix="", label="", joined=True):
+    """
+    ``select_related`` paths and ``prefetch_related`` lookups loading
+    every relation of the expansion tree, and the relations rendered as
+    ids or slugs by the expanded serializers.
+
+    Relations are joined while they are single-valued from the root,
+    everything below a multi-valued relation is prefetched one query per
+    level.
+    """
+    select, prefetch = [], []
+
+    for name, children in tree.items():
+        nested_class, source = _expanded_serializer(serializer_class, name)
+        field = None
+        if nested_class is not None:
+            try:
+                field = serializer_class.Meta.model._meta.get_field(source)
+            except FieldDoesNotExist:
+                pass
+        if field is None or not field.is_relation:
+            raise ValidationError({"expand": f"Cannot expand {label}{name}."})
+
+        path = f"{prefix}{source}"
+        single = joined and field.concrete and not field.many_to_many
+        (select if single else prefetch).append(path)
+
+        nested_select, nested_prefetch = plan_expansion(
+            nested_class, children, f"{path}__", f"{label}{name}.", single
+        )
+        select.extend(nested_select)
+        prefetch.extend(nested_prefetch)
+
+        for related_name, related_source in _queried_relations(nested_class):
+            if related_name in children:
+                continue
+            related = field.related_model._meta.get_field(related_source)
+            related_path = f"{path}__{related_source}"
+            if single and related.concrete and not related.many_to_many:
+                select.append(related_path)
+            else:
+                prefetch.append(related_path)
+
+    return select, prefetch
+
+
+class ExpandMixin:
+    """
+    ``?expand=play.actors,theater_hall`` renders the listed relations as
+    nested objects, at any depth.
+
+    The queryset is planned from the expansion paths, so the number of
+    queries depends on the paths and not on the number of objects.
+    """
+
+    expand_param = "expand"
+
+    @cached_property
+    def _expansion(self) -> tuple[dict, list, list]:
+        request = getattr(self, "request", None)
+        if request is None or request.method not in SAFE_METHODS:
+            return {}, [], []
+
+        value = request.query_params.get(self.expand_param)
+        if not value:
+            return {}, [], []
+
+        tree = parse_expand(value)
+        # Fields left out by ?fields= are not expanded either
+        fields = getattr(self, "requested_fields", None)
+        if fields is not None:
+            tree = {
+                name: children
+                for name, children in tree.items()
+                if name in fields
+            }
+
+        return (tree, *plan_expansion(self.get_serializer_class(), tree))
+
+    @property
+    def expand_tree(self) -> dict:
+        return self._expansion[0]
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["expand"] = self.expand_tree
+        return context
+
+    def expand_queryset(self, queryset):
+        """Load the relations of the expansion tree"""
+        _, select, prefetch = self._expansion
+
+        if select:
+            queryset = queryset.select_related(*select)
+
+        loaded = {
+            getattr(lookup, "prefetch_to", lookup)
+            for lookup in queryset._prefetch_related_lookups
+        }
+        prefetch = [lookup for lookup in prefetch if lookup not in loaded]
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+
+        return queryset
+
+    def get_queryset(self):
+        return self.expand_queryset(super().get_queryset())
+
+
+class MultiGetMixin:
+    """
+    ``?ids=3,1,2`` on the list action fetches those objects with one
+    ``IN`` query and renders them like the detail action, in the order of
+    the ids. Unknown ids are left out.
+    """
+
+    ids_param = "ids"
+    max_ids = MULTI_GET_MAX_IDS
+
+    @cached_property
+    def multi_get_ids(self) -> list[int] | None:
+        request = getattr(self, "request", None)
+        if request is None or self.action != "list":
+            return None
+
+        value = request.query_params.get(self.ids_param)
+        if value is None:
+            return None
+
+        try:
+            ids = list(dict.fromkeys(int(pk) for pk in value.split(",")))
+        except ValueError:
+            raise ValidationError(
+                {self.ids_param: "Expected comma-separated integer ids."}
+            )
+        if len(ids) > self.max_ids:
+            raise ValidationError(
+                {self.ids_param: f"At most {self.max_ids} ids per request."}
+            )
+        return ids
+
+    def is_detail_read(self) -> bool:
+        """Whether objects are rendered as by the retrieve action"""
+        return self.action == "retrieve" or self.multi_get_ids is not None
+
+    def list(self, request, *args, **kwargs):
+        if self.multi_get_ids is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        objects = queryset.in_bulk(self.multi_get_ids)
+        serializer = self.get_serializer(
+            [objects[pk] for pk in self.multi_get_ids if pk in objects],
+            many=True,
+        )
+        return Response(serializer.data)
+
+
+class IdempotentCreateMixin:
+    """
+    Create requests with an ``Idempotency-Key`` header run at most once per
+    user and key, retries get the first response back, see
+    theater.idempotency. Reusing a key for a different request is an error.
+    """
+
+    def create(self, request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if key is None:
+            return super().create(request, *args, **kwargs)
+
+        if not key or len(key) > MAX_KEY_LENGTH:
+            raise ValidationError(
+                {
+                    IDEMPOTENCY_HEADER: (
+                        f"Must be 1 to {MAX_KEY_LENGTH} characters long."
+                    )
+                }
+            )
+
+        fingerprint = request_hash(request.data)
+        with transaction.atomic():
+            record, claimed = claim_key(request.user, key, fingerprint)
+            if not claimed:
+                return self._replay(record, fingerprint)
+
+            response = super().create(request, *args, **kwargs)
+            record.status_code = response.status_code
+            record.response = response.data
+            record.save(update_fields=["status_code", "response"])
+
+        return response
+
+    @staticmethod
+    def _replay(record, fingerprint: str) -> Response:
+        if record.request_hash != fingerprint:
+            return Response(
+                {
+                    "detail": (
+                        f"This {IDEMPOTENCY_HEADER} was used with a "
+                        f"different request."
+                    )
+                },
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            )
+
+        return Response(
+            record.response,
+            status=record.status_code,
+            headers={"Idempotent-Replayed": "true"},
+        )
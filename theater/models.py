@@ -1,9 +1,14 @@
 import os
 import uuid
+from datetime import timedelta
 
 from django.conf import settings
+from django.contrib.postgres.search import SearchVectorField
 from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.db.models import Count, F
+from django.utils import timezone
 from django.utils.text import slugify
 
 
@@ -51,10 +56,26 @@ class Play(models.Model):
     image = models.ImageField(
         upload_to=play_image_file_path, null=True, blank=True
     )
+    # Running time in minutes, for which a performance books its hall
+    duration = models.PositiveIntegerField(default=120)
+    # Maintained by theater.search, only used on PostgreSQL
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         ordering = ["title"]
 
+    def clean(self):
+        # theater.scheduling imports this module
+        from theater.scheduling import find_rescheduling_conflicts
+
+        if self.pk and find_rescheduling_conflicts(self):
+            raise ValidationError(
+                {
+                    "duration": "Performances of the play would overlap "
+                    "other performances in their halls."
+                }
+            )
+
     def __str__(self):
         return f"{self.title}"
 
@@ -72,6 +93,17 @@ class TheaterHall(models.Model):
         return f"{self.name}"
 
 
+class PerformanceQuerySet(models.QuerySet):
+    def with_tickets_available(self):
+        """Annotate seats left in the hall, as ``tickets_available``"""
+        return self.annotate(
+            tickets_available=(
+                F("theater_hall__rows") * F("theater_hall__seats_in_row")
+                - Count("tickets")
+            )
+        )
+
+
 class Performance(models.Model):
     play = models.ForeignKey(
         Play, on_delete=models.CASCADE, related_name="performances"
@@ -80,14 +112,80 @@ class Performance(models.Model):
         TheaterHall, on_delete=models.CASCADE, related_name="performances"
     )
     show_time = models.DateTimeField()
+    # End of the hall booking, show_time plus the play's duration, copied
+    # on save. PostgreSQL keeps the [show_time, end_time) ranges of a hall
+    # from overlapping, see theater.scheduling.
+    end_time = models.DateTimeField(editable=False)
+
+    objects = PerformanceQuerySet.as_manager()
 
     class Meta:
+        indexes = [
+            models.Index(
+                fields=["theater_hall", "show_time"],
+                name="theater_performance_hall_idx",
+            ),
+        ]
         ordering = ["show_time"]
 
+    @staticmethod
+    def get_end_time(show_time, play):
+        return show_time + timedelta(minutes=play.duration)
+
+    def save(self, *args, **kwargs):
+        self.end_time = Performance.get_end_time(self.show_time, self.play)
+        return super(Performance, self).save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.play} ({str(self.show_time)})"
 
 
+class DailyAvailability(models.Model):
+    """Per-day rollup of scheduled performances and sold seats"""
+
+    date = models.DateField(unique=True)
+    performances = models.PositiveIntegerField(default=0)
+    capacity = models.PositiveIntegerField(default=0)
+    tickets_sold = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["date"]
+        verbose_name_plural = "daily availability"
+
+    @property
+    def seats_remaining(self) -> int:
+        return max(self.capacity - self.tickets_sold, 0)
+
+    @property
+    def sold_out(self) -> bool:
+        return self.performances > 0 and self.seats_remaining == 0
+
+    def __str__(self):
+        return f"{self.date} ({self.seats_remaining} seats remaining)"
+
+
+class SalesRollup(models.Model):
+    """Net tickets sold per performance and hour of sale"""
+
+    performance = models.ForeignKey(
+        Performance, on_delete=models.CASCADE, related_name="sales"
+    )
+    hour = models.DateTimeField()
+    tickets = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["performance", "hour"],
+                name="theater_salesrollup_unique_hour",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["hour"], name="theater_salesrollup_hour_idx"),
+        ]
+        ordering = ["hour"]
+
+
 class Reservation(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     user = models.ForeignKey(
@@ -103,6 +201,41 @@ class Reservation(models.Model):
         return f"{str(self.created_at)} - {self.user.email}"
 
 
+class IdempotencyKey(models.Model):
+    """
+    Response of a create request sent with an ``Idempotency-Key`` header,
+    replayed when the client retries the request with the same key
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="idempotency_keys",
+    )
+    key = models.CharField(max_length=255)
+    request_hash = models.CharField(max_length=64)
+    # Empty while the first request with the key is in progress
+    status_code = models.PositiveSmallIntegerField(null=True)
+    response = models.JSONField(null=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "key"], name="theater_idempotencykey_unique"
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["expires_at"], name="theater_idempotency_expiry_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.key} - {self.user.email}"
+
+
 class Ticket(models.Model):
     row = models.IntegerField()
     seat = models.IntegerField()
@@ -112,9 +245,22 @@ class Ticket(models.Model):
     reservation = models.ForeignKey(
         Reservation, on_delete=models.CASCADE, related_name="tickets"
     )
+    # Local date of the performance, copied from its show_time on save.
+    # It is the partition key when the table is partitioned by
+    # ``manage.py partition_tickets``, and a partitioned table requires it
+    # in every unique constraint.
+    show_date = models.DateField(editable=False)
 
     class Meta:
-        unique_together = ("performance", "row", "seat")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["performance", "row", "seat", "show_date"],
+                name="theater_ticket_unique_seat",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["show_date"], name="theater_ticket_date_idx"),
+        ]
         ordering = ["row", "seat"]
 
     @staticmethod
@@ -149,6 +295,7 @@ class Ticket(models.Model):
         using=None,
         update_fields=None,
     ):
+        self.show_date = timezone.localdate(self.performance.show_time)
         self.full_clean()
         return super(Ticket, self).save(
             force_insert, force_update, using, update_fields
@@ -156,3 +303,47 @@ class Ticket(models.Model):
 
     def __str__(self):
         return f"{str(self.performance)} (row:{self.row}, seat:{self.seat})"
+
+
+class ArchivedReservation(models.Model):
+    """
+    Reservation moved out of the hot tables by ``archive_tickets``.
+
+    Keeps the id and creation time of the original reservation.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="archived_reservations",
+    )
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{str(self.created_at)} - {self.user.email} (archived)"
+
+
+class ArchivedTicket(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    row = models.IntegerField()
+    seat = models.IntegerField()
+    performance = models.ForeignKey(
+        Performance, on_delete=models.CASCADE, related_name="archived_tickets"
+    )
+    reservation = models.ForeignKey(
+        ArchivedReservation, on_delete=models.CASCADE, related_name="tickets"
+    )
+
+    class Meta:
+        ordering = ["row", "seat"]
+
+    def __str__(self):
+        return (
+            f"{str(self.performance)} (row:{self.row}, seat:{self.seat}, "
+            f"archived)"
+        )
@@ -0,0 +1,240 @@
+"""
+Range partitioning of the ticket table by show date, PostgreSQL only.
+
+``convert_to_partitioned`` rebuilds ``theater_ticket`` as a table
+partitioned by month of ``show_date`` and ``create_partitions`` adds the
+months ahead before tickets for them are sold. Rows outside every monthly
+partition land in the default partition, and move out of it once their
+month gets a partition.
+
+A partitioned table needs the partition key in its primary key and unique
+constraints, so the primary key becomes ``(id, show_date)`` and seat
+uniqueness is ``(performance, row, seat, show_date)``. Both are
+equivalent to the unpartitioned ones, as ``show_date`` follows from the
+performance.
+"""
+
+from datetime import date
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections, transaction
+from django.utils import timezone
+
+from theater.models import Ticket
+
+TABLE = Ticket._meta.db_table
+STAGING_TABLE = f"{TABLE}_partitioned"
+UNIQUE_SEAT = "theater_ticket_unique_seat"
+
+CREATE_PARTITIONED_SQL = """
+    CREATE TABLE {staging} (
+        id bigint GENERATED BY DEFAULT AS IDENTITY,
+        "row" integer NOT NULL,
+        seat integer NOT NULL,
+        performance_id bigint NOT NULL,
+        reservation_id bigint NOT NULL,
+        show_date date NOT NULL,
+        CONSTRAINT {staging}_pkey PRIMARY KEY (id, show_date),
+        CONSTRAINT {staging}_unique_seat
+            UNIQUE (performance_id, "row", seat, show_date)
+    ) PARTITION BY RANGE (show_date)
+"""
+
+COPY_SQL = """
+    INSERT INTO {staging}
+        (id, "row", seat, performance_id, reservation_id, show_date)
+    SELECT id, "row", seat, performance_id, reservation_id, show_date
+    FROM {table}
+"""
+
+MOVE_FROM_DEFAULT_SQL = """
+    WITH moved AS (
+        DELETE FROM {default}
+        WHERE show_date >= %s AND show_date < %s
+        RETURNING id, "row", seat, performance_id, reservation_id, show_date
+    )
+    INSERT INTO {partition}
+        (id, "row", seat, performance_id, reservation_id, show_date)
+    SELECT * FROM moved
+"""
+
+RESET_IDENTITY_SQL = """
+    SELECT setval(
+        pg_get_serial_sequence(%s, 'id'),
+        coalesce((SELECT max(id) FROM {table}), 0) + 1,
+        false
+    )
+"""
+
+
+def _month(day: date) -> date:
+    return day.replace(day=1)
+
+
+def _next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def _last_month(months_ahead: int) -> date:
+    month = _month(timezone.localdate())
+    for _ in range(months_ahead):
+        month = _next_month(month)
+    return month
+
+
+def partition_name(month: date) -> str:
+    return f"{TABLE}_p{month:%Y_%m}"
+
+
+def _connection(using):
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        raise ImproperlyConfigured("Ticket partitioning requires PostgreSQL.")
+    return connection
+
+
+def is_partitioned(using="default") -> bool:
+    with _connection(using).cursor() as cursor:
+        cursor.execute(
+            "SELECT relkind FROM pg_class WHERE oid = %s::regclass", [TABLE]
+        )
+        return cursor.fetchone()[0] == "p"
+
+
+def _exists(cursor, name) -> bool:
+    cursor.execute("SELECT to_regclass(%s) IS NOT NULL", [name])
+    return cursor.fetchone()[0]
+
+
+def _create_month_partitions(cursor, table, first_month, last_month):
+    """
+    Create monthly partitions of table from first to last month.
+
+    PostgreSQL refuses to create a partition for rows the default
+    partition already holds, e.g. tickets sold beyond the months created
+    so far. The default partition is then detached while the month's rows
+    move to their new partition, and attached again. Callers run this in
+    a transaction, so readers never see the tickets missing.
+    """
+    default = f"{table}_default"
+    created = []
+    month = first_month
+
+    while month <= last_month:
+        name = partition_name(month).replace(TABLE, table, 1)
+        if not _exists(cursor, name):
+            detached = _exists(cursor, default)
+            if detached:
+                cursor.execute(
+                    f"ALTER TABLE {table} DETACH PARTITION {default}"
+                )
+            # Partition bounds are DDL and cannot be bound parameters
+            cursor.execute(
+                f"CREATE TABLE {name} PARTITION OF {table} FOR VALUES "
+                f"FROM ('{month.isoformat()}') "
+                f"TO ('{_next_month(month).isoformat()}')"
+            )
+            if detached:
+                cursor.execute(
+                    MOVE_FROM_DEFAULT_SQL.format(
+                        default=default, partition=name
+                    ),
+                    [month, _next_month(month)],
+                )
+                cursor.execute(
+                    f"ALTER TABLE {table} ATTACH PARTITION {default} DEFAULT"
+                )
+            created.append(name)
+        month = _next_month(month)
+
+    return created
+
+
+def create_partitions(months_ahead: int, using="default") -> list[str]:
+    """Make sure monthly partitions exist up to months_ahead from today"""
+    connection = _connection(using)
+
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        # Deferred foreign key checks queued on moved rows block ALTER TABLE
+        cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+        created = _create_month_partitions(
+            cursor,
+            TABLE,
+            _month(timezone.localdate()),
+            _last_month(months_ahead),
+        )
+        cursor.execute("SET CONSTRAINTS ALL DEFERRED")
+
+    return created
+
+
+def convert_to_partitioned(months_ahead: int, using="default") -> list[str]:
+    """
+    Rebuild the ticket table as a partitioned one, keeping its rows.
+
+    Indexes and foreign keys are recreated under their current names, so
+    later migrations still find them. The table is locked until the copy
+    is done, run it in a maintenance window.
+    """
+    connection = _connection(using)
+
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, TABLE)
+
+        cursor.execute(f"LOCK TABLE {TABLE} IN ACCESS EXCLUSIVE MODE")
+        # Deferred foreign key checks queued on the table block DROP TABLE
+        cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+        cursor.execute(f"SELECT min(show_date) FROM {TABLE}")
+        first_day = cursor.fetchone()[0] or timezone.localdate()
+
+        cursor.execute(CREATE_PARTITIONED_SQL.format(staging=STAGING_TABLE))
+        created = _create_month_partitions(
+            cursor,
+            STAGING_TABLE,
+            _month(first_day),
+            _last_month(months_ahead),
+        )
+        cursor.execute(
+            f"CREATE TABLE {STAGING_TABLE}_default "
+            f"PARTITION OF {STAGING_TABLE} DEFAULT"
+        )
+        cursor.execute(COPY_SQL.format(staging=STAGING_TABLE, table=TABLE))
+        cursor.execute(f"DROP TABLE {TABLE}")
+
+        cursor.execute(f"ALTER TABLE {STAGING_TABLE} RENAME TO {TABLE}")
+        cursor.execute(
+            f"ALTER TABLE {TABLE} RENAME CONSTRAINT "
+            f"{STAGING_TABLE}_pkey TO {TABLE}_pkey"
+        )
+        cursor.execute(
+            f"ALTER TABLE {TABLE} RENAME CONSTRAINT "
+            f"{STAGING_TABLE}_unique_seat TO {UNIQUE_SEAT}"
+        )
+        for name in created + [f"{STAGING_TABLE}_default"]:
+            cursor.execute(
+                f"ALTER TABLE {name} RENAME TO "
+                f"{name.replace(STAGING_TABLE, TABLE, 1)}"
+            )
+        cursor.execute(RESET_IDENTITY_SQL.format(table=TABLE), [TABLE])
+
+        for name, constraint in constraints.items():
+            columns = ", ".join(
+                connection.ops.quote_name(column)
+                for column in constraint["columns"]
+            )
+            if constraint["foreign_key"]:
+                to_table, to_column = constraint["foreign_key"]
+                cursor.execute(
+                    f"ALTER TABLE {TABLE} ADD CONSTRAINT {name} "
+                    f"FOREIGN KEY ({columns}) "
+                    f"REFERENCES {to_table} ({to_column}) "
+                    f"DEFERRABLE INITIALLY DEFERRED"
+                )
+            elif constraint["index"] and not (
+                constraint["primary_key"] or constraint["unique"]
+            ):
+                cursor.execute(f"CREATE INDEX {name} ON {TABLE} ({columns})")
+
+        cursor.execute("SET CONSTRAINTS ALL DEFERRED")
+
+    return [name.replace(STAGING_TABLE, TABLE, 1) for name in created]
@@ -0,0 +1,142 @@
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+
+from theater.models import (
+    ArchivedTicket,
+    DailyAvailability,
+    Performance,
+    SalesRollup,
+    Ticket,
+)
+
+
+def show_date(show_time):
+    """Calendar day of a performance in the theater time zone"""
+    return timezone.localdate(show_time)
+
+
+def refresh_days(dates) -> None:
+    """Recompute availability rollups of the given days from scratch"""
+    for day in set(dates):
+        stats = Performance.objects.filter(show_time__date=day).aggregate(
+            performances=Count("id"),
+            capacity=Sum(
+                F("theater_hall__rows") * F("theater_hall__seats_in_row")
+            ),
+        )
+
+        if not stats["performances"]:
+            DailyAvailability.objects.filter(date=day).delete()
+            continue
+
+        DailyAvailability.objects.update_or_create(
+            date=day,
+            defaults={
+                "performances": stats["performances"],
+                "capacity": stats["capacity"],
+                # Archived tickets still count as sold
+                "tickets_sold": (
+                    Ticket.objects.filter(show_date=day).count()
+                    + ArchivedTicket.objects.filter(
+                        performance__show_time__date=day
+                    ).count()
+                ),
+            },
+        )
+
+
+def sale_hour(moment=None):
+    """Start of the hour bucket a sale at moment is counted in"""
+    return (moment or timezone.now()).replace(
+        minute=0, second=0, microsecond=0
+    )
+
+
+def record_sales(tickets, sign=1, moment=None) -> None:
+    """Add (or with sign=-1 remove) tickets to the hourly sales rollups"""
+    hour = sale_hour(moment)
+    sold = Counter(ticket.performance_id for ticket in tickets)
+
+    for performance_id, count in sold.items():
+        sales = SalesRollup.objects.filter(
+            performance_id=performance_id, hour=hour
+        )
+        if sales.update(tickets=F("tickets") + sign * count):
+            continue
+
+        try:
+            with transaction.atomic():
+                SalesRollup.objects.create(
+                    performance_id=performance_id,
+                    hour=hour,
+                    tickets=sign * count,
+                )
+        except IntegrityError:
+            # A concurrent sale created the bucket first
+            sales.update(tickets=F("tickets") + sign * count)
+
+
+def record_tickets(tickets, sign=1, moment=None) -> None:
+    """
+    Add (or with sign=-1 remove) sold tickets to the rollups, with sales
+    counted in the hour of moment
+    """
+    sold = Counter(
+        show_date(ticket.performance.show_time) for ticket in tickets
+    )
+
+    for day, count in sold.items():
+        updated = DailyAvailability.objects.filter(date=day).update(
+            tickets_sold=F("tickets_sold") + sign * count
+        )
+        if not updated:
+            refresh_days([day])
+
+    record_sales(tickets, sign, moment)
+
+
+def rebuild_daily_availability() -> None:
+    """Recompute every daily availability rollup"""
+    days = set(
+        show_date(show_time)
+        for show_time in Performance.objects.values_list(
+            "show_time", flat=True
+        )
+    )
+    DailyAvailability.objects.exclude(date__in=days).delete()
+    refresh_days(days)
+
+
+def rebuild_sales() -> None:
+    """
+    Recompute the hourly sales rollups from live and archived tickets.
+
+    Tickets are bucketed by the hour their reservation was made. Cancelled
+    tickets no longer exist, so their sales simply drop out of the hours
+    they were made in.
+    """
+    sales = Counter()
+    for model in (Ticket, ArchivedTicket):
+        rows = (
+            model.objects.annotate(hour=TruncHour("reservation__created_at"))
+            .values("performance_id", "hour")
+            .annotate(tickets=Count("id"))
+            .order_by()
+        )
+        for row in rows:
+            sales[row["performance_id"], row["hour"]] += row["tickets"]
+
+    SalesRollup.objects.all().delete()
+    SalesRollup.objects.bulk_create(
+        (
+            SalesRollup(
+                performance_id=performance_id, hour=hour, tickets=tickets
+            )
+            for (performance_id, hour), tickets in sales.items()
+        ),
+        batch_size=1000,
+    )
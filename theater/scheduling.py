@@ -0,0 +1,82 @@
+"""
+One performance at a time per theater hall.
+
+A performance books its hall for ``[show_time, end_time)``. PostgreSQL
+enforces that the bookings of a hall never overlap with a GiST exclusion
+constraint, so a conflicting insert costs an index probe instead of a scan
+of the hall's schedule. Other databases run ``find_overlapping`` before
+saving, which relies on the same invariant to look at a single row.
+The constraint is created by migration 0013.
+"""
+
+from django.db import connections, router
+
+from theater.models import Performance, Play
+
+OVERLAP_CONSTRAINT_NAME = "theater_performance_no_overlap"
+OVERLAP_MESSAGE = "The theater hall is already booked at this time."
+
+
+def enforced_by_database(using=None) -> bool:
+    using = using or router.db_for_write(Performance)
+    return connections[using].vendor == "postgresql"
+
+
+def is_overlap_violation(error: Exception) -> bool:
+    """Whether an IntegrityError was raised by the exclusion constraint"""
+    diag = getattr(error.__cause__, "diag", None)
+    if diag is not None:
+        return diag.constraint_name == OVERLAP_CONSTRAINT_NAME
+    return OVERLAP_CONSTRAINT_NAME in str(error)
+
+
+def find_overlapping(
+    theater_hall, show_time, end_time, exclude=None, using=None
+):
+    """
+    Performance of the hall overlapping ``[show_time, end_time)``, if any.
+
+    Bookings of a hall never overlap, so ordered by show_time they are
+    ordered by end_time too, and the last one starting before end_time is
+    the only one that can still be running at show_time. That is one
+    lookup on the (theater_hall, show_time) index.
+    """
+    queryset = Performance.objects.using(
+        using or router.db_for_write(Performance)
+    ).filter(theater_hall=theater_hall, show_time__lt=end_time)
+    if exclude is not None:
+        queryset = queryset.exclude(pk=exclude.pk)
+
+    previous = queryset.order_by("-show_time").first()
+    if previous is not None and previous.end_time > show_time:
+        return previous
+    return None
+
+
+def find_rescheduling_conflicts(play, using=None) -> list:
+    """
+    Performances of the play that would overlap another performance in
+    their hall once their end_time follows the play's new duration
+    """
+    using = using or router.db_for_write(Performance)
+    previous = (
+        Play.objects.using(using)
+        .filter(pk=play.pk)
+        .values_list("duration", flat=True)
+        .first()
+    )
+    if previous is None or play.duration <= previous:
+        # Shorter bookings cannot overlap anything new
+        return []
+
+    return [
+        performance
+        for performance in play.performances.using(using)
+        if find_overlapping(
+            performance.theater_hall_id,
+            performance.show_time,
+            Performance.get_end_time(performance.show_time, play),
+            exclude=performance,
+            using=using,
+        )
+    ]
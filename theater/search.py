@@ -0,0 +1,167 @@
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connections, router
+from django.db.models import F
+from django.db.models.expressions import RawSQL
+
+from theater.models import Actor, Genre, Play
+
+SEARCH_CONFIG = "english"
+FTS_TABLE = "theater_play_fts"
+
+
+def _tables() -> dict:
+    return {
+        "play": Play._meta.db_table,
+        "actor": Actor._meta.db_table,
+        "genre": Genre._meta.db_table,
+        "play_actors": Play.actors.through._meta.db_table,
+        "play_genres": Play.genres.through._meta.db_table,
+        "fts": FTS_TABLE,
+    }
+
+
+# Title ranks above description, which ranks above cast and genres
+POSTGRES_UPDATE_SQL = """
+    UPDATE {play} SET search_vector =
+        setweight(to_tsvector(%(config)s, coalesce({play}.title, '')), 'A')
+        || setweight(
+            to_tsvector(%(config)s, coalesce({play}.description, '')), 'B'
+        )
+        || setweight(to_tsvector(%(config)s, coalesce((
+            SELECT string_agg({actor}.first_name || ' ' || {actor}.last_name,
+                              ' ')
+            FROM {actor}
+            JOIN {play_actors} ON {play_actors}.actor_id = {actor}.id
+            WHERE {play_actors}.play_id = {play}.id
+        ), '')), 'C')
+        || setweight(to_tsvector(%(config)s, coalesce((
+            SELECT string_agg({genre}.name, ' ')
+            FROM {genre}
+            JOIN {play_genres} ON {play_genres}.genre_id = {genre}.id
+            WHERE {play_genres}.play_id = {play}.id
+        ), '')), 'C')
+    WHERE {play}.id = ANY(%(ids)s)
+"""
+
+SQLITE_INSERT_SQL = """
+    INSERT INTO {fts} (rowid, title, description, actors, genres)
+    SELECT
+        {play}.id,
+        {play}.title,
+        {play}.description,
+        (
+            SELECT group_concat(
+                {actor}.first_name || ' ' || {actor}.last_name, ' '
+            )
+            FROM {actor}
+            JOIN {play_actors} ON {play_actors}.actor_id = {actor}.id
+            WHERE {play_actors}.play_id = {play}.id
+        ),
+        (
+            SELECT group_concat({genre}.name, ' ')
+            FROM {genre}
+            JOIN {play_genres} ON {play_genres}.genre_id = {genre}.id
+            WHERE {play_genres}.play_id = {play}.id
+        )
+    FROM {play}
+    WHERE {play}.id IN ({placeholders})
+"""
+
+# bm25() weights for the title, description, actors and genres columns
+SQLITE_RANK_SQL = (
+    "SELECT -bm25({fts}, 10.0, 4.0, 2.0, 2.0) FROM {fts} "
+    "WHERE {fts} MATCH %s AND rowid = {play}.id"
+)
+SQLITE_MATCH_SQL = "SELECT rowid FROM {fts} WHERE {fts} MATCH %s"
+
+
+def update_search_index(play_ids, using=None) -> None:
+    """Rebuild search documents of the given plays"""
+    play_ids = [int(play_id) for play_id in play_ids]
+    if not play_ids:
+        return
+
+    using = using or router.db_for_write(Play)
+    connection = connections[using]
+
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute(
+                POSTGRES_UPDATE_SQL.format(**_tables()),
+                {"config": SEARCH_CONFIG, "ids": play_ids},
+            )
+        elif connection.vendor == "sqlite":
+            placeholders = ", ".join(["%s"] * len(play_ids))
+            cursor.execute(
+                "DELETE FROM {fts} WHERE rowid IN ({placeholders})".format(
+                    placeholders=placeholders, **_tables()
+                ),
+                play_ids,
+            )
+            cursor.execute(
+                SQLITE_INSERT_SQL.format(
+                    placeholders=placeholders, **_tables()
+                ),
+                play_ids,
+            )
+
+
+def remove_from_search_index(play_ids, using=None) -> None:
+    """Drop search documents of deleted plays"""
+    using = using or router.db_for_write(Play)
+    connection = connections[using]
+
+    if connection.vendor == "sqlite" and play_ids:
+        placeholders = ", ".join(["%s"] * len(play_ids))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "DELETE FROM {fts} WHERE rowid IN ({placeholders})".format(
+                    placeholders=placeholders, **_tables()
+                ),
+                list(play_ids),
+            )
+
+
+def rebuild_search_index(using=None) -> None:
+    update_search_index(
+        Play.objects.using(using).values_list("id", flat=True), using=using
+    )
+
+
+def _fts_match_expression(text: str) -> str:
+    """Turn user input into an FTS5 query of quoted prefix terms"""
+    return " ".join(f'"{term}"*' for term in re.findall(r"\w+", text))
+
+
+def search_plays(queryset, text: str):
+    """Filter plays matching the text and order them by relevance"""
+    vendor = connections[queryset.db].vendor
+
+    if vendor == "postgresql":
+        query = SearchQuery(
+            text, config=SEARCH_CONFIG, search_type="websearch"
+        )
+        return (
+            queryset.filter(search_vector=query)
+            .annotate(rank=SearchRank(F("search_vector"), query))
+            .order_by("-rank", "title")
+        )
+
+    if vendor == "sqlite":
+        match = _fts_match_expression(text)
+        if not match:
+            return queryset.none()
+
+        return (
+            queryset.filter(
+                id__in=RawSQL(SQLITE_MATCH_SQL.format(**_tables()), (match,))
+            )
+            .annotate(
+                rank=RawSQL(SQLITE_RANK_SQL.format(**_tables()), (match,))
+            )
+            .order_by("-rank", "title")
+        )
+
+    return queryset.filter(title__icontains=text)
@@ -1,9 +1,14 @@
-from django.db import transaction
+from django.db import IntegrityError, transaction
+from django.utils import timezone
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
+from rest_framework.settings import api_settings
 
 from theater.models import (
     Actor,
+    ArchivedReservation,
+    ArchivedTicket,
+    DailyAvailability,
     Genre,
     Play,
     Performance,
@@ -11,6 +16,54 @@ from theater.models import (
     Ticket,
     Reservation,
 )
+from theater.rollups import record_tickets, show_date
+from theater.scheduling import (
+    OVERLAP_MESSAGE,
+    enforced_by_database,
+    find_overlapping,
+    is_overlap_violation,
+)
+
+
+class ExpandableSerializerMixin:
+    """
+    Renders related objects in full when asked to with ``?expand=``.
+
+    ``expandable_fields`` maps relation fields to the serializer class of
+    the related object. The expansion tree of the root serializer comes
+    from the ``expand`` context and every nested serializer receives the
+    subtree under its field name.
+    """
+
+    expandable_fields = {}
+
+    def __init__(self, *args, expand=None, **kwargs):
+        self._expand = expand
+        super().__init__(*args, **kwargs)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        expand = self._expand
+        if expand is None:
+            expand = self.context.get("expand", {})
+
+        for name, field in fields.items():
+            nested = getattr(field, "child", field)
+            if isinstance(nested, ExpandableSerializerMixin):
+                nested._expand = expand.get(name, {})
+
+        for name, children in expand.items():
+            nested = getattr(fields.get(name), "child", fields.get(name))
+            if name in self.expandable_fields and not isinstance(
+                nested, ExpandableSerializerMixin
+            ):
+                serializer_class, many = self.expandable_fields[name]
+                kwargs = {"many": many, "read_only": True}
+                if issubclass(serializer_class, ExpandableSerializerMixin):
+                    kwargs["expand"] = children
+                fields[name] = serializer_class(**kwargs)
+
+        return fields
 
 
 class ActorSerializer(serializers.ModelSerializer):
@@ -37,10 +90,36 @@ class TheaterHallSerializer(serializers.ModelSerializer):
         fields = ("id", "name", "rows", "seats_in_row", "capacity")
 
 
-class PlaySerializer(serializers.ModelSerializer):
+class TheaterHallHeatmapSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    rows = serializers.IntegerField()
+    seats_in_row = serializers.IntegerField()
+    performances = serializers.IntegerField()
+    sold = serializers.ListField(
+        child=serializers.ListField(child=serializers.IntegerField())
+    )
+    occupancy = serializers.ListField(
+        child=serializers.ListField(child=serializers.FloatField())
+    )
+
+
+class PlaySerializer(ExpandableSerializerMixin, serializers.ModelSerializer):
+    expandable_fields = {
+        "actors": (ActorSerializer, True),
+        "genres": (GenreSerializer, True),
+    }
+
     class Meta:
         model = Play
-        fields = ("id", "title", "description", "image", "actors", "genres")
+        fields = (
+            "id",
+            "title",
+            "description",
+            "duration",
+            "image",
+            "actors",
+            "genres",
+        )
 
 
 class PlayListSerializer(PlaySerializer):
@@ -63,11 +142,50 @@ class PlayImageSerializer(serializers.ModelSerializer):
         fields = ("id", "image")
 
 
-class PerformanceSerializer(serializers.ModelSerializer):
+class PerformanceSerializer(
+    ExpandableSerializerMixin, serializers.ModelSerializer
+):
+    expandable_fields = {
+        "play": (PlaySerializer, False),
+        "theater_hall": (TheaterHallSerializer, False),
+    }
+
     class Meta:
         model = Performance
         fields = ("id", "play", "theater_hall", "show_time")
 
+    def validate(self, attrs):
+        data = super(PerformanceSerializer, self).validate(attrs=attrs)
+        if enforced_by_database():
+            return data
+
+        def value(name):
+            return attrs[name] if name in attrs else getattr(
+                self.instance, name
+            )
+
+        show_time = value("show_time")
+        if find_overlapping(
+            value("theater_hall"),
+            show_time,
+            Performance.get_end_time(show_time, value("play")),
+            exclude=self.instance,
+        ):
+            raise ValidationError(OVERLAP_MESSAGE, code="overlap")
+        return data
+
+    def save(self, **kwargs):
+        try:
+            with transaction.atomic():
+                return super(PerformanceSerializer, self).save(**kwargs)
+        except IntegrityError as error:
+            if not is_overlap_violation(error):
+                raise
+            raise ValidationError(
+                {api_settings.NON_FIELD_ERRORS_KEY: [OVERLAP_MESSAGE]},
+                code="overlap",
+            )
+
 
 class PerformanceListSerializer(PerformanceSerializer):
     play = serializers.CharField(source="play.title", read_only=True)
@@ -91,15 +209,41 @@ class PerformanceListSerializer(PerformanceSerializer):
         )
 
 
-class TicketSerializer(serializers.ModelSerializer):
+class DailyAvailabilitySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = DailyAvailability
+        fields = ("date", "performances", "seats_remaining", "sold_out")
+
+
+class TicketSerializer(ExpandableSerializerMixin, serializers.ModelSerializer):
+    expandable_fields = {"performance": (PerformanceSerializer, False)}
+
     def validate(self, attrs):
         data = super(TicketSerializer, self).validate(attrs=attrs)
+        # Tickets of past performances are archived away from the ticket
+        # table, their seats must not look free to a new booking
+        if attrs["performance"].show_time <= timezone.now():
+            raise ValidationError(
+                {"performance": "The performance has already started."},
+                code="started",
+            )
         Ticket.validate_ticket(
             attrs["row"],
             attrs["seat"],
             attrs["performance"].theater_hall,
             ValidationError,
         )
+        # Filtering on show_date lets a partitioned table check one partition
+        if Ticket.objects.filter(
+            performance=attrs["performance"],
+            row=attrs["row"],
+            seat=attrs["seat"],
+            show_date=show_date(attrs["performance"].show_time),
+        ).exists():
+            raise ValidationError(
+                "The fields performance, row, seat must make a unique set.",
+                code="unique",
+            )
         return data
 
     class Meta:
@@ -107,10 +251,6 @@ class TicketSerializer(serializers.ModelSerializer):
         fields = ("id", "row", "seat", "performance")
 
 
-class TicketListSerializer(TicketSerializer):
-    performance = PerformanceListSerializer(many=False, read_only=True)
-
-
 class TicketTakenSeatsSerializer(TicketSerializer):
     class Meta:
         model = Ticket
@@ -129,7 +269,9 @@ class PerformanceDetailSerializer(PerformanceSerializer):
         fields = ("id", "play", "theater_hall", "show_time", "taken_places")
 
 
-class ReservationSerializer(serializers.ModelSerializer):
+class ReservationSerializer(
+    ExpandableSerializerMixin, serializers.ModelSerializer
+):
     tickets = TicketSerializer(many=True, read_only=False, allow_empty=False)
 
     class Meta:
@@ -140,10 +282,108 @@ class ReservationSerializer(serializers.ModelSerializer):
         with transaction.atomic():
             tickets_data = validated_data.pop("tickets")
             reservation = Reservation.objects.create(**validated_data)
-            for ticket_data in tickets_data:
+            tickets = [
                 Ticket.objects.create(reservation=reservation, **ticket_data)
+                for ticket_data in tickets_data
+            ]
+            record_tickets(tickets)
             return reservation
 
 
 class ReservationListSerializer(ReservationSerializer):
-    tickets = TicketListSerializer(many=True, read_only=True)
+    """
+    Tickets reference performances by id, the reservation list side-loads
+    each performance once instead of nesting it in every ticket.
+    """
+
+    tickets = TicketSerializer(many=True, read_only=True)
+
+
+class ReservationCancelSerializer(serializers.Serializer):
+    """
+    Tickets of the reservation given in the context to cancel, all of
+    them when left out
+    """
+
+    tickets = serializers.ListField(
+        child=serializers.IntegerField(), required=False, allow_empty=False
+    )
+
+    def validate(self, attrs):
+        tickets = {
+            ticket.id: ticket
+            for ticket in self.context["reservation"]
+            .tickets.select_related("performance")
+        }
+        ticket_ids = attrs.get("tickets", list(tickets))
+
+        unknown = set(ticket_ids) - set(tickets)
+        if unknown:
+            raise ValidationError(
+                {
+                    "tickets": "Not tickets of this reservation: "
+                    + ", ".join(str(pk) for pk in sorted(unknown))
+                }
+            )
+        if any(
+            tickets[pk].performance.show_time <= timezone.now()
+            for pk in ticket_ids
+        ):
+            raise ValidationError(
+                "Tickets of performances that have started cannot be "
+                "cancelled."
+            )
+
+        attrs["tickets"] = ticket_ids
+        return attrs
+
+
+class ArchivedTicketSerializer(
+    ExpandableSerializerMixin, serializers.ModelSerializer
+):
+    expandable_fields = {"performance": (PerformanceSerializer, False)}
+
+    class Meta:
+        model = ArchivedTicket
+        fields = ("id", "row", "seat", "performance")
+
+
+class ArchivedReservationSerializer(
+    ExpandableSerializerMixin, serializers.ModelSerializer
+):
+    tickets = ArchivedTicketSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = ArchivedReservation
+        fields = ("id", "tickets", "created_at", "archived_at")
+
+
+class PlaySalesSerializer(serializers.Serializer):
+    play = serializers.IntegerField()
+    title = serializers.CharField()
+    tickets_sold = serializers.IntegerField()
+
+
+class TheaterHallSalesSerializer(serializers.Serializer):
+    theater_hall = serializers.IntegerField()
+    name = serializers.CharField()
+    tickets_sold = serializers.IntegerField()
+
+
+class DailySalesSerializer(serializers.Serializer):
+    date = serializers.DateField()
+    tickets_sold = serializers.IntegerField()
+
+
+class PerformanceOccupancySerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    title = serializers.CharField()
+    show_time = serializers.DateTimeField()
+    capacity = serializers.IntegerField()
+    tickets_sold = serializers.IntegerField()
+    occupancy = serializers.FloatField(allow_null=True)
+
+
+class SalesVelocitySerializer(serializers.Serializer):
+    tickets_last_hour = serializers.IntegerField()
+    tickets_per_minute = serializers.FloatField()
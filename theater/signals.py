@@ -0,0 +1,177 @@
+from datetime import timedelta
+from functools import partial
+
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import Signal, receiver
+
+from theater.caching import bump_catalog_version, bump_performance_version
+from theater.models import (
+    Actor,
+    Genre,
+    Performance,
+    Play,
+    TheaterHall,
+    Ticket,
+)
+from theater.rollups import refresh_days, show_date
+from theater.search import remove_from_search_index, update_search_index
+
+# Sent per performance once a cancellation is committed, with the
+# ``performance_id`` and the freed ``seats`` as (row, seat) pairs
+seats_released = Signal()
+
+
+@receiver(post_save, sender=Play)
+def index_play(sender, instance, raw=False, using=None, **kwargs):
+    if not raw:
+        update_search_index([instance.pk], using=using)
+
+
+@receiver(post_delete, sender=Play)
+def unindex_play(sender, instance, using=None, **kwargs):
+    remove_from_search_index([instance.pk], using=using)
+
+
+@receiver(m2m_changed, sender=Play.actors.through)
+@receiver(m2m_changed, sender=Play.genres.through)
+def index_play_relations(
+    sender, instance, action, reverse, pk_set, using=None, **kwargs
+):
+    if action == "pre_clear" and reverse:
+        instance._search_play_ids = list(
+            instance.plays.values_list("id", flat=True)
+        )
+    elif action in ("post_add", "post_remove"):
+        update_search_index(
+            pk_set if reverse else [instance.pk], using=using
+        )
+    elif action == "post_clear":
+        update_search_index(
+            instance.__dict__.pop("_search_play_ids", [])
+            if reverse
+            else [instance.pk],
+            using=using,
+        )
+
+
+@receiver(post_save, sender=Actor)
+@receiver(post_save, sender=Genre)
+def index_related_plays(
+    sender, instance, created, raw=False, using=None, **kwargs
+):
+    if not created and not raw:
+        update_search_index(
+            instance.plays.values_list("id", flat=True), using=using
+        )
+
+
+@receiver(pre_delete, sender=Actor)
+@receiver(pre_delete, sender=Genre)
+def remember_related_plays(sender, instance, **kwargs):
+    instance._search_play_ids = list(
+        instance.plays.values_list("id", flat=True)
+    )
+
+
+@receiver(post_delete, sender=Actor)
+@receiver(post_delete, sender=Genre)
+def index_plays_of_deleted(sender, instance, using=None, **kwargs):
+    update_search_index(
+        instance.__dict__.pop("_search_play_ids", []), using=using
+    )
+
+
+@receiver(post_save, sender=Play)
+@receiver(post_save, sender=Actor)
+@receiver(post_save, sender=Genre)
+@receiver(post_save, sender=Performance)
+@receiver(post_save, sender=TheaterHall)
+@receiver(post_delete, sender=Play)
+@receiver(post_delete, sender=Actor)
+@receiver(post_delete, sender=Genre)
+@receiver(post_delete, sender=Performance)
+@receiver(post_delete, sender=TheaterHall)
+def invalidate_catalog(sender, **kwargs):
+    bump_catalog_version()
+
+
+@receiver(post_save, sender=Ticket)
+def invalidate_booked_seat_map(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        transaction.on_commit(
+            partial(bump_performance_version, instance.performance_id)
+        )
+
+
+@receiver(seats_released)
+def invalidate_seat_map(sender, performance_id, **kwargs):
+    # Freed seats would otherwise stay taken in cached seat maps until
+    # they expire
+    bump_performance_version(performance_id)
+
+
+@receiver(m2m_changed, sender=Play.actors.through)
+@receiver(m2m_changed, sender=Play.genres.through)
+def invalidate_catalog_relations(sender, action, **kwargs):
+    if action.startswith("post_"):
+        bump_catalog_version()
+
+
+@receiver(pre_save, sender=Performance)
+def remember_show_date(sender, instance, raw=False, **kwargs):
+    if instance.pk and not raw:
+        instance._previous_show_time = (
+            Performance.objects.filter(pk=instance.pk)
+            .values_list("show_time", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=Performance)
+@receiver(post_delete, sender=Performance)
+def refresh_performance_days(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+
+    previous_show_time = instance.__dict__.pop("_previous_show_time", None)
+    if previous_show_time and show_date(previous_show_time) != show_date(
+        instance.show_time
+    ):
+        Ticket.objects.filter(performance=instance).update(
+            show_date=show_date(instance.show_time)
+        )
+
+    show_times = [instance.show_time, previous_show_time]
+    refresh_days(
+        show_date(show_time) for show_time in show_times if show_time
+    )
+
+
+@receiver(post_save, sender=Play)
+def reschedule_play_performances(
+    sender, instance, created, raw=False, **kwargs
+):
+    if not created and not raw:
+        end_time = F("show_time") + timedelta(minutes=instance.duration)
+        Performance.objects.filter(play=instance).exclude(
+            end_time=end_time
+        ).update(end_time=end_time)
+
+
+@receiver(post_save, sender=TheaterHall)
+def refresh_hall_days(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw:
+        refresh_days(
+            show_date(show_time)
+            for show_time in instance.performances.values_list(
+                "show_time", flat=True
+            )
+        )
@@ -0,0 +1,159 @@
+from datetime import datetime, timedelta, timezone
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from theater.admin import EstimatedCountPaginator
+from theater.models import (
+    DailyAvailability,
+    Performance,
+    Play,
+    Reservation,
+    SalesRollup,
+    TheaterHall,
+    Ticket,
+)
+from theater.rollups import record_tickets
+
+TICKET_CHANGELIST_URL = reverse("admin:theater_ticket_changelist")
+RESERVATION_CHANGELIST_URL = reverse(
+    "admin:theater_reservation_changelist"
+)
+
+
+class TheaterAdminTests(TestCase):
+    """Test admin changelists and forms of theater models"""
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = get_user_model().objects.create_superuser(
+            email="admin@test.com", password="1qazcde3"
+        )
+        cls.hall = TheaterHall.objects.create(
+            name="test_hall", rows=10, seats_in_row=10
+        )
+        cls.reservation = Reservation.objects.create(user=cls.admin)
+        cls.performances = [
+            Performance.objects.create(
+                play=Play.objects.create(title=f"play_{number}"),
+                theater_hall=cls.hall,
+                show_time=datetime(
+                    2030, 1, number, 18, 0, tzinfo=timezone.utc
+                ),
+            )
+            for number in range(1, 4)
+        ]
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def create_tickets(self, row, seats):
+        for performance in self.performances:
+            for seat in range(1, seats + 1):
+                Ticket.objects.create(
+                    row=row,
+                    seat=seat,
+                    performance=performance,
+                    reservation=self.reservation,
+                )
+
+    def changelist_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(TICKET_CHANGELIST_URL)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_ticket_changelist_queries_do_not_grow(self):
+        self.create_tickets(1, 1)
+        few = self.changelist_queries()
+        self.create_tickets(2, 5)
+        many = self.changelist_queries()
+
+        self.assertEqual(few, many)
+
+    def test_ticket_add_form_has_no_select_of_all_rows(self):
+        response = self.client.get(reverse("admin:theater_ticket_add"))
+
+        self.assertContains(response, 'class="vForeignKeyRawIdAdminField"')
+        self.assertNotContains(response, self.performances[0].play.title)
+
+    def test_paginator_counts_filtered_changelist_exactly(self):
+        self.create_tickets(1, 2)
+
+        paginator = EstimatedCountPaginator(
+            Ticket.objects.filter(seat=1), per_page=100
+        )
+
+        self.assertEqual(paginator.count, 3)
+
+    def test_cancel_action_skips_started_performances(self):
+        self.create_tickets(1, 1)
+        upcoming = Reservation.objects.create(user=self.admin)
+        record_tickets(
+            [
+                Ticket.objects.create(
+                    row=2,
+                    seat=1,
+                    performance=self.performances[0],
+                    reservation=upcoming,
+                )
+            ]
+        )
+        Performance.objects.filter(id=self.performances[1].id).update(
+            show_time=datetime.now(timezone.utc) - timedelta(hours=1)
+        )
+
+        response = self.client.post(
+            RESERVATION_CHANGELIST_URL,
+            {
+                "action": "cancel_reservations",
+                "_selected_action": [self.reservation.id, upcoming.id],
+            },
+            follow=True,
+        )
+
+        self.assertContains(response, "Released 1 seats.")
+        self.assertContains(response, "Skipped 1 reservations")
+        self.assertFalse(Reservation.objects.filter(id=upcoming.id).exists())
+        self.assertEqual(self.reservation.tickets.count(), 3)
+
+    def sold_per_day(self):
+        return dict(
+            DailyAvailability.objects.values_list("date", "tickets_sold")
+        )
+
+    def test_ticket_added_and_moved_in_admin_counted_as_sold(self):
+        first, second = self.performances[:2]
+
+        self.client.post(
+            reverse("admin:theater_ticket_add"),
+            {
+                "row": 1,
+                "seat": 1,
+                "performance": first.id,
+                "reservation": self.reservation.id,
+            },
+        )
+        ticket = Ticket.objects.get()
+        self.assertEqual(self.sold_per_day()[ticket.show_date], 1)
+        self.assertEqual(SalesRollup.objects.get().tickets, 1)
+
+        self.client.post(
+            reverse("admin:theater_ticket_change", args=[ticket.id]),
+            {
+                "row": 1,
+                "seat": 1,
+                "performance": second.id,
+                "reservation": self.reservation.id,
+            },
+        )
+        ticket.refresh_from_db()
+        sold = self.sold_per_day()
+        self.assertEqual(sold[ticket.show_date], 1)
+        self.assertEqual(sum(sold.values()), 1)
+        self.assertEqual(
+            dict(SalesRollup.objects.values_list("performance", "tickets")),
+            {first.id: 0, second.id: 1},
+        )
@@ -0,0 +1,168 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theater.models import Genre, Play, TheaterHall
+from theater.throttling import CounterRateThrottle
+from theater_service_api.middleware import PRIMARY_PIN_COOKIE
+
+BATCH_URL = reverse("batch")
+GENRE_URL = reverse("theater:genre-list")
+PLAY_URL = reverse("theater:play-list")
+ME_URL = reverse("user:manage")
+TOKEN_URL = reverse("user:token_obtain_pair")
+
+
+def batch(*urls, parallel=False):
+    return {
+        "requests": [{"method": "GET", "url": url} for url in urls],
+        "parallel": parallel,
+    }
+
+
+class BatchAPITests(TestCase):
+    """Test running API reads in one batch request"""
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="user@test.com", password="1qazcde3"
+        )
+        Genre.objects.create(name="Drama")
+        TheaterHall.objects.create(name="test_hall", rows=5, seats_in_row=5)
+        Play.objects.create(title="Hamlet")
+
+    def setUp(self):
+        CounterRateThrottle.reset()
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def tearDown(self):
+        CounterRateThrottle.reset()
+        cache.clear()
+
+    def test_batch_returns_responses_in_order(self):
+        response = self.client.post(
+            BATCH_URL,
+            batch(GENRE_URL, f"{PLAY_URL}?fields=title", ME_URL),
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        genres, plays, me = response.data["responses"]
+        self.assertEqual(genres["status"], 200)
+        self.assertEqual(genres["body"][0]["name"], "Drama")
+        self.assertEqual(plays["body"], [{"title": "Hamlet"}])
+        self.assertEqual(me["url"], ME_URL)
+        self.assertEqual(me["body"]["email"], "user@test.com")
+
+    def test_sub_request_errors_reported_per_item(self):
+        response = self.client.post(
+            BATCH_URL,
+            batch(
+                reverse("theater:play-detail", args=[999999]),
+                "/api/theater/nowhere/",
+                GENRE_URL,
+            ),
+            format="json",
+        )
+
+        self.assertEqual(
+            [item["status"] for item in response.data["responses"]],
+            [404, 404, 200],
+        )
+
+    def test_sub_requests_keep_view_permissions(self):
+        response = self.client.post(
+            BATCH_URL,
+            batch(reverse("theater:sales-plays")),
+            format="json",
+        )
+
+        self.assertEqual(response.data["responses"][0]["status"], 403)
+
+    def test_sub_requests_keep_view_authentication(self):
+        """Test that views not accepting JWTs are not reached with one"""
+        client = APIClient()
+        token = client.post(
+            TOKEN_URL, {"email": "user@test.com", "password": "1qazcde3"}
+        ).data["access"]
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        response = client.post(
+            BATCH_URL, batch(GENRE_URL, ME_URL), format="json"
+        )
+
+        self.assertEqual(
+            [item["status"] for item in response.data["responses"]],
+            [200, 401],
+        )
+        self.assertEqual(
+            client.get(ME_URL).status_code, status.HTTP_401_UNAUTHORIZED
+        )
+
+    def test_only_api_get_requests_accepted(self):
+        for payload in (
+            batch("/admin/"),
+            {"requests": [{"method": "POST", "url": GENRE_URL}]},
+            {"requests": []},
+        ):
+            response = self.client.post(BATCH_URL, payload, format="json")
+
+            self.assertEqual(
+                response.status_code, status.HTTP_400_BAD_REQUEST
+            )
+
+    @override_settings(BATCH_MAX_REQUESTS=2)
+    def test_batch_size_capped(self):
+        response = self.client.post(
+            BATCH_URL, batch(GENRE_URL, GENRE_URL, GENRE_URL), format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_batch_requires_authentication(self):
+        response = APIClient().post(BATCH_URL, batch(GENRE_URL), format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_batch_does_not_pin_reads_to_primary(self):
+        response = self.client.post(BATCH_URL, batch(GENRE_URL), format="json")
+
+        self.assertNotIn(PRIMARY_PIN_COOKIE, response.cookies)
+
+
+class ParallelBatchAPITests(TransactionTestCase):
+    """Test batches spread over worker threads"""
+    def setUp(self):
+        CounterRateThrottle.reset()
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            email="user@test.com", password="1qazcde3"
+        )
+        Genre.objects.create(name="Drama")
+        Play.objects.create(title="Hamlet")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def tearDown(self):
+        CounterRateThrottle.reset()
+        cache.clear()
+
+    def test_parallel_batch(self):
+        response = self.client.post(
+            BATCH_URL,
+            batch(GENRE_URL, PLAY_URL, ME_URL, parallel=True),
+            format="json",
+        )
+
+        self.assertEqual(
+            [item["status"] for item in response.data["responses"]],
+            [200, 200, 200],
+        )
+        self.assertEqual(
+            response.data["responses"][1]["body"][0]["title"], "Hamlet"
+        )
@@ -0,0 +1,120 @@
+from datetime import datetime, timezone
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theater.models import (
+    Actor,
+    Genre,
+    Performance,
+    Play,
+    Reservation,
+    TheaterHall,
+    Ticket,
+)
+from theater.throttling import CounterRateThrottle
+
+PERFORMANCE_URL = reverse("theater:performance-list")
+RESERVATION_URL = reverse("theater:reservation-list")
+
+
+class ExpandTests(TestCase):
+    """Test ?expand= nesting of related objects and its query plan"""
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="user@test.com", password="1qazcde3"
+        )
+        cls.hall = TheaterHall.objects.create(
+            name="test_hall", rows=10, seats_in_row=10
+        )
+        genre = Genre.objects.create(name="Tragedy")
+        reservation = Reservation.objects.create(user=cls.user)
+        cls.actors = []
+        for number in range(1, 4):
+            play = Play.objects.create(title=f"play_{number}")
+            play.genres.add(genre)
+            actor = Actor.objects.create(
+                first_name="Actor", last_name=str(number)
+            )
+            play.actors.add(actor)
+            cls.actors.append(actor)
+            performance = Performance.objects.create(
+                play=play,
+                theater_hall=cls.hall,
+                show_time=datetime(
+                    2030, 1, number, 18, 0, tzinfo=timezone.utc
+                ),
+            )
+            Ticket.objects.create(
+                row=1,
+                seat=number,
+                performance=performance,
+                reservation=reservation,
+            )
+
+    def setUp(self):
+        CounterRateThrottle.reset()
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def tearDown(self):
+        CounterRateThrottle.reset()
+        cache.clear()
+
+    def test_performance_list_expands_nested_play(self):
+        with self.assertNumQueries(3):
+            response = self.client.get(
+                PERFORMANCE_URL,
+                {"expand": "play.actors,play.genres,theater_hall"},
+            )
+
+        performance = response.data[0]
+        self.assertEqual(performance["play"]["title"], "play_1")
+        self.assertEqual(
+            performance["play"]["actors"][0]["full_name"], "Actor 1"
+        )
+        self.assertEqual(performance["play"]["genres"][0]["name"], "Tragedy")
+        self.assertEqual(performance["theater_hall"]["id"], self.hall.id)
+
+    def test_unexpanded_fields_keep_their_format(self):
+        response = self.client.get(PERFORMANCE_URL, {"expand": "play"})
+
+        self.assertEqual(
+            response.data[0]["play"]["actors"], [self.actors[0].id]
+        )
+        self.assertEqual(response.data[0]["theater_hall"], "test_hall")
+
+    def test_reservation_tickets_expand_performance(self):
+        with self.assertNumQueries(6):
+            response = self.client.get(
+                RESERVATION_URL,
+                {"expand": "tickets.performance.play.actors"},
+            )
+
+        tickets = response.data["results"][0]["tickets"]
+        self.assertEqual(len(tickets), 3)
+        self.assertEqual(
+            tickets[0]["performance"]["play"]["actors"][0]["last_name"], "1"
+        )
+
+    def test_expand_respects_fields(self):
+        response = self.client.get(
+            PERFORMANCE_URL, {"expand": "play,theater_hall", "fields": "play"}
+        )
+
+        self.assertEqual(list(response.data[0]), ["play"])
+        self.assertEqual(response.data[0]["play"]["title"], "play_1")
+
+    def test_unknown_expansion_rejected(self):
+        response = self.client.get(PERFORMANCE_URL, {"expand": "play.budget"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.data["expand"], "Cannot expand play.budget."
+        )
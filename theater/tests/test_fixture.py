@@ -0,0 +1,31 @@
+from io import StringIO
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from theater.models import Performance, Ticket
+
+FIXTURE = Path(settings.BASE_DIR) / "theater_fixture.json"
+
+
+class SampleFixtureTests(TestCase):
+    """Test that the sample data of the README loads"""
+    def test_fixture_loads(self):
+        call_command("loaddata", FIXTURE, stdout=StringIO())
+
+        self.assertEqual(Ticket.objects.count(), 8)
+        for ticket in Ticket.objects.select_related("performance"):
+            self.assertEqual(
+                ticket.show_date,
+                timezone.localdate(ticket.performance.show_time),
+            )
+        for performance in Performance.objects.select_related("play"):
+            self.assertEqual(
+                performance.end_time,
+                Performance.get_end_time(
+                    performance.show_time, performance.play
+                ),
+            )
@@ -0,0 +1,124 @@
+import io
+from datetime import datetime, timezone
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theater.heatmaps import SEAT_PIXELS
+from theater.models import (
+    ArchivedReservation,
+    ArchivedTicket,
+    Performance,
+    Play,
+    Reservation,
+    TheaterHall,
+    Ticket,
+)
+
+
+def heatmap_url(hall_id):
+    return reverse("theater:theater-hall-heatmap", args=[hall_id])
+
+
+class HallHeatmapTests(TestCase):
+    """Test seat occupancy heatmaps of theater halls"""
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = get_user_model().objects.create_user(
+            email="admin@test.com", password="1qazcde3", is_staff=True
+        )
+        cls.hall = TheaterHall.objects.create(
+            name="test_hall", rows=2, seats_in_row=3
+        )
+        play = Play.objects.create(title="test_play")
+        cls.october = Performance.objects.create(
+            play=play,
+            theater_hall=cls.hall,
+            show_time=datetime(2025, 10, 10, 18, 0, tzinfo=timezone.utc),
+        )
+        cls.november = Performance.objects.create(
+            play=play,
+            theater_hall=cls.hall,
+            show_time=datetime(2025, 11, 10, 18, 0, tzinfo=timezone.utc),
+        )
+        reservation = Reservation.objects.create(user=cls.admin)
+        for performance, row, seat in (
+            (cls.october, 1, 1),
+            (cls.october, 1, 2),
+            (cls.november, 1, 1),
+        ):
+            Ticket.objects.create(
+                row=row, seat=seat, performance=performance, reservation=reservation
+            )
+
+        archived = ArchivedReservation.objects.create(
+            id=1000, created_at=cls.october.show_time, user=cls.admin
+        )
+        ArchivedTicket.objects.create(
+            id=1000, row=2, seat=3, performance=cls.october, reservation=archived
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_heatmap_arrays(self):
+        response = self.client.get(heatmap_url(self.hall.id))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["performances"], 2)
+        self.assertEqual(response.data["sold"], [[2, 1, 0], [0, 0, 1]])
+        self.assertEqual(
+            response.data["occupancy"], [[1.0, 0.5, 0.0], [0.0, 0.0, 0.5]]
+        )
+
+    def test_heatmap_date_range(self):
+        response = self.client.get(
+            heatmap_url(self.hall.id), {"from": "2025-11-01", "to": "2025-11-30"}
+        )
+
+        self.assertEqual(response.data["performances"], 1)
+        self.assertEqual(response.data["sold"], [[1, 0, 0], [0, 0, 0]])
+
+    def test_heatmap_cached(self):
+        self.client.get(heatmap_url(self.hall.id))
+
+        with self.assertNumQueries(1):
+            response = self.client.get(heatmap_url(self.hall.id))
+
+        self.assertEqual(response.data["sold"], [[2, 1, 0], [0, 0, 1]])
+
+    def test_heatmap_png(self):
+        response = self.client.get(heatmap_url(self.hall.id), {"format": "png"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "image/png")
+        image = Image.open(io.BytesIO(response.content))
+        self.assertEqual(image.size, (3 * SEAT_PIXELS, 2 * SEAT_PIXELS))
+
+    def test_heatmap_png_errors_as_json(self):
+        response = self.client.get(
+            heatmap_url(self.hall.id), {"format": "png", "from": "October"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("from", response.json())
+
+    def test_heatmap_admin_only(self):
+        user = get_user_model().objects.create_user(
+            email="user@test.com", password="1qazcde3"
+        )
+        self.client.force_authenticate(user=user)
+
+        response = self.client.get(heatmap_url(self.hall.id))
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
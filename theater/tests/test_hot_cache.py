@@ -0,0 +1,206 @@
+import threading
+import time
+from datetime import datetime, timezone
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from theater.caching import get_or_refresh
+from theater.models import (
+    Performance,
+    Play,
+    Reservation,
+    TheaterHall,
+    Ticket,
+)
+from theater.throttling import CounterRateThrottle
+
+PERFORMANCE_URL = reverse("theater:performance-list")
+
+
+class Computation:
+    """Counts calls and optionally blocks them until released"""
+    def __init__(self, value="value", blocking=False):
+        self.value = value
+        self.calls = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+        if not blocking:
+            self.release.set()
+
+    def __call__(self):
+        self.calls += 1
+        self.started.set()
+        self.release.wait(5)
+        return self.value
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+class GetOrRefreshTests(SimpleTestCase):
+    """Test single-flight and stale-while-revalidate cache reads"""
+    def setUp(self):
+        cache.clear()
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_fresh_value_computed_once(self):
+        compute = Computation()
+
+        values = [get_or_refresh("key", compute, 60, 120) for _ in range(3)]
+
+        self.assertEqual(values, ["value"] * 3)
+        self.assertEqual(compute.calls, 1)
+
+    def test_stale_value_served_while_refreshed(self):
+        get_or_refresh("key", Computation("old"), 0, 120)
+        refresh = Computation("new")
+
+        self.assertEqual(get_or_refresh("key", refresh, 60, 120), "old")
+        self.assertTrue(
+            wait_for(lambda: get_or_refresh("key", refresh, 60, 120) == "new")
+        )
+        self.assertEqual(refresh.calls, 1)
+
+    def test_concurrent_misses_coalesced(self):
+        compute = Computation(blocking=True)
+        results = []
+
+        def read():
+            results.append(get_or_refresh("key", compute, 60, 120))
+
+        threads = [threading.Thread(target=read) for _ in range(4)]
+        threads[0].start()
+        compute.started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        compute.release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(results, ["value"] * 4)
+        self.assertEqual(compute.calls, 1)
+
+    def test_waiting_callers_recompute_after_failure(self):
+        def fail():
+            raise ValueError
+
+        with self.assertRaises(ValueError):
+            get_or_refresh("key", fail, 60, 120)
+
+        self.assertEqual(
+            get_or_refresh("key", Computation(), 60, 120), "value"
+        )
+
+
+class CachedPerformanceTests(TestCase):
+    """Test caching of performance lists and seat maps"""
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="user@test.com", password="1qazcde3"
+        )
+        cls.hall = TheaterHall.objects.create(
+            name="test_hall", rows=10, seats_in_row=10
+        )
+        cls.play = Play.objects.create(title="test_play")
+        cls.performance = Performance.objects.create(
+            play=cls.play,
+            theater_hall=cls.hall,
+            show_time=datetime(2030, 1, 10, 18, 0, tzinfo=timezone.utc),
+        )
+
+    def setUp(self):
+        CounterRateThrottle.reset()
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def tearDown(self):
+        CounterRateThrottle.reset()
+        cache.clear()
+
+    def test_performance_list_served_from_cache(self):
+        first = self.client.get(PERFORMANCE_URL)
+
+        with self.assertNumQueries(0):
+            second = self.client.get(PERFORMANCE_URL)
+
+        self.assertEqual(first.data, second.data)
+
+    def test_seat_map_served_from_cache(self):
+        url = reverse("theater:performance-detail", args=[self.performance.id])
+        self.client.get(url)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+
+        self.assertEqual(response.data["taken_places"], [])
+
+    def test_booking_refreshes_seat_map(self):
+        other = Performance.objects.create(
+            play=self.play,
+            theater_hall=self.hall,
+            show_time=datetime(2030, 1, 11, 18, 0, tzinfo=timezone.utc),
+        )
+        url = reverse("theater:performance-detail", args=[self.performance.id])
+        other_url = reverse("theater:performance-detail", args=[other.id])
+        self.client.get(url)
+        self.client.get(other_url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Ticket.objects.create(
+                reservation=Reservation.objects.create(user=self.user),
+                performance=self.performance,
+                row=1,
+                seat=1,
+            )
+
+        response = self.client.get(url)
+        self.assertEqual(len(response.data["taken_places"]), 1)
+        with self.assertNumQueries(0):
+            self.client.get(other_url)
+
+    @override_settings(PERFORMANCE_CACHE={"SOFT_TTL": 0, "HARD_TTL": 60})
+    def test_booking_serves_stale_list_while_refreshing(self):
+        self.client.get(PERFORMANCE_URL)
+        with self.captureOnCommitCallbacks(execute=True):
+            Ticket.objects.create(
+                reservation=Reservation.objects.create(user=self.user),
+                performance=self.performance,
+                row=1,
+                seat=1,
+            )
+
+        with mock.patch(
+            "theater.caching._refresh_in_background"
+        ) as refresh, self.assertNumQueries(0):
+            responses = [self.client.get(PERFORMANCE_URL) for _ in range(2)]
+
+        self.assertEqual(
+            [response.data[0]["tickets_available"] for response in responses],
+            [100, 100],
+        )
+        self.assertEqual(refresh.call_count, 1)
+
+    def test_schedule_change_invalidates_cache(self):
+        self.client.get(PERFORMANCE_URL)
+        Performance.objects.create(
+            play=self.play,
+            theater_hall=self.hall,
+            show_time=datetime(2030, 1, 11, 18, 0, tzinfo=timezone.utc),
+        )
+
+        response = self.client.get(PERFORMANCE_URL)
+
+        self.assertEqual(len(response.data), 2)
@@ -0,0 +1,237 @@
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, connections
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theater.models import (
+    IdempotencyKey,
+    Performance,
+    Play,
+    Reservation,
+    TheaterHall,
+    Ticket,
+)
+from theater.serializers import ReservationSerializer
+from theater.throttling import CounterRateThrottle
+
+RESERVATION_URL = reverse("theater:reservation-list")
+
+
+class IdempotentReservationTests(TestCase):
+    """Test Idempotency-Key handling of reservation creation"""
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="user@test.com", password="1qazcde3"
+        )
+        cls.performance = Performance.objects.create(
+            play=Play.objects.create(title="test_play"),
+            theater_hall=TheaterHall.objects.create(
+                name="test_hall", rows=10, seats_in_row=10
+            ),
+            show_time=datetime(2030, 1, 10, 18, 0, tzinfo=timezone.utc),
+        )
+
+    def setUp(self):
+        CounterRateThrottle.reset()
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def tearDown(self):
+        CounterRateThrottle.reset()
+        cache.clear()
+
+    def reserve(self, seat=1, key="key-1", client=None):
+        return (client or self.client).post(
+            RESERVATION_URL,
+            {
+                "tickets": [
+                    {"row": 1, "seat": seat, "performance": self.performance.id}
+                ]
+            },
+            format="json",
+            HTTP_IDEMPOTENCY_KEY=key,
+        )
+
+    def test_retry_replays_first_response(self):
+        first = self.reserve()
+
+        with CaptureQueriesContext(connection) as queries:
+            retry = self.reserve()
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.data, first.data)
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertEqual(Reservation.objects.count(), 1)
+        self.assertFalse(
+            any("theater_ticket" in query["sql"] for query in queries)
+        )
+
+    def test_key_reused_for_other_request_rejected(self):
+        self.reserve(seat=1)
+
+        response = self.reserve(seat=2)
+
+        self.assertEqual(
+            response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
+        self.assertEqual(Reservation.objects.count(), 1)
+
+    def test_failed_request_not_stored(self):
+        response = self.reserve(seat=11)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+        response = self.reserve(seat=11)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_keys_scoped_to_user(self):
+        other_client = APIClient()
+        other_client.force_authenticate(
+            user=get_user_model().objects.create_user(
+                email="other@test.com", password="1qazcde3"
+            )
+        )
+        self.reserve(seat=1)
+
+        response = self.reserve(seat=2, client=other_client)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Reservation.objects.count(), 2)
+
+    def test_expired_key_runs_request_again(self):
+        self.reserve(seat=1)
+        IdempotencyKey.objects.update(
+            expires_at=datetime.now(timezone.utc) - timedelta(seconds=1)
+        )
+
+        response = self.reserve(seat=2)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Reservation.objects.count(), 2)
+
+    def test_invalid_key_rejected(self):
+        response = self.reserve(key="k" * 256)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Reservation.objects.exists())
+
+    def test_purge_expired_keys(self):
+        self.reserve(seat=1, key="expired")
+        self.reserve(seat=2, key="live")
+        IdempotencyKey.objects.filter(key="expired").update(
+            expires_at=datetime.now(timezone.utc) - timedelta(seconds=1)
+        )
+
+        call_command("purge_idempotency_keys", stdout=StringIO())
+
+        self.assertEqual(
+            list(IdempotencyKey.objects.values_list("key", flat=True)),
+            ["live"],
+        )
+
+
+def blocked_on_lock() -> bool:
+    """Whether another connection waits for a row or index lock"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT count(*) FROM pg_stat_activity "
+            "WHERE wait_event_type = 'Lock'"
+        )
+        return cursor.fetchone()[0] > 0
+
+
+@unittest.skipUnless(
+    connection.vendor == "postgresql", "needs row locks across connections"
+)
+class ConcurrentIdempotentReservationTests(TransactionTestCase):
+    """Test that concurrent duplicates of a request run it once"""
+    def setUp(self):
+        CounterRateThrottle.reset()
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            email="user@test.com", password="1qazcde3"
+        )
+        self.performance = Performance.objects.create(
+            play=Play.objects.create(title="test_play"),
+            theater_hall=TheaterHall.objects.create(
+                name="test_hall", rows=10, seats_in_row=10
+            ),
+            show_time=datetime(2030, 1, 10, 18, 0, tzinfo=timezone.utc),
+        )
+
+    def tearDown(self):
+        CounterRateThrottle.reset()
+        cache.clear()
+
+    def test_concurrent_duplicate_waits_and_replays(self):
+        started = threading.Event()
+        release = threading.Event()
+        create = ReservationSerializer.create
+        responses = {}
+
+        def slow_create(serializer, validated_data):
+            started.set()
+            release.wait(5)
+            return create(serializer, validated_data)
+
+        def reserve(name):
+            client = APIClient()
+            client.force_authenticate(user=self.user)
+            try:
+                responses[name] = client.post(
+                    RESERVATION_URL,
+                    {
+                        "tickets": [
+                            {
+                                "row": 1,
+                                "seat": 1,
+                                "performance": self.performance.id,
+                            }
+                        ]
+                    },
+                    format="json",
+                    HTTP_IDEMPOTENCY_KEY="key-1",
+                )
+            finally:
+                connections.close_all()
+
+        first = threading.Thread(target=reserve, args=["first"])
+        duplicate = threading.Thread(target=reserve, args=["duplicate"])
+        with mock.patch.object(ReservationSerializer, "create", slow_create):
+            first.start()
+            self.assertTrue(started.wait(5))
+            duplicate.start()
+            deadline = time.monotonic() + 5
+            while not blocked_on_lock() and time.monotonic() < deadline:
+                time.sleep(0.01)
+            release.set()
+            first.join(10)
+            duplicate.join(10)
+
+        self.assertEqual(
+            responses["first"].status_code, status.HTTP_201_CREATED
+        )
+        self.assertEqual(
+            responses["duplicate"].status_code, status.HTTP_201_CREATED
+        )
+        self.assertEqual(responses["duplicate"]["Idempotent-Replayed"], "true")
+        self.assertEqual(
+            responses["duplicate"].data, responses["first"].data
+        )
+        self.assertEqual(Reservation.objects.count(), 1)
+        self.assertEqual(Ticket.objects.count(), 1)
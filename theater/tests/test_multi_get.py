@@ -0,0 +1,112 @@
+from datetime import datetime, timezone
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theater.mixins import MULTI_GET_MAX_IDS
+from theater.models import Actor, Genre, Performance, Play, TheaterHall
+from theater.throttling import CounterRateThrottle
+
+ACTOR_URL = reverse("theater:actor-list")
+PLAY_URL = reverse("theater:play-list")
+PERFORMANCE_URL = reverse("theater:performance-list")
+
+
+def ids_param(objects):
+    return {"ids": ",".join(str(obj.id) for obj in objects)}
+
+
+class MultiGetTests(TestCase):
+    """Test ?ids= batch retrieval of plays, performances and actors"""
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="user@test.com", password="1qazcde3"
+        )
+        hall = TheaterHall.objects.create(
+            name="test_hall", rows=10, seats_in_row=10
+        )
+        genre = Genre.objects.create(name="Drama")
+        cls.actors, cls.plays, cls.performances = [], [], []
+        for number in range(1, 5):
+            actor = Actor.objects.create(
+                first_name="Actor", last_name=str(number)
+            )
+            play = Play.objects.create(title=f"play_{number}")
+            play.actors.add(actor)
+            play.genres.add(genre)
+            cls.actors.append(actor)
+            cls.plays.append(play)
+            cls.performances.append(
+                Performance.objects.create(
+                    play=play,
+                    theater_hall=hall,
+                    show_time=datetime(
+                        2030, 1, number, 18, 0, tzinfo=timezone.utc
+                    ),
+                )
+            )
+
+    def setUp(self):
+        CounterRateThrottle.reset()
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def tearDown(self):
+        CounterRateThrottle.reset()
+        cache.clear()
+
+    def test_plays_in_requested_order(self):
+        plays = [self.plays[2], self.plays[0], self.plays[3]]
+
+        response = self.client.get(PLAY_URL, ids_param(plays))
+
+        self.assertEqual(
+            [play["id"] for play in response.data], [p.id for p in plays]
+        )
+        self.assertEqual(response.data[0]["actors"][0]["last_name"], "3")
+
+    def test_performances_rendered_as_detail(self):
+        performances = [self.performances[1], self.performances[0]]
+
+        with self.assertNumQueries(4):
+            response = self.client.get(
+                PERFORMANCE_URL, ids_param(performances)
+            )
+
+        self.assertEqual(
+            [performance["id"] for performance in response.data],
+            [performance.id for performance in performances],
+        )
+        self.assertEqual(response.data[0]["play"]["actors"], ["Actor 2"])
+        self.assertEqual(response.data[0]["taken_places"], [])
+
+    def test_query_count_does_not_grow_with_ids(self):
+        with self.assertNumQueries(4):
+            self.client.get(PERFORMANCE_URL, ids_param(self.performances))
+
+    def test_actors_unknown_ids_left_out(self):
+        response = self.client.get(
+            ACTOR_URL, {"ids": f"{self.actors[1].id},999999"}
+        )
+
+        self.assertEqual(
+            [actor["id"] for actor in response.data], [self.actors[1].id]
+        )
+
+    def test_invalid_ids_rejected(self):
+        response = self.client.get(PLAY_URL, {"ids": "1,two"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_too_many_ids_rejected(self):
+        ids = ",".join(str(pk) for pk in range(1, MULTI_GET_MAX_IDS + 2))
+
+        response = self.client.get(PLAY_URL, {"ids": ids})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
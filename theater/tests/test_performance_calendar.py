@@ -0,0 +1,112 @@
+from datetime import datetime, timezone
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theater.models import Performance, Play, TheaterHall
+
+CALENDAR_URL = reverse("theater:performance-calendar")
+RESERVATION_URL = reverse("theater:reservation-list")
+
+
+class PerformanceCalendarTests(TestCase):
+    """Test per-day availability calendar"""
+    @classmethod
+    def setUpTestData(cls):
+        cls.test_user = get_user_model().objects.create_user(
+            email="user@test.com", password="1qazcde3"
+        )
+        cls.play = Play.objects.create(title="test_play")
+        cls.hall_1 = TheaterHall.objects.create(
+            name="test_hall_1", rows=1, seats_in_row=2
+        )
+        cls.hall_2 = TheaterHall.objects.create(
+            name="test_hall_2", rows=5, seats_in_row=5
+        )
+        cls.performance_1 = Performance.objects.create(
+            play=cls.play,
+            theater_hall=cls.hall_1,
+            show_time=datetime(2030, 10, 10, 15, 00, tzinfo=timezone.utc),
+        )
+        cls.performance_2 = Performance.objects.create(
+            play=cls.play,
+            theater_hall=cls.hall_2,
+            show_time=datetime(2030, 10, 10, 18, 00, tzinfo=timezone.utc),
+        )
+        cls.performance_3 = Performance.objects.create(
+            play=cls.play,
+            theater_hall=cls.hall_1,
+            show_time=datetime(2030, 10, 11, 18, 00, tzinfo=timezone.utc),
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.test_user)
+
+    def get_calendar(self, month="2030-10"):
+        response = self.client.get(CALENDAR_URL, {"month": month})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {day["date"]: day for day in response.data}
+
+    def book(self, performance, *seats):
+        payload = {
+            "tickets": [
+                {"row": 1, "seat": seat, "performance": performance.id}
+                for seat in seats
+            ]
+        }
+        response = self.client.post(RESERVATION_URL, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_calendar_rolls_up_days(self):
+        """Test that each day reports performances and remaining seats"""
+        days = self.get_calendar()
+
+        self.assertEqual(
+            days["2030-10-10"],
+            {
+                "date": "2030-10-10",
+                "performances": 2,
+                "seats_remaining": 27,
+                "sold_out": False,
+            },
+        )
+        self.assertEqual(days["2030-10-11"]["seats_remaining"], 2)
+        self.assertEqual(self.get_calendar("2030-11"), {})
+
+    def test_calendar_follows_ticket_sales(self):
+        """Test that reservations update the rollup and sold-out flag"""
+        self.book(self.performance_3, 1, 2)
+        self.book(self.performance_1, 1)
+
+        days = self.get_calendar()
+
+        self.assertTrue(days["2030-10-11"]["sold_out"])
+        self.assertEqual(days["2030-10-10"]["seats_remaining"], 26)
+
+    def test_calendar_follows_schedule_changes(self):
+        """Test that moving and deleting performances updates both days"""
+        self.book(self.performance_3, 1)
+        self.performance_3.show_time = datetime(
+            2030, 10, 12, 18, 00, tzinfo=timezone.utc
+        )
+        self.performance_3.save()
+        self.performance_1.delete()
+
+        days = self.get_calendar()
+
+        self.assertNotIn("2030-10-11", days)
+        self.assertEqual(days["2030-10-12"]["seats_remaining"], 1)
+        self.assertEqual(days["2030-10-10"]["performances"], 1)
+
+    def test_calendar_is_single_query(self):
+        with self.assertNumQueries(1):
+            self.client.get(CALENDAR_URL, {"month": "2030-10"})
+
+    def test_calendar_month_required(self):
+        response = self.client.get(CALENDAR_URL, {"month": "10-2030"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,101 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theater.models import Actor, Genre, Play
+
+PLAY_URL = reverse("theater:play-list")
+FACETS_URL = reverse("theater:play-facets")
+
+
+class PlayFacetsTests(TestCase):
+    """Test facet counts on the play list"""
+    @classmethod
+    def setUpTestData(cls):
+        cls.test_user = get_user_model().objects.create_user(
+            email="user@test.com", password="1qazcde3"
+        )
+        cls.genre_1 = Genre.objects.create(name="test_genre_1")
+        cls.genre_2 = Genre.objects.create(name="test_genre_2")
+        cls.actor = Actor.objects.create(first_name="first", last_name="last")
+        cls.play_1 = Play.objects.create(title="test_play_1")
+        cls.play_2 = Play.objects.create(title="test_play_2")
+        cls.play_1.genres.add(cls.genre_1, cls.genre_2)
+        cls.play_2.genres.add(cls.genre_1)
+        cls.play_1.actors.add(cls.actor)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.test_user)
+        cache.clear()
+
+    def test_facet_counts(self):
+        """Test that plays are counted per genre and actor"""
+        response = self.client.get(PLAY_URL, {"facets": "genres,actors"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertEqual(
+            response.data["facets"],
+            {
+                "genres": [
+                    {"id": self.genre_1.id, "name": "test_genre_1", "count": 2},
+                    {"id": self.genre_2.id, "name": "test_genre_2", "count": 1},
+                ],
+                "actors": [
+                    {"id": self.actor.id, "name": "first last", "count": 1},
+                ],
+            },
+        )
+
+    def test_facet_counts_follow_filters(self):
+        """Test that facet counts are computed under current filters"""
+        response = self.client.get(
+            PLAY_URL, {"facets": "genres", "genres": self.genre_2.id}
+        )
+
+        self.assertEqual(
+            [genre["count"] for genre in response.data["facets"]["genres"]],
+            [1, 1],
+        )
+
+    def test_facets_cached_until_catalog_changes(self):
+        """Test that cached counts are reused and invalidated on change"""
+        self.client.get(PLAY_URL, {"facets": "actors"})
+
+        with self.assertNumQueries(3):
+            self.client.get(PLAY_URL, {"facets": "actors"})
+
+        self.play_2.actors.add(self.actor)
+        response = self.client.get(PLAY_URL, {"facets": "actors"})
+
+        self.assertEqual(response.data["facets"]["actors"][0]["count"], 2)
+
+    def test_facets_without_plays(self):
+        """Test that the facets endpoint runs one grouped query per facet"""
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                FACETS_URL, {"genres": self.genre_2.id}
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data,
+            {
+                "genres": [
+                    {"id": self.genre_1.id, "name": "test_genre_1", "count": 1},
+                    {"id": self.genre_2.id, "name": "test_genre_2", "count": 1},
+                ],
+                "actors": [
+                    {"id": self.actor.id, "name": "first last", "count": 1},
+                ],
+            },
+        )
+
+    def test_unknown_facet_rejected(self):
+        response = self.client.get(PLAY_URL, {"facets": "halls"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
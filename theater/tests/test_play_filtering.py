@@ -0,0 +1,87 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theater.models import Actor, Genre, Play
+
+PLAY_URL = reverse("theater:play-list")
+
+
+class PlayRelatedFilteringTests(TestCase):
+    """Test filtering plays by actors and genres with EXISTS subqueries"""
+    @classmethod
+    def setUpTestData(cls):
+        cls.test_user = get_user_model().objects.create_user(
+            email="user@test.com", password="1qazcde3"
+        )
+        cls.actor_1 = Actor.objects.create(first_name="first_1", last_name="last_1")
+        cls.actor_2 = Actor.objects.create(first_name="first_2", last_name="last_2")
+        cls.genre = Genre.objects.create(name="test_genre")
+        plays = Play.objects.bulk_create(
+            Play(title=f"test_play_{index:05}") for index in range(10000)
+        )
+        cls.both_actors = plays[:100]
+        cls.one_actor = plays[100:150]
+        Play.actors.through.objects.bulk_create(
+            [
+                Play.actors.through(play=play, actor=actor)
+                for play in cls.both_actors
+                for actor in (cls.actor_1, cls.actor_2)
+            ]
+            + [
+                Play.actors.through(play=play, actor=cls.actor_1)
+                for play in cls.one_actor
+            ]
+        )
+        Play.genres.through.objects.bulk_create(
+            Play.genres.through(play=play, genre=cls.genre)
+            for play in plays[:120]
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.test_user)
+
+    def get_ids(self, params):
+        response = self.client.get(PLAY_URL, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [play["id"] for play in response.data]
+
+    def test_match_any_returns_each_play_once(self):
+        """Test that plays with several matching actors are not duplicated"""
+        actors = f"{self.actor_1.id},{self.actor_2.id}"
+
+        with CaptureQueriesContext(connection) as queries:
+            ids = self.get_ids({"actors": actors})
+
+        self.assertEqual(len(ids), 150)
+        self.assertEqual(len(ids), len(set(ids)))
+        # plays, genres and actors prefetch
+        self.assertEqual(len(queries), 3)
+        plays_sql = queries[0]["sql"].upper()
+        self.assertIn("EXISTS", plays_sql)
+        self.assertNotIn("JOIN", plays_sql)
+
+    def test_match_all_requires_every_actor(self):
+        """Test that match=all keeps only plays with all given actors"""
+        actors = f"{self.actor_1.id},{self.actor_2.id}"
+        ids = self.get_ids({"actors": actors, "match": "all"})
+
+        self.assertEqual(ids, [play.id for play in self.both_actors])
+
+    def test_actors_and_genres_filters_combine(self):
+        """Test that actor and genre filters are both applied"""
+        ids = self.get_ids(
+            {"actors": self.actor_1.id, "genres": self.genre.id}
+        )
+
+        self.assertEqual(len(ids), 120)
+
+    def test_invalid_match_rejected(self):
+        response = self.client.get(PLAY_URL, {"match": "some"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,83 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theater.models import Actor, Genre, Play
+
+PLAY_URL = reverse("theater:play-list")
+
+
+class PlaySearchTests(TestCase):
+    """Test full-text search over plays"""
+    @classmethod
+    def setUpTestData(cls):
+        cls.test_user = get_user_model().objects.create_user(
+            email="user@test.com", password="1qazcde3"
+        )
+        cls.genre = Genre.objects.create(name="Tragedy")
+        cls.actor = Actor.objects.create(first_name="Ivan", last_name="Franko")
+        cls.play_1 = Play.objects.create(
+            title="Hamlet", description="Prince of Denmark"
+        )
+        cls.play_2 = Play.objects.create(
+            title="Forest Song", description="A play inspired by Hamlet"
+        )
+        cls.play_3 = Play.objects.create(title="Comedy of errors")
+        cls.play_3.genres.add(cls.genre)
+        cls.play_3.actors.add(cls.actor)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.test_user)
+
+    def search(self, text):
+        response = self.client.get(PLAY_URL, {"search": text})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [play["id"] for play in response.data["results"]]
+
+    def test_search_ranks_title_above_description(self):
+        """Test that title matches come before description matches"""
+        self.assertEqual(self.search("hamlet"), [self.play_1.id, self.play_2.id])
+
+    def test_search_by_actor_and_genre_names(self):
+        """Test that plays are found by cast and genre names"""
+        self.assertEqual(self.search("franko"), [self.play_3.id])
+        self.assertEqual(self.search("tragedy"), [self.play_3.id])
+
+    def test_search_results_are_paginated(self):
+        """Test that search response is paginated"""
+        response = self.client.get(PLAY_URL, {"search": "hamlet"})
+
+        self.assertEqual(response.data["count"], 2)
+        self.assertIn("next", response.data)
+
+    def test_search_index_follows_related_changes(self):
+        """Test that renaming actor or genre and removing cast reindexes"""
+        self.actor.last_name = "Shevchenko"
+        self.actor.save()
+        self.genre.delete()
+
+        self.assertEqual(self.search("shevchenko"), [self.play_3.id])
+        self.assertEqual(self.search("tragedy"), [])
+
+        self.play_3.actors.clear()
+        self.assertEqual(self.search("shevchenko"), [])
+
+    def test_search_ignores_query_syntax(self):
+        """Test that special characters in input do not break the query"""
+        self.assertEqual(self.search('"hamlet*) ('), [self.play_1.id, self.play_2.id])
+        self.assertEqual(self.search("!!!"), [])
+
+    def test_rebuild_search_index_command(self):
+        """Test that plays saved without signals are indexed by the command"""
+        play = Play.objects.bulk_create([Play(title="Macbeth")])[0]
+        self.assertEqual(self.search("macbeth"), [])
+
+        call_command("rebuild_search_index", stdout=StringIO())
+
+        self.assertEqual(self.search("macbeth"), [play.id])
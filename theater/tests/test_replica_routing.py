@@ -0,0 +1,65 @@
+from django.db import router
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from theater.models import Play
+from theater_service_api.middleware import (
+    PRIMARY_PIN_COOKIE,
+    ReplicaRoutingMiddleware,
+)
+
+
+def routing_view(request):
+    return HttpResponse(router.db_for_read(Play))
+
+
+@override_settings(DATABASE_REPLICAS=["replica_1"], REPLICA_STICKY_SECONDS=5)
+class ReplicaRoutingTests(SimpleTestCase):
+    """Test routing of safe requests to replicas with stickiness"""
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.middleware = ReplicaRoutingMiddleware(routing_view)
+
+    def test_safe_request_reads_from_replica(self):
+        response = self.middleware(self.factory.get("/"))
+
+        self.assertEqual(response.content, b"replica_1")
+        self.assertNotIn(PRIMARY_PIN_COOKIE, response.cookies)
+
+    def test_unsafe_request_reads_from_primary(self):
+        response = self.middleware(self.factory.post("/"))
+
+        self.assertEqual(response.content, b"default")
+
+    def test_reads_stick_to_primary_after_write(self):
+        """Test that the pin cookie keeps the next reads on the primary"""
+        response = self.middleware(self.factory.post("/"))
+        cookie = response.cookies[PRIMARY_PIN_COOKIE]
+        self.assertEqual(cookie["max-age"], 5)
+
+        request = self.factory.get("/")
+        request.COOKIES[PRIMARY_PIN_COOKIE] = cookie.value
+        response = self.middleware(request)
+
+        self.assertEqual(response.content, b"default")
+
+    def test_forged_pin_cookie_ignored(self):
+        request = self.factory.get("/")
+        request.COOKIES[PRIMARY_PIN_COOKIE] = "1"
+        response = self.middleware(request)
+
+        self.assertEqual(response.content, b"replica_1")
+
+    def test_reads_outside_requests_use_primary(self):
+        self.assertEqual(router.db_for_read(Play), "default")
+
+    @override_settings(DATABASE_REPLICAS=["replica_1", "replica_2"])
+    def test_request_reads_from_one_replica(self):
+        def view(request):
+            return HttpResponse(
+                ",".join({router.db_for_read(Play) for _ in range(50)})
+            )
+
+        response = ReplicaRoutingMiddleware(view)(self.factory.get("/"))
+
+        self.assertIn(response.content, (b"replica_1", b"replica_2"))
@@ -40,17 +40,17 @@ class ReservationAPITests(TestCase):
         cls.performance_1 = Performance.objects.create(
             play=cls.play_1,
             theater_hall=cls.hall_1,
-            show_time=datetime(2025, 10, 10, 18, 00, tzinfo=timezone.utc),
+            show_time=datetime(2030, 10, 10, 18, 00, tzinfo=timezone.utc),
         )
         cls.performance_2 = Performance.objects.create(
             play=cls.play_2,
             theater_hall=cls.hall_2,
-            show_time=datetime(2025, 10, 11, 18, 00, tzinfo=timezone.utc),
+            show_time=datetime(2030, 10, 11, 18, 00, tzinfo=timezone.utc),
         )
         cls.performance_3 = Performance.objects.create(
             play=cls.play_3,
             theater_hall=cls.hall_3,
-            show_time=datetime(2025, 10, 12, 18, 00, tzinfo=timezone.utc),
+            show_time=datetime(2030, 10, 12, 18, 00, tzinfo=timezone.utc),
         )
         cls.reservation_1 = Reservation.objects.create(user=cls.test_user)
         cls.reservation_2 = Reservation.objects.create(user=cls.test_user)
@@ -82,6 +82,32 @@ class AuthorizedUserTests(ReservationAPITests):
         self.assertEqual(response.data["results"], serializer.data)
         self.assertIn("next", response.data)
 
+    def test_reservation_list_side_loads_performances(self):
+        """Test that each performance is rendered once, with availability"""
+        Ticket.objects.create(
+            row=1, seat=2, performance=self.performance_1, reservation=self.reservation_1
+        )
+        reservation = Reservation.objects.create(user=self.test_user)
+        Ticket.objects.create(
+            row=1, seat=3, performance=self.performance_1, reservation=reservation
+        )
+
+        with self.assertNumQueries(4):
+            response = self.client.get(RESERVATION_URL)
+
+        performances = response.data["performances"]
+        self.assertEqual(
+            sorted(performances), [self.performance_1.id, self.performance_2.id]
+        )
+        self.assertEqual(performances[self.performance_1.id]["tickets_available"], 97)
+        self.assertEqual(
+            performances[self.performance_2.id]["play"], self.play_2.title
+        )
+        self.assertEqual(
+            response.data["results"][0]["tickets"][0]["performance"],
+            self.performance_1.id,
+        )
+
     def test_reservation_create_with_tickets_allowed(self):
         """Test that reservation creates with tickets and return correct response"""
         payload = {
@@ -112,3 +138,15 @@ class AuthorizedUserTests(ReservationAPITests):
         response = self.client.post(RESERVATION_URL, payload, format="json")
 
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_reservation_for_started_performance_forbidden(self):
+        """Test that seats of past, possibly archived, performances are not sold"""
+        self.performance_1.show_time = datetime(2020, 1, 1, 18, 00, tzinfo=timezone.utc)
+        self.performance_1.save()
+        payload = {
+            "tickets": [{"row": 9, "seat": 9, "performance": self.performance_1.id}]
+        }
+        response = self.client.post(RESERVATION_URL, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("performance", response.data["tickets"][0])
@@ -0,0 +1,170 @@
+from datetime import datetime, timedelta, timezone
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theater.caching import get_catalog_version
+from theater.models import (
+    DailyAvailability,
+    Performance,
+    Play,
+    Reservation,
+    SalesRollup,
+    TheaterHall,
+    Ticket,
+)
+from theater.signals import seats_released
+from theater.throttling import CounterRateThrottle
+
+RESERVATION_URL = reverse("theater:reservation-list")
+
+
+def cancel_url(reservation_id):
+    return reverse("theater:reservation-cancel", args=[reservation_id])
+
+
+class ReservationCancelTests(TestCase):
+    """Test cancelling reservations and releasing their seats"""
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="user@test.com", password="1qazcde3"
+        )
+        cls.performance = Performance.objects.create(
+            play=Play.objects.create(title="test_play"),
+            theater_hall=TheaterHall.objects.create(
+                name="test_hall", rows=10, seats_in_row=10
+            ),
+            show_time=datetime(2030, 1, 10, 18, 0, tzinfo=timezone.utc),
+        )
+
+    def setUp(self):
+        CounterRateThrottle.reset()
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(
+            RESERVATION_URL,
+            {
+                "tickets": [
+                    {"row": 1, "seat": seat, "performance": self.performance.id}
+                    for seat in (1, 2, 3)
+                ]
+            },
+            format="json",
+        )
+        self.reservation = Reservation.objects.get(id=response.data["id"])
+        self.tickets = list(self.reservation.tickets.all())
+
+    def tearDown(self):
+        CounterRateThrottle.reset()
+        cache.clear()
+
+    def sold(self):
+        return (
+            DailyAvailability.objects.get().tickets_sold,
+            SalesRollup.objects.get().tickets,
+        )
+
+    def test_cancel_whole_reservation(self):
+        response = self.client.post(cancel_url(self.reservation.id))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([ticket["seat"] for ticket in response.data], [1, 2, 3])
+        self.assertFalse(Reservation.objects.exists())
+        self.assertFalse(Ticket.objects.exists())
+        self.assertEqual(self.sold(), (0, 0))
+
+    def test_cancel_some_tickets(self):
+        response = self.client.post(
+            cancel_url(self.reservation.id),
+            {"tickets": [self.tickets[0].id, self.tickets[2].id]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            list(self.reservation.tickets.values_list("seat", flat=True)),
+            [2],
+        )
+        self.assertEqual(self.sold(), (1, 1))
+
+    def test_seats_released_with_one_delete(self):
+        for tickets in ([self.tickets[0].id, self.tickets[1].id], None):
+            with CaptureQueriesContext(connection) as queries:
+                self.client.post(
+                    cancel_url(self.reservation.id),
+                    {"tickets": tickets} if tickets else {},
+                    format="json",
+                )
+
+            deletes = [
+                query["sql"]
+                for query in queries
+                if query["sql"].startswith('DELETE FROM "theater_ticket"')
+            ]
+            self.assertEqual(len(deletes), 1)
+
+    def test_freed_seats_published_and_seat_map_refreshed(self):
+        url = reverse("theater:performance-detail", args=[self.performance.id])
+        self.assertEqual(len(self.client.get(url).data["taken_places"]), 3)
+        published = []
+
+        def receiver(sender, performance_id, seats, **kwargs):
+            published.append((performance_id, seats))
+
+        seats_released.connect(receiver)
+        self.addCleanup(seats_released.disconnect, receiver)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                cancel_url(self.reservation.id),
+                {"tickets": [self.tickets[0].id]},
+                format="json",
+            )
+
+        self.assertEqual(published, [(self.performance.id, [(1, 1)])])
+        self.assertEqual(len(self.client.get(url).data["taken_places"]), 2)
+
+    def test_cancellation_keeps_catalog_cache(self):
+        version = get_catalog_version()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(cancel_url(self.reservation.id))
+
+        self.assertEqual(get_catalog_version(), version)
+
+    def test_foreign_tickets_rejected(self):
+        response = self.client.post(
+            cancel_url(self.reservation.id), {"tickets": [999999]}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Ticket.objects.count(), 3)
+
+    def test_started_performance_not_cancellable(self):
+        Performance.objects.filter(id=self.performance.id).update(
+            show_time=datetime.now(timezone.utc) - timedelta(hours=1)
+        )
+
+        response = self.client.post(cancel_url(self.reservation.id))
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Ticket.objects.count(), 3)
+
+    def test_other_users_reservation_not_found(self):
+        other_client = APIClient()
+        other_client.force_authenticate(
+            user=get_user_model().objects.create_user(
+                email="other@test.com", password="1qazcde3"
+            )
+        )
+
+        response = other_client.post(cancel_url(self.reservation.id))
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
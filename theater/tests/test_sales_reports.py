@@ -0,0 +1,235 @@
+from datetime import datetime, timedelta, timezone
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theater.analytics import sales_velocity
+from theater.models import (
+    Performance,
+    Play,
+    Reservation,
+    SalesRollup,
+    TheaterHall,
+    Ticket,
+)
+from theater.rollups import sale_hour
+from theater.throttling import CounterRateThrottle
+
+RESERVATION_URL = reverse("theater:reservation-list")
+
+
+def report_url(name):
+    return reverse(f"theater:sales-{name}")
+
+
+class SalesReportTests(TestCase):
+    """Test sales rollups and the admin reports served from them"""
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = get_user_model().objects.create_user(
+            email="admin@test.com", password="1qazcde3", is_staff=True
+        )
+        cls.user = get_user_model().objects.create_user(
+            email="user@test.com", password="1qazcde3"
+        )
+        cls.hamlet = Play.objects.create(title="Hamlet")
+        cls.macbeth = Play.objects.create(title="Macbeth")
+        cls.small_hall = TheaterHall.objects.create(
+            name="Small", rows=2, seats_in_row=5
+        )
+        cls.big_hall = TheaterHall.objects.create(
+            name="Big", rows=10, seats_in_row=10
+        )
+        show_time = datetime(2030, 1, 10, 18, 0, tzinfo=timezone.utc)
+        cls.hamlet_show = Performance.objects.create(
+            play=cls.hamlet, theater_hall=cls.small_hall, show_time=show_time
+        )
+        cls.macbeth_show = Performance.objects.create(
+            play=cls.macbeth, theater_hall=cls.big_hall, show_time=show_time
+        )
+
+    def setUp(self):
+        CounterRateThrottle.reset()
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def tearDown(self):
+        CounterRateThrottle.reset()
+        cache.clear()
+
+    def book(self, performance, seats):
+        payload = {
+            "tickets": [
+                {"row": 1, "seat": seat, "performance": performance.id}
+                for seat in seats
+            ]
+        }
+        response = self.client.post(RESERVATION_URL, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def book_shows(self):
+        self.book(self.hamlet_show, [1, 2, 3])
+        self.book(self.hamlet_show, [4])
+        self.book(self.macbeth_show, [1, 2])
+        self.client.force_authenticate(user=self.admin)
+
+    def test_booking_updates_hourly_rollup(self):
+        self.book_shows()
+
+        rollup = SalesRollup.objects.get(performance=self.hamlet_show)
+        self.assertEqual(rollup.hour, sale_hour())
+        self.assertEqual(rollup.tickets, 4)
+
+    def test_sales_by_play(self):
+        self.book_shows()
+
+        response = self.client.get(report_url("plays"))
+
+        self.assertEqual(
+            response.data,
+            [
+                {"play": self.hamlet.id, "title": "Hamlet", "tickets_sold": 4},
+                {"play": self.macbeth.id, "title": "Macbeth", "tickets_sold": 2},
+            ],
+        )
+
+    def test_sales_by_hall_and_day(self):
+        self.book_shows()
+
+        halls = self.client.get(report_url("halls")).data
+        days = self.client.get(report_url("days")).data
+
+        self.assertEqual(
+            [(hall["name"], hall["tickets_sold"]) for hall in halls],
+            [("Small", 4), ("Big", 2)],
+        )
+        self.assertEqual(len(days), 1)
+        self.assertEqual(days[0]["tickets_sold"], 6)
+
+    def test_sales_period_filter(self):
+        self.book_shows()
+
+        response = self.client.get(report_url("plays"), {"to": "2000-01-01"})
+
+        self.assertEqual(response.data, [])
+
+    def test_invalid_period_rejected(self):
+        self.client.force_authenticate(user=self.admin)
+
+        response = self.client.get(report_url("days"), {"from": "yesterday"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_performance_occupancy(self):
+        self.book_shows()
+
+        response = self.client.get(report_url("performances"))
+        occupancy = {
+            row["id"]: row["occupancy"] for row in response.data["results"]
+        }
+
+        self.assertEqual(
+            occupancy, {self.hamlet_show.id: 0.4, self.macbeth_show.id: 0.02}
+        )
+
+    def test_reports_do_not_read_tickets(self):
+        self.book_shows()
+
+        with CaptureQueriesContext(connection) as queries:
+            for name in ("plays", "halls", "days", "performances", "velocity"):
+                self.client.get(report_url(name))
+
+        self.assertFalse(
+            any("theater_ticket" in query["sql"] for query in queries)
+        )
+
+    def test_reports_admin_only(self):
+        response = self.client.get(report_url("plays"))
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_velocity_weights_previous_hour(self):
+        """Test that half of the previous hour is in the sliding window"""
+        now = datetime(2030, 1, 1, 12, 30, tzinfo=timezone.utc)
+        SalesRollup.objects.create(
+            performance=self.hamlet_show, hour=sale_hour(now), tickets=6
+        )
+        SalesRollup.objects.create(
+            performance=self.hamlet_show,
+            hour=sale_hour(now) - timedelta(hours=1),
+            tickets=12,
+        )
+        SalesRollup.objects.create(
+            performance=self.hamlet_show,
+            hour=sale_hour(now) - timedelta(hours=2),
+            tickets=100,
+        )
+
+        self.assertEqual(
+            sales_velocity(now),
+            {"tickets_last_hour": 12, "tickets_per_minute": 0.2},
+        )
+
+    def test_rebuild_matches_incremental_rollups(self):
+        self.book_shows()
+        expected = sorted(
+            SalesRollup.objects.values_list("performance_id", "tickets")
+        )
+        SalesRollup.objects.all().delete()
+
+        call_command("rebuild_rollups", stdout=StringIO())
+
+        self.assertEqual(
+            sorted(
+                SalesRollup.objects.values_list("performance_id", "tickets")
+            ),
+            expected,
+        )
+
+    def test_admin_deletes_keep_reports_consistent(self):
+        self.book_shows()
+        self.client.force_login(
+            get_user_model().objects.create_superuser(
+                email="super@test.com", password="1qazcde3"
+            )
+        )
+        ticket = Ticket.objects.filter(performance=self.hamlet_show).first()
+        reservation = Reservation.objects.filter(
+            tickets__performance=self.macbeth_show
+        ).first()
+
+        self.client.post(
+            reverse("admin:theater_ticket_delete", args=[ticket.id]),
+            {"post": "yes"},
+        )
+        self.client.post(
+            reverse("admin:theater_reservation_changelist"),
+            {
+                "action": "delete_selected",
+                "_selected_action": [reservation.id],
+                "post": "yes",
+            },
+        )
+
+        self.assertEqual(Ticket.objects.count(), 3)
+        self.assertEqual(
+            [
+                (row["title"], row["tickets_sold"])
+                for row in self.client.get(report_url("plays")).data
+            ],
+            [("Hamlet", 3), ("Macbeth", 0)],
+        )
+        occupancy = self.client.get(report_url("performances")).data
+        self.assertEqual(
+            {row["id"]: row["occupancy"] for row in occupancy["results"]},
+            {self.hamlet_show.id: 0.3, self.macbeth_show.id: 0.0},
+        )
@@ -0,0 +1,160 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theater.models import Performance, Play, TheaterHall
+from theater.scheduling import find_overlapping
+from theater.throttling import CounterRateThrottle
+
+PERFORMANCE_URL = reverse("theater:performance-list")
+
+SHOW_TIME = datetime(2030, 1, 10, 18, 0, tzinfo=timezone.utc)
+
+
+class HallSchedulingTests(TestCase):
+    """Test that a hall hosts one performance at a time"""
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = get_user_model().objects.create_user(
+            email="admin@test.com", password="1qazcde3", is_staff=True
+        )
+        cls.hall = TheaterHall.objects.create(
+            name="test_hall", rows=10, seats_in_row=10
+        )
+        cls.other_hall = TheaterHall.objects.create(
+            name="other_hall", rows=10, seats_in_row=10
+        )
+        cls.play = Play.objects.create(title="test_play", duration=90)
+        cls.performance = Performance.objects.create(
+            play=cls.play, theater_hall=cls.hall, show_time=SHOW_TIME
+        )
+
+    def setUp(self):
+        CounterRateThrottle.reset()
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def tearDown(self):
+        CounterRateThrottle.reset()
+        cache.clear()
+
+    def schedule(self, show_time, hall=None):
+        return self.client.post(
+            PERFORMANCE_URL,
+            {
+                "play": self.play.id,
+                "theater_hall": (hall or self.hall).id,
+                "show_time": show_time.isoformat(),
+            },
+            format="json",
+        )
+
+    def test_end_time_follows_play_duration(self):
+        self.assertEqual(
+            self.performance.end_time, SHOW_TIME + timedelta(minutes=90)
+        )
+
+        self.play.duration = 150
+        self.play.save()
+
+        self.performance.refresh_from_db()
+        self.assertEqual(
+            self.performance.end_time, SHOW_TIME + timedelta(minutes=150)
+        )
+
+    def test_duration_change_overlapping_next_performance_rejected(self):
+        Performance.objects.create(
+            play=Play.objects.create(title="next_play"),
+            theater_hall=self.hall,
+            show_time=SHOW_TIME + timedelta(hours=2),
+        )
+        self.play.duration = 150
+
+        with self.assertRaises(ValidationError):
+            self.play.full_clean()
+
+        self.play.duration = 120
+        self.play.full_clean()
+
+    def test_overlapping_performance_rejected(self):
+        for show_time in (
+            SHOW_TIME,
+            SHOW_TIME + timedelta(minutes=89),
+            SHOW_TIME - timedelta(minutes=89),
+        ):
+            response = self.schedule(show_time)
+
+            self.assertEqual(
+                response.status_code, status.HTTP_400_BAD_REQUEST
+            )
+        self.assertEqual(Performance.objects.count(), 1)
+
+    def test_back_to_back_performances_allowed(self):
+        for show_time in (
+            SHOW_TIME + timedelta(minutes=90),
+            SHOW_TIME - timedelta(minutes=90),
+        ):
+            response = self.schedule(show_time)
+
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_other_hall_at_same_time_allowed(self):
+        response = self.schedule(SHOW_TIME, hall=self.other_hall)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_moving_performance_onto_another_rejected(self):
+        later = Performance.objects.create(
+            play=self.play,
+            theater_hall=self.hall,
+            show_time=SHOW_TIME + timedelta(days=1),
+        )
+        url = reverse("theater:performance-detail", args=[later.id])
+
+        response = self.client.patch(
+            url, {"show_time": SHOW_TIME.isoformat()}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.patch(
+            url,
+            {"show_time": (later.show_time + timedelta(hours=1)).isoformat()},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_find_overlapping(self):
+        end_time = SHOW_TIME + timedelta(hours=3)
+
+        self.assertEqual(
+            find_overlapping(self.hall, SHOW_TIME, end_time),
+            self.performance,
+        )
+        self.assertIsNone(
+            find_overlapping(
+                self.hall, SHOW_TIME, end_time, exclude=self.performance
+            )
+        )
+        self.assertIsNone(
+            find_overlapping(self.other_hall, SHOW_TIME, end_time)
+        )
+
+    @unittest.skipUnless(
+        connection.vendor == "postgresql", "exclusion needs PostgreSQL"
+    )
+    def test_database_rejects_overlap(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Performance.objects.create(
+                play=self.play,
+                theater_hall=self.hall,
+                show_time=SHOW_TIME + timedelta(minutes=30),
+            )
@@ -0,0 +1,106 @@
+import gzip
+import json
+import tempfile
+from unittest import mock
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from theater_service_api import schema
+from theater_service_api.views import schema_view
+
+
+class PrebuiltSchemaTests(SimpleTestCase):
+    """Test building, serving and checking the prebuilt OpenAPI schema"""
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.schema_dir = tempfile.TemporaryDirectory()
+        cls.enterClassContext(
+            override_settings(
+                OPENAPI_SCHEMA_DIR=cls.schema_dir.name,
+                OPENAPI_SCHEMA_CACHED=True,
+            )
+        )
+        with mock.patch("sys.stderr"):
+            call_command("build_schema", stdout=mock.Mock())
+
+    @classmethod
+    def tearDownClass(cls):
+        schema.load_manifest.cache_clear()
+        schema.load_schema_file.cache_clear()
+        cls.schema_dir.cleanup()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_serves_yaml_by_default(self):
+        response = schema_view(self.factory.get("/api/doc/"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/vnd.oai.openapi")
+        self.assertTrue(response.content.startswith(b"openapi:"))
+        self.assertIn("ETag", response)
+
+    def test_serves_json(self):
+        response = schema_view(self.factory.get("/api/doc/?format=json"))
+
+        self.assertEqual(
+            json.loads(response.content)["info"]["title"],
+            "Theater service API",
+        )
+
+    def test_serves_gzip_when_accepted(self):
+        plain = schema_view(self.factory.get("/api/doc/"))
+        response = schema_view(
+            self.factory.get("/api/doc/", HTTP_ACCEPT_ENCODING="gzip, br")
+        )
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+        self.assertNotEqual(response["ETag"], plain["ETag"])
+        self.assertIn("Accept-Encoding", response["Vary"])
+
+    def test_not_modified_for_matching_etag(self):
+        etag = schema_view(self.factory.get("/api/doc/"))["ETag"]
+        response = schema_view(
+            self.factory.get("/api/doc/", HTTP_IF_NONE_MATCH=etag)
+        )
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+    def test_check_passes_for_fresh_schema(self):
+        self.assertEqual(schema.check_schema_is_fresh(None), [])
+
+    def test_check_fails_for_stale_schema(self):
+        with mock.patch.object(
+            schema, "source_fingerprint", return_value="changed"
+        ):
+            errors = schema.check_schema_is_fresh(None)
+
+        self.assertEqual(
+            [error.id for error in errors], ["theater_service_api.E002"]
+        )
+
+    def test_startup_refused_for_stale_schema(self):
+        schema.ensure_schema_is_fresh()
+
+        with mock.patch.object(
+            schema, "source_fingerprint", return_value="changed"
+        ):
+            with self.assertRaisesMessage(ImproperlyConfigured, "stale"):
+                schema.ensure_schema_is_fresh()
+
+    def test_check_fails_without_schema(self):
+        with tempfile.TemporaryDirectory() as empty_dir:
+            with override_settings(OPENAPI_SCHEMA_DIR=empty_dir):
+                schema.load_manifest.cache_clear()
+                errors = schema.check_schema_is_fresh(None)
+        schema.load_manifest.cache_clear()
+
+        self.assertEqual(
+            [error.id for error in errors], ["theater_service_api.E001"]
+        )
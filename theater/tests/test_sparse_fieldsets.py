@@ -0,0 +1,114 @@
+from datetime import datetime, timezone
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theater.models import Actor, Genre, Performance, Play, TheaterHall
+from theater.throttling import CounterRateThrottle
+
+PLAY_URL = reverse("theater:play-list")
+PERFORMANCE_URL = reverse("theater:performance-list")
+RESERVATION_URL = reverse("theater:reservation-list")
+
+
+class SparseFieldsetTests(TestCase):
+    """Test ?fields= trimming of responses and their queries"""
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="user@test.com", password="1qazcde3"
+        )
+        actor = Actor.objects.create(first_name="Ian", last_name="McKellen")
+        genre = Genre.objects.create(name="Tragedy")
+        cls.play = Play.objects.create(
+            title="King Lear", description="An old king divides his realm"
+        )
+        cls.play.actors.add(actor)
+        cls.play.genres.add(genre)
+        hall = TheaterHall.objects.create(
+            name="test_hall", rows=10, seats_in_row=10
+        )
+        cls.performance = Performance.objects.create(
+            play=cls.play,
+            theater_hall=hall,
+            show_time=datetime(2030, 1, 10, 18, 0, tzinfo=timezone.utc),
+        )
+
+    def setUp(self):
+        CounterRateThrottle.reset()
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def tearDown(self):
+        CounterRateThrottle.reset()
+        cache.clear()
+
+    def test_play_list_fields(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(PLAY_URL, {"fields": "id,title,image"})
+
+        self.assertEqual(
+            response.data,
+            [{"id": self.play.id, "title": "King Lear", "image": None}],
+        )
+        play_queries = [
+            query["sql"] for query in queries if "theater_play" in query["sql"]
+        ]
+        self.assertEqual(len(play_queries), 1)
+        self.assertNotIn("description", play_queries[0])
+
+    def test_play_list_without_fields_unchanged(self):
+        response = self.client.get(PLAY_URL)
+
+        self.assertEqual(response.data[0]["actors"], ["Ian McKellen"])
+        self.assertEqual(response.data[0]["genres"], ["Tragedy"])
+
+    def test_performance_list_fields_skip_availability(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                PERFORMANCE_URL, {"fields": "id,show_time"}
+            )
+
+        self.assertEqual(list(response.data[0]), ["id", "show_time"])
+        sql = " ".join(query["sql"] for query in queries)
+        self.assertNotIn("theater_ticket", sql)
+        self.assertNotIn("theater_theaterhall", sql)
+
+    def test_performance_list_keeps_requested_relation(self):
+        response = self.client.get(
+            PERFORMANCE_URL, {"fields": "play,tickets_available"}
+        )
+
+        self.assertEqual(
+            response.data,
+            [{"play": "King Lear", "tickets_available": 100}],
+        )
+
+    def test_performance_detail_fields(self):
+        response = self.client.get(
+            reverse("theater:performance-detail", args=[self.performance.id]),
+            {"fields": "id,taken_places"},
+        )
+
+        self.assertEqual(
+            response.data, {"id": self.performance.id, "taken_places": []}
+        )
+
+    def test_reservation_list_fields_skip_performances(self):
+        response = self.client.get(RESERVATION_URL, {"fields": "id"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("performances", response.data)
+
+    def test_unknown_fields_rejected(self):
+        response = self.client.get(PLAY_URL, {"fields": "id,budget"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("budget", str(response.data["fields"]))
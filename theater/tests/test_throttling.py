@@ -0,0 +1,102 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework.views import APIView
+
+from theater import throttling
+from theater.throttling import CounterRateThrottle, UserCounterThrottle
+
+
+class ThrottledView(APIView):
+    throttle_classes = (UserCounterThrottle,)
+
+
+@mock.patch.object(
+    UserCounterThrottle,
+    "THROTTLE_RATES",
+    {"user": "3/min", "user_read": "5/min"},
+)
+class CounterThrottleTests(TestCase):
+    """Test in-process counter throttling"""
+    @classmethod
+    def setUpTestData(cls):
+        cls.test_user = get_user_model().objects.create_user(
+            email="user@test.com", password="1qazcde3"
+        )
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        CounterRateThrottle.reset()
+        cache.clear()
+
+    def tearDown(self):
+        CounterRateThrottle.reset()
+        cache.clear()
+
+    def make_requests(self, method, count, user=None):
+        allowed = 0
+        for _ in range(count):
+            request = getattr(self.factory, method)("/")
+            force_authenticate(request, user=user or self.test_user)
+            self.throttle = UserCounterThrottle()
+            allowed += self.throttle.allow_request(
+                ThrottledView().initialize_request(request), None
+            )
+        return allowed
+
+    def shared_key(self):
+        window = int(self.throttle.now // self.throttle.duration)
+        return f"{self.throttle.key}:{window}"
+
+    def test_write_requests_use_user_rate(self):
+        """Test that unsafe requests are limited by the user rate"""
+        self.assertEqual(self.make_requests("post", 10), 3)
+
+    def test_read_requests_use_separate_rate(self):
+        """Test that safe requests have their own, higher limit"""
+        self.assertEqual(self.make_requests("post", 10), 3)
+        self.assertEqual(self.make_requests("get", 10), 5)
+
+    @override_settings(THROTTLE_SYNC={"BATCH_SIZE": 2, "INTERVAL": 60})
+    def test_hits_are_flushed_to_shared_cache_in_batches(self):
+        """Test that the shared counter is updated once per batch"""
+        self.make_requests("get", 2)
+        self.assertEqual(cache.get(self.shared_key()), 1)
+
+        self.make_requests("get", 1)
+        self.assertEqual(cache.get(self.shared_key()), 3)
+
+    def test_counts_from_other_workers_are_respected(self):
+        """Test that hits flushed by another process count to the limit"""
+        self.make_requests("get", 1)
+        CounterRateThrottle.reset()
+        cache.incr(self.shared_key(), 3)
+
+        self.assertEqual(self.make_requests("get", 10), 1)
+
+    @override_settings(THROTTLE_SYNC={"BATCH_SIZE": 10, "INTERVAL": 60})
+    @mock.patch.object(throttling, "MAX_LOCAL_COUNTERS", 2)
+    def test_oldest_live_counter_evicted_at_cap(self):
+        """Test that a full table evicts its oldest counter after flushing
+        its pending hits"""
+        others = [
+            get_user_model().objects.create_user(
+                email=f"other_{number}@test.com", password="1qazcde3"
+            )
+            for number in range(2)
+        ]
+        self.make_requests("get", 2)
+        oldest_key = self.throttle.key
+        shared_key = self.shared_key()
+        self.assertEqual(cache.get(shared_key), 1)
+
+        for user in others:
+            self.make_requests("get", 1, user=user)
+
+        self.assertEqual(len(CounterRateThrottle._counters), 2)
+        self.assertNotIn(oldest_key, CounterRateThrottle._counters)
+        self.assertEqual(cache.get(shared_key), 2)
+        self.assertEqual(self.make_requests("get", 10), 3)
@@ -0,0 +1,148 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theater.models import (
+    ArchivedReservation,
+    ArchivedTicket,
+    DailyAvailability,
+    Performance,
+    Play,
+    Reservation,
+    TheaterHall,
+    Ticket,
+)
+from theater.rollups import refresh_days, show_date
+
+RESERVATION_URL = reverse("theater:reservation-list")
+ARCHIVED_URL = reverse("theater:reservation-archived")
+
+
+class TicketArchiveTests(TestCase):
+    """Test archival of reservations of past performances"""
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="user@test.com", password="1qazcde3"
+        )
+        play = Play.objects.create(title="test_play")
+        hall = TheaterHall.objects.create(
+            name="test_hall", rows=10, seats_in_row=10
+        )
+        now = timezone.now()
+        cls.past = Performance.objects.create(
+            play=play, theater_hall=hall, show_time=now - timedelta(days=60)
+        )
+        cls.upcoming = Performance.objects.create(
+            play=play, theater_hall=hall, show_time=now + timedelta(days=1)
+        )
+
+        cls.past_reservations = []
+        for seat in (1, 2, 3):
+            reservation = Reservation.objects.create(user=cls.user)
+            Ticket.objects.create(
+                row=1, seat=seat, performance=cls.past, reservation=reservation
+            )
+            cls.past_reservations.append(reservation)
+
+        cls.mixed_reservation = Reservation.objects.create(user=cls.user)
+        Ticket.objects.create(
+            row=2,
+            seat=1,
+            performance=cls.past,
+            reservation=cls.mixed_reservation,
+        )
+        Ticket.objects.create(
+            row=2,
+            seat=1,
+            performance=cls.upcoming,
+            reservation=cls.mixed_reservation,
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def archive(self, days=30, batch_size=2):
+        call_command(
+            "archive_tickets",
+            days=days,
+            batch_size=batch_size,
+            stdout=StringIO(),
+        )
+
+    def test_moves_past_reservations_in_batches(self):
+        past_ids = sorted(reservation.id for reservation in self.past_reservations)
+        ticket_ids = sorted(
+            Ticket.objects.filter(reservation_id__in=past_ids).values_list(
+                "id", flat=True
+            )
+        )
+
+        self.archive()
+
+        self.assertEqual(
+            sorted(ArchivedReservation.objects.values_list("id", flat=True)),
+            past_ids,
+        )
+        self.assertEqual(
+            sorted(ArchivedTicket.objects.values_list("id", flat=True)),
+            ticket_ids,
+        )
+        self.assertFalse(Reservation.objects.filter(id__in=past_ids).exists())
+        self.assertFalse(Ticket.objects.filter(id__in=ticket_ids).exists())
+
+    def test_keeps_reservations_with_upcoming_tickets(self):
+        self.archive()
+
+        self.assertEqual(self.mixed_reservation.tickets.count(), 2)
+
+    def test_keeps_recent_performances(self):
+        self.archive(days=90)
+
+        self.assertFalse(ArchivedReservation.objects.exists())
+
+    def test_rollup_counts_archived_tickets(self):
+        self.archive()
+        day = show_date(self.past.show_time)
+        refresh_days([day])
+
+        self.assertEqual(DailyAvailability.objects.get(date=day).tickets_sold, 4)
+
+    def test_archived_endpoint(self):
+        """Test that archived history is served apart from the hot list"""
+        self.archive()
+
+        response = self.client.get(ARCHIVED_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 3)
+        self.assertEqual(list(response.data["performances"]), [self.past.id])
+        self.assertEqual(
+            response.data["results"][0]["tickets"][0]["performance"],
+            self.past.id,
+        )
+
+        response = self.client.get(RESERVATION_URL)
+        self.assertEqual(
+            [reservation["id"] for reservation in response.data["results"]],
+            [self.mixed_reservation.id],
+        )
+
+    def test_archived_endpoint_shows_own_reservations(self):
+        self.archive()
+        other = get_user_model().objects.create_user(
+            email="other@test.com", password="1qazcde3"
+        )
+        self.client.force_authenticate(user=other)
+
+        response = self.client.get(ARCHIVED_URL)
+
+        self.assertEqual(response.data["count"], 0)
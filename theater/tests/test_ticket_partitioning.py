@@ -0,0 +1,129 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theater.models import Performance, Play, Reservation, TheaterHall, Ticket
+from theater.partitioning import is_partitioned, partition_name
+
+RESERVATION_URL = reverse("theater:reservation-list")
+
+
+class TicketShowDateTests(TestCase):
+    """Test the denormalized show date that tickets are partitioned by"""
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="user@test.com", password="1qazcde3"
+        )
+        cls.performance = Performance.objects.create(
+            play=Play.objects.create(title="test_play"),
+            theater_hall=TheaterHall.objects.create(
+                name="test_hall", rows=10, seats_in_row=10
+            ),
+            # Past midnight in Kyiv, still the previous day in UTC
+            show_time=datetime(2025, 10, 10, 22, 30, tzinfo=timezone.utc),
+        )
+        cls.reservation = Reservation.objects.create(user=cls.user)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_ticket_takes_local_show_date(self):
+        ticket = Ticket.objects.create(
+            row=1, seat=1, performance=self.performance, reservation=self.reservation
+        )
+
+        self.assertEqual(ticket.show_date.isoformat(), "2025-10-11")
+
+    def test_rescheduling_moves_tickets(self):
+        ticket = Ticket.objects.create(
+            row=1, seat=1, performance=self.performance, reservation=self.reservation
+        )
+
+        self.performance.show_time += timedelta(days=3)
+        self.performance.save()
+        ticket.refresh_from_db()
+
+        self.assertEqual(ticket.show_date.isoformat(), "2025-10-14")
+
+    def test_taken_seat_rejected(self):
+        Ticket.objects.create(
+            row=1, seat=1, performance=self.performance, reservation=self.reservation
+        )
+        payload = {
+            "tickets": [{"row": 1, "seat": 1, "performance": self.performance.id}]
+        }
+
+        response = self.client.post(RESERVATION_URL, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @unittest.skipIf(
+        connection.vendor == "postgresql", "partitioning works on PostgreSQL"
+    )
+    def test_partitioning_requires_postgresql(self):
+        with self.assertRaisesMessage(CommandError, "requires PostgreSQL"):
+            call_command("partition_tickets", stdout=StringIO())
+
+    @unittest.skipUnless(
+        connection.vendor == "postgresql", "partitioning needs PostgreSQL"
+    )
+    def test_convert_keeps_tickets(self):
+        ticket = Ticket.objects.create(
+            row=1, seat=1, performance=self.performance, reservation=self.reservation
+        )
+
+        call_command(
+            "partition_tickets", convert=True, months_ahead=1, stdout=StringIO()
+        )
+
+        self.assertTrue(is_partitioned())
+        self.assertEqual(Ticket.objects.get().id, ticket.id)
+        new_ticket = Ticket.objects.create(
+            row=1, seat=2, performance=self.performance, reservation=self.reservation
+        )
+        self.assertGreater(new_ticket.id, ticket.id)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT to_regclass(%s) IS NOT NULL",
+                [partition_name(ticket.show_date.replace(day=1))],
+            )
+            self.assertTrue(cursor.fetchone()[0])
+
+    @unittest.skipUnless(
+        connection.vendor == "postgresql", "partitioning needs PostgreSQL"
+    )
+    def test_new_partition_takes_rows_from_default(self):
+        call_command(
+            "partition_tickets", convert=True, months_ahead=1, stdout=StringIO()
+        )
+        far_ahead = Performance.objects.create(
+            play=self.performance.play,
+            theater_hall=self.performance.theater_hall,
+            show_time=datetime.now(timezone.utc) + timedelta(days=200),
+        )
+        ticket = Ticket.objects.create(
+            row=1, seat=1, performance=far_ahead, reservation=self.reservation
+        )
+
+        call_command("partition_tickets", months_ahead=8, stdout=StringIO())
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT tableoid::regclass::text FROM theater_ticket "
+                "WHERE id = %s",
+                [ticket.id],
+            )
+            self.assertEqual(
+                cursor.fetchone()[0],
+                partition_name(ticket.show_date.replace(day=1)),
+            )
@@ -0,0 +1,170 @@
+import threading
+
+from django.conf import settings
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.throttling import (
+    AnonRateThrottle,
+    SimpleRateThrottle,
+    UserRateThrottle,
+)
+
+# Upper bound of in-process counters, past it expired counters are dropped
+# and then the oldest live ones, after flushing their pending hits
+MAX_LOCAL_COUNTERS = 10000
+
+
+class _Counter:
+    __slots__ = ("window", "expires_at", "shared", "pending", "synced_at")
+
+    def __init__(self, window, expires_at):
+        self.window = window
+        self.expires_at = expires_at
+        self.shared = 0
+        self.pending = 0
+        self.synced_at = 0.0
+
+
+class CounterRateThrottle(SimpleRateThrottle):
+    """
+    Fixed-window throttle backed by compact counters.
+
+    Hits are counted in-process and added to the shared cache in batches,
+    so a hot key costs one cache round trip per ``BATCH_SIZE`` requests
+    (or ``INTERVAL`` seconds) instead of a history read and write on every
+    request. Across workers the limit may be overshot by at most one batch
+    per worker.
+    """
+
+    _counters = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def get_sync_settings() -> tuple[int, float]:
+        sync = getattr(settings, "THROTTLE_SYNC", {})
+        return sync.get("BATCH_SIZE", 10), sync.get("INTERVAL", 1.0)
+
+    @classmethod
+    def reset(cls) -> None:
+        """Forget all in-process counters"""
+        with cls._lock:
+            cls._counters.clear()
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        window = int(self.now // self.duration)
+        self.window_end = (window + 1) * self.duration
+        batch_size, interval = self.get_sync_settings()
+
+        with self._lock:
+            counter = self._counters.get(self.key)
+            evicted = []
+            if counter is None or counter.window != window:
+                counter, evicted = self._new_counter(window)
+
+            allowed = counter.shared + counter.pending < self.num_requests
+            if allowed:
+                counter.pending += 1
+            needs_sync = allowed and (
+                counter.pending >= batch_size
+                or self.now - counter.synced_at >= interval
+            )
+
+        for key, old_counter, pending in evicted:
+            self._flush(key, old_counter, pending)
+
+        if not allowed:
+            return self.throttle_failure()
+
+        if needs_sync:
+            self._sync(counter)
+
+        return self.throttle_success()
+
+    def _new_counter(self, window) -> tuple[_Counter, list]:
+        """
+        Counter of the current key for window, and the counters evicted to
+        make room for it with their pending hits to flush
+        """
+        evicted = []
+        self._counters.pop(self.key, None)
+
+        if len(self._counters) >= MAX_LOCAL_COUNTERS:
+            expired = [
+                key
+                for key, counter in self._counters.items()
+                if counter.expires_at <= self.now
+            ]
+            for key in expired:
+                del self._counters[key]
+
+        while len(self._counters) >= MAX_LOCAL_COUNTERS:
+            # Dicts keep insertion order, the first counter is the oldest
+            key = next(iter(self._counters))
+            counter = self._counters.pop(key)
+            if counter.pending:
+                evicted.append((key, counter, counter.pending))
+                counter.pending = 0
+
+        counter = _Counter(window, self.window_end)
+        self._counters[self.key] = counter
+        return counter, evicted
+
+    def _sync(self, counter: _Counter) -> None:
+        """Flush pending hits to the shared cache and read back the total"""
+        with self._lock:
+            pending, counter.pending = counter.pending, 0
+            counter.synced_at = self.now
+
+        total = self._flush(self.key, counter, pending)
+
+        with self._lock:
+            counter.shared = max(counter.shared, total)
+
+    def _flush(self, key, counter: _Counter, pending: int) -> int:
+        """Add pending hits to the shared counter and return its total"""
+        shared_key = f"{key}:{counter.window}"
+        timeout = max(int(counter.expires_at - self.now), 0) + 1
+        self.cache.add(shared_key, 0, timeout)
+        try:
+            return self.cache.incr(shared_key, pending)
+        except ValueError:
+            # The key expired between add() and incr()
+            self.cache.set(shared_key, pending, timeout)
+            return pending
+
+    def throttle_success(self):
+        return True
+
+    def wait(self):
+        return max(self.window_end - self.now, 0)
+
+
+class AnonCounterThrottle(CounterRateThrottle, AnonRateThrottle):
+    """Counter throttle for anonymous users, keyed by client IP"""
+
+
+class UserCounterThrottle(CounterRateThrottle, UserRateThrottle):
+    """
+    Counter throttle for authenticated users.
+
+    Safe requests are counted against the separate ``user_read`` rate, so
+    browsing the catalog does not eat into the budget for writes such as
+    creating reservations.
+    """
+
+    read_scope = "user_read"
+
+    def allow_request(self, request, view):
+        if request.method in SAFE_METHODS:
+            self.scope = self.read_scope
+            self.rate = self.get_rate()
+            self.num_requests, self.duration = self.parse_rate(self.rate)
+
+        return super().allow_request(request, view)
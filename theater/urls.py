@@ -8,6 +8,7 @@ from theater.views import (
     PerformanceViewSet,
     TheaterHallViewSet,
     ReservationViewSet,
+    SalesReportViewSet,
 )
 
 app_name = "theater"
@@ -19,6 +20,7 @@ router.register("theater-halls", TheaterHallViewSet, basename="theater-hall")
 router.register("plays", PlayViewSet)
 router.register("performances", PerformanceViewSet)
 router.register("reservations", ReservationViewSet)
+router.register("sales", SalesReportViewSet, basename="sales")
 
 urlpatterns = [
     path("", include(router.urls)),
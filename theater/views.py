@@ -1,18 +1,48 @@
+import hashlib
+from calendar import monthrange
 from datetime import datetime
 
-from django.db.models import F
+from django.conf import settings
+from django.db.models import Exists, OuterRef, Prefetch
 from django.db.models.aggregates import Count
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from rest_framework import viewsets, status, mixins
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.renderers import JSONRenderer
 from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
+from theater.analytics import (
+    performance_occupancy,
+    sales_between,
+    sales_by_day,
+    sales_by_hall,
+    sales_by_play,
+    sales_velocity,
+)
+from theater.caching import (
+    get_catalog_version,
+    get_or_refresh,
+    get_performance_version,
+)
+from theater.cancellation import cancel_tickets
+from theater.facets import PLAY_FACETS, facets_signature, get_play_facets
+from theater.heatmaps import render_png, seat_occupancy
+from theater.idempotency import IDEMPOTENCY_HEADER
+from theater.mixins import (
+    ExpandMixin,
+    IdempotentCreateMixin,
+    MultiGetMixin,
+    SparseFieldsetMixin,
+)
 from theater.models import (
     Actor,
+    ArchivedReservation,
+    DailyAvailability,
     Genre,
     Play,
     Performance,
@@ -32,11 +62,68 @@ from theater.serializers import (
     PerformanceDetailSerializer,
     ReservationSerializer,
     ReservationListSerializer,
+    ReservationCancelSerializer,
+    TicketSerializer,
     ActorImageSerializer,
+    ArchivedReservationSerializer,
+    DailySalesSerializer,
+    PerformanceOccupancySerializer,
+    PlaySalesSerializer,
+    SalesVelocitySerializer,
+    TheaterHallSalesSerializer,
+    TheaterHallHeatmapSerializer,
+    DailyAvailabilitySerializer,
+)
+from theater.renderers import PNGRenderer
+from theater.search import search_plays
+
+
+FIELDS_PARAMETER = OpenApiParameter(
+    name="fields",
+    description=(
+        "Comma-separated fields to render, related objects of other fields "
+        "are not loaded"
+    ),
+    type={"type": "array", "items": {"type": "string"}},
+    required=False,
+)
+
+EXPAND_PARAMETER = OpenApiParameter(
+    name="expand",
+    description=(
+        "Comma-separated dotted paths of relations to render as nested "
+        "objects, e.g. play.actors,theater_hall"
+    ),
+    type={"type": "array", "items": {"type": "string"}},
+    required=False,
+)
+
+IDS_PARAMETER = OpenApiParameter(
+    name="ids",
+    description=(
+        "Comma-separated ids to fetch, rendered as by the detail endpoint "
+        "in the given order"
+    ),
+    type={"type": "array", "items": {"type": "integer"}},
+    required=False,
+)
+
+IDEMPOTENCY_KEY_PARAMETER = OpenApiParameter(
+    name=IDEMPOTENCY_HEADER,
+    location=OpenApiParameter.HEADER,
+    description=(
+        "Unique key of the request, retries with the same key get the "
+        "first response back instead of being run again"
+    ),
+    type=OpenApiTypes.STR,
+    required=False,
 )
 
 
 class ActorViewSet(
+    MultiGetMixin,
+    ExpandMixin,
+    SparseFieldsetMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
     GenericViewSet,
@@ -49,6 +136,11 @@ class ActorViewSet(
             return ActorImageSerializer
         return ActorSerializer
 
+    @extend_schema(parameters=[IDS_PARAMETER, FIELDS_PARAMETER])
+    def list(self, request, *args, **kwargs):
+        """Get list of actors"""
+        return super().list(request, *args, **kwargs)
+
     @action(
         detail=True,
         methods=["POST"],
@@ -68,6 +160,8 @@ class ActorViewSet(
 
 
 class GenreViewSet(
+    ExpandMixin,
+    SparseFieldsetMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
     GenericViewSet,
@@ -76,7 +170,23 @@ class GenreViewSet(
     serializer_class = GenreSerializer
 
 
+def parse_period(request) -> tuple:
+    """Dates of the from and to query params, None when not given"""
+    period = []
+    for param in ("from", "to"):
+        value = request.query_params.get(param)
+        try:
+            period.append(
+                datetime.strptime(value, "%Y-%m-%d").date() if value else None
+            )
+        except ValueError:
+            raise ValidationError({param: "Expected format: YYYY-MM-DD."})
+    return tuple(period)
+
+
 class TheaterHallViewSet(
+    ExpandMixin,
+    SparseFieldsetMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
     GenericViewSet,
@@ -84,49 +194,218 @@ class TheaterHallViewSet(
     queryset = TheaterHall.objects.all()
     serializer_class = TheaterHallSerializer
 
+    def get_serializer_class(self):
+        if self.action == "heatmap":
+            return TheaterHallHeatmapSerializer
+
+        return TheaterHallSerializer
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        # Errors of a PNG request are still reported as JSON
+        if (
+            response.status_code >= 400
+            and getattr(request, "accepted_renderer", None)
+            and request.accepted_renderer.format == "png"
+        ):
+            request.accepted_renderer = JSONRenderer()
+            request.accepted_media_type = JSONRenderer.media_type
+        return super().finalize_response(request, response, *args, **kwargs)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="from",
+                description="First show day, YYYY-MM-DD",
+                type=OpenApiTypes.DATE,
+                required=False,
+            ),
+            OpenApiParameter(
+                name="to",
+                description="Last show day, YYYY-MM-DD",
+                type=OpenApiTypes.DATE,
+                required=False,
+            ),
+        ]
+    )
+    @action(
+        detail=True,
+        methods=["GET"],
+        url_path="heatmap",
+        permission_classes=[IsAdminUser],
+        renderer_classes=[JSONRenderer, PNGRenderer],
+    )
+    def heatmap(self, request, pk=None):
+        """
+        Seat occupancy of the hall across performances in the period,
+        as rows x seats arrays or with ``format=png`` as an image
+        """
+        hall = self.get_object()
+        heatmap = seat_occupancy(hall, *parse_period(request))
+
+        if request.accepted_renderer.format == "png":
+            return Response(render_png(heatmap["occupancy"]))
+
+        serializer = self.get_serializer(
+            {
+                "id": hall.id,
+                "rows": hall.rows,
+                "seats_in_row": hall.seats_in_row,
+                "performances": heatmap["performances"],
+                "sold": heatmap["sold"].tolist(),
+                "occupancy": heatmap["occupancy"].round(3).tolist(),
+            }
+        )
+        return Response(serializer.data)
+
+
+class PlaySearchPagination(PageNumberPagination):
+    """Paginate play search results, plain listing stays unpaginated"""
+    page_size = 20
+    page_size_query_param = "page-size"
+    max_page_size = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not request.query_params.get("search"):
+            return None
+        return super().paginate_queryset(queryset, request, view)
+
+
+PLAY_FILTER_PARAMETERS = [
+    OpenApiParameter(
+        name="search",
+        description=(
+            "Full-text search over title, description, actors and "
+            "genres, results are ranked and paginated"
+        ),
+        type=OpenApiTypes.STR,
+        required=False,
+    ),
+    OpenApiParameter(
+        name="title",
+        description="Filter by title",
+        type=OpenApiTypes.STR,
+        required=False,
+    ),
+    OpenApiParameter(
+        name="genres",
+        description="Filter by genres",
+        type={"type": "array", "items": {"type": "integer"}},
+        required=False,
+    ),
+    OpenApiParameter(
+        name="actors",
+        description="Filter by actors",
+        type={"type": "array", "items": {"type": "integer"}},
+        required=False,
+    ),
+    OpenApiParameter(
+        name="match",
+        description=(
+            "Whether plays must have any (default) or all "
+            "of the given actors and genres"
+        ),
+        type=OpenApiTypes.STR,
+        enum=["any", "all"],
+        required=False,
+    ),
+]
+
 
 class PlayViewSet(
+    MultiGetMixin,
+    ExpandMixin,
+    SparseFieldsetMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
     mixins.RetrieveModelMixin,
     GenericViewSet,
 ):
-    queryset = Play.objects.prefetch_related("genres", "actors")
+    queryset = Play.objects.prefetch_related("genres", "actors").defer(
+        "search_vector"
+    )
     serializer_class = PlaySerializer
+    pagination_class = PlaySearchPagination
 
     @staticmethod
     def _params_to_ints(params) -> list[int]:
         """Convert a list of string IDs to a list of integers"""
         return [int(param_id) for param_id in params.split(",")]
 
+    @staticmethod
+    def _facet_names(request) -> list[str]:
+        facets = request.query_params.get("facets")
+        names = facets.split(",") if facets else []
+        unknown = set(names) - set(PLAY_FACETS)
+
+        if unknown:
+            raise ValidationError(
+                {"facets": f"Unknown facets: {', '.join(sorted(unknown))}."}
+            )
+        return names
+
+    @staticmethod
+    def _has_related(through, field_name, ids, match):
+        """
+        EXISTS semi-join against an M2M table.
+
+        Unlike a join it never duplicates plays. With ``match=all`` a play
+        must be linked to every one of the given ids.
+        """
+        related = through.objects.filter(
+            play_id=OuterRef("pk"), **{f"{field_name}__in": ids}
+        )
+        if match == "all":
+            related = (
+                related.values("play_id")
+                .annotate(matched=Count(field_name, distinct=True))
+                .filter(matched=len(set(ids)))
+            )
+        return Exists(related)
+
     def get_queryset(self):
-        """Plays filtering by title, actor or genre"""
+        """Plays filtering by title, actor or genre and full-text search"""
+        search = self.request.query_params.get("search")
         title = self.request.query_params.get("title")
         actors = self.request.query_params.get("actors")
         genres = self.request.query_params.get("genres")
+        match = self.request.query_params.get("match", "any")
+
+        if match not in ("any", "all"):
+            raise ValidationError({"match": "Must be one of: any, all."})
 
-        queryset = self.queryset
+        queryset = super().get_queryset()
+
+        if search:
+            queryset = search_plays(queryset, search)
 
         if title:
             queryset = queryset.filter(title__icontains=title)
 
         if actors:
             actors_ids = self._params_to_ints(actors)
-            queryset = queryset.filter(actors__in=actors_ids)
+            queryset = queryset.filter(
+                self._has_related(
+                    Play.actors.through, "actor_id", actors_ids, match
+                )
+            )
 
         if genres:
             genres_ids = self._params_to_ints(genres)
-            queryset = queryset.filter(genres__in=genres_ids)
+            queryset = queryset.filter(
+                self._has_related(
+                    Play.genres.through, "genre_id", genres_ids, match
+                )
+            )
 
         return queryset
 
     def get_serializer_class(self):
+        if self.is_detail_read():
+            return PlayDetailSerializer
+
         if self.action == "list":
             return PlayListSerializer
 
-        if self.action == "retrieve":
-            return PlayDetailSerializer
-
         if self.action == "upload_image":
             return PlayImageSerializer
 
@@ -134,29 +413,61 @@ class PlayViewSet(
 
     @extend_schema(
         parameters=[
+            *PLAY_FILTER_PARAMETERS,
             OpenApiParameter(
-                name="title",
-                description="Filter by title",
-                type=OpenApiTypes.STR,
-                required=False,
-            ),
-            OpenApiParameter(
-                name="genres",
-                description="Filter by genres",
-                type={"type": "array", "items": {"type": "integer"}},
-                required=False,
-            ),
-            OpenApiParameter(
-                name="actors",
-                description="Filter by actors",
-                type={"type": "array", "items": {"type": "integer"}},
+                name="facets",
+                description=(
+                    "Add counts of matching plays per value of the listed "
+                    f"facets ({', '.join(PLAY_FACETS)}) to the response"
+                ),
+                type={"type": "array", "items": {"type": "string"}},
                 required=False,
             ),
+            IDS_PARAMETER,
+            FIELDS_PARAMETER,
+            EXPAND_PARAMETER,
         ]
     )
     def list(self, request, *args, **kwargs):
         """Get list of plays"""
-        return super().list(request, *args, **kwargs)
+        names = self._facet_names(request)
+        response = super().list(request, *args, **kwargs)
+
+        if names:
+            if not isinstance(response.data, dict):
+                response.data = {"results": response.data}
+            response.data["facets"] = self._get_facets(names)
+
+        return response
+
+    @extend_schema(
+        parameters=[
+            *PLAY_FILTER_PARAMETERS,
+            OpenApiParameter(
+                name="facets",
+                description=(
+                    "Facets to count matching plays for "
+                    f"({', '.join(PLAY_FACETS)}), all of them by default"
+                ),
+                type={"type": "array", "items": {"type": "string"}},
+                required=False,
+            ),
+        ],
+        responses=OpenApiTypes.OBJECT,
+    )
+    @action(detail=False, methods=["GET"], url_path="facets")
+    def facets(self, request):
+        """Counts of matching plays per facet value, without the plays"""
+        return Response(
+            self._get_facets(self._facet_names(request) or list(PLAY_FACETS))
+        )
+
+    def _get_facets(self, names) -> dict:
+        return get_play_facets(
+            self.filter_queryset(self.get_queryset()),
+            names,
+            facets_signature(self.request.query_params),
+        )
 
     @action(
         detail=True,
@@ -176,23 +487,31 @@ class PlayViewSet(
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class PerformanceViewSet(viewsets.ModelViewSet):
+class PerformanceViewSet(
+    MultiGetMixin, ExpandMixin, SparseFieldsetMixin, viewsets.ModelViewSet
+):
     queryset = Performance.objects.select_related(
         "play", "theater_hall"
-    ).annotate(
-        tickets_available=(
-            F("theater_hall__rows") * F("theater_hall__seats_in_row")
-            - Count("tickets")
-        )
     ).order_by("show_time")
     serializer_class = PerformanceSerializer
 
+    def prepare_queryset(self, queryset):
+        if self.renders_field("tickets_available"):
+            queryset = queryset.with_tickets_available()
+
+        if self.is_detail_read():
+            queryset = queryset.prefetch_related(
+                "play__actors", "play__genres", "tickets"
+            )
+
+        return queryset
+
     def get_queryset(self):
         """Performance filtering by play and date"""
         play_id = self.request.query_params.get("play")
         date = self.request.query_params.get("date")
 
-        queryset = self.queryset
+        queryset = super().get_queryset()
 
         if play_id:
             queryset = queryset.filter(play=int(play_id))
@@ -204,11 +523,14 @@ class PerformanceViewSet(viewsets.ModelViewSet):
         return queryset
 
     def get_serializer_class(self):
+        if self.is_detail_read():
+            return PerformanceDetailSerializer
+
         if self.action == "list":
             return PerformanceListSerializer
 
-        if self.action == "retrieve":
-            return PerformanceDetailSerializer
+        if self.action == "calendar":
+            return DailyAvailabilitySerializer
 
         return PerformanceSerializer
 
@@ -226,11 +548,74 @@ class PerformanceViewSet(viewsets.ModelViewSet):
                 type={"type": "array", "items": {"type": "integer"}},
                 required=False,
             ),
+            IDS_PARAMETER,
+            FIELDS_PARAMETER,
+            EXPAND_PARAMETER,
         ]
     )
     def list(self, request, *args, **kwargs):
         """Get list of performances"""
-        return super().list(request, *args, **kwargs)
+        # Seat counts in lists follow bookings with the soft TTL, a key
+        # changing with every booking would leave them cold during a sale
+        return self._cached_response(
+            super().list, get_catalog_version(), request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        """Get performance with its taken seats"""
+        return self._cached_response(
+            super().retrieve,
+            f"{get_catalog_version()}:"
+            f"{get_performance_version(kwargs[self.lookup_field])}",
+            request,
+            *args,
+            **kwargs,
+        )
+
+    def _cached_response(self, view_method, version, request, *args, **kwargs):
+        """
+        Response of a read every user gets alike, cached with
+        stale-while-revalidate so that seat counts expiring mid-sale are
+        recomputed by one worker instead of all of them. Keys carry the
+        version of the data the response shows.
+        """
+        ttls = settings.PERFORMANCE_CACHE
+        path = hashlib.sha1(request.get_full_path().encode()).hexdigest()
+        data = get_or_refresh(
+            f"theater:performances:{version}:{path}",
+            lambda: view_method(request, *args, **kwargs).data,
+            soft_ttl=ttls["SOFT_TTL"],
+            hard_ttl=ttls["HARD_TTL"],
+        )
+        return Response(data)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="month",
+                description="Month in YYYY-MM format",
+                type=OpenApiTypes.STR,
+                required=True,
+            ),
+        ]
+    )
+    @action(detail=False, methods=["GET"], url_path="calendar")
+    def calendar(self, request):
+        """Per-day performance count and seat availability for a month"""
+        try:
+            first_day = datetime.strptime(
+                request.query_params.get("month", ""), "%Y-%m"
+            ).date()
+        except ValueError:
+            raise ValidationError({"month": "Expected format: YYYY-MM."})
+
+        _, days_in_month = monthrange(first_day.year, first_day.month)
+        days = DailyAvailability.objects.filter(
+            date__range=(first_day, first_day.replace(day=days_in_month))
+        )
+        serializer = self.get_serializer(days, many=True)
+
+        return Response(serializer.data)
 
 
 class ReservationPagination(PageNumberPagination):
@@ -240,26 +625,209 @@ class ReservationPagination(PageNumberPagination):
 
 
 class ReservationViewSet(
+    ExpandMixin,
+    SparseFieldsetMixin,
+    IdempotentCreateMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
     GenericViewSet,
 ):
-    queryset = Reservation.objects.prefetch_related(
-        "tickets__performance__play",
-        "tickets__performance__theater_hall",
-    )
+    queryset = Reservation.objects.all()
     serializer_class = ReservationSerializer
     permission_classes = (IsAuthenticated,)
     pagination_class = ReservationPagination
 
     def get_queryset(self):
-        queryset = self.queryset.filter(user=self.request.user)
-        return queryset
+        if self.action == "cancel":
+            return self.queryset.filter(user_id=self.request.user.id)
+
+        if self.action == "archived":
+            queryset = ArchivedReservation.objects.all()
+        else:
+            queryset = self.queryset
+
+        queryset = queryset.filter(
+            user_id=self.request.user.id
+        ).prefetch_related(
+            Prefetch(
+                "tickets__performance",
+                queryset=Performance.objects.select_related(
+                    "play", "theater_hall"
+                ).with_tickets_available(),
+            )
+        )
+        return self.expand_queryset(self.prune_queryset(queryset))
 
     def get_serializer_class(self):
         if self.action == "list":
             return ReservationListSerializer
+
+        if self.action == "archived":
+            return ArchivedReservationSerializer
+
+        if self.action == "cancel":
+            return ReservationCancelSerializer
+
         return ReservationSerializer
 
+    def _list_with_performances(self):
+        """
+        Paginated reservations whose tickets reference performances by id,
+        every performance on the page is rendered once in ``performances``
+        """
+        page = self.paginate_queryset(
+            self.filter_queryset(self.get_queryset())
+        )
+        serializer = self.get_serializer(page, many=True)
+        response = self.get_paginated_response(serializer.data)
+
+        if not self.renders_field("tickets"):
+            return response
+
+        performances = {
+            ticket.performance_id: ticket.performance
+            for reservation in page
+            for ticket in reservation.tickets.all()
+        }
+        response.data["performances"] = {
+            performance_id: PerformanceListSerializer(performance).data
+            for performance_id, performance in performances.items()
+        }
+
+        return response
+
+    def list(self, request, *args, **kwargs):
+        """Get list of reservations"""
+        return self._list_with_performances()
+
+    @action(detail=False, methods=["GET"], url_path="archived")
+    def archived(self, request):
+        """Get list of archived reservations of past performances"""
+        return self._list_with_performances()
+
+    @extend_schema(parameters=[IDEMPOTENCY_KEY_PARAMETER])
+    def create(self, request, *args, **kwargs):
+        """Reserve tickets, at most once per Idempotency-Key"""
+        return super().create(request, *args, **kwargs)
+
+    @extend_schema(responses=TicketSerializer(many=True))
+    @action(detail=True, methods=["POST"], url_path="cancel")
+    def cancel(self, request, pk=None):
+        """Cancel the reservation or some of its tickets, freeing the seats"""
+        reservation = self.get_object()
+        serializer = ReservationCancelSerializer(
+            data=request.data, context={"reservation": reservation}
+        )
+        serializer.is_valid(raise_exception=True)
+
+        released = cancel_tickets(
+            reservation, serializer.validated_data["tickets"]
+        )
+        return Response(TicketSerializer(released, many=True).data)
+
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
+
+
+SALES_PERIOD_PARAMETERS = [
+    OpenApiParameter(
+        name="from",
+        description="First day of the period, YYYY-MM-DD",
+        type=OpenApiTypes.DATE,
+        required=False,
+    ),
+    OpenApiParameter(
+        name="to",
+        description="Last day of the period, YYYY-MM-DD",
+        type=OpenApiTypes.DATE,
+        required=False,
+    ),
+]
+
+
+class SalesReportPagination(PageNumberPagination):
+    page_size = 50
+    page_size_query_param = "page-size"
+    max_page_size = 500
+
+
+class SalesReportViewSet(GenericViewSet):
+    """
+    Sales analytics for box office staff.
+
+    Reports are aggregated from the hourly sales rollups, never from
+    tickets, so they do not compete with bookings.
+    """
+
+    permission_classes = (IsAdminUser,)
+    pagination_class = SalesReportPagination
+
+    def get_serializer_class(self):
+        return {
+            "plays": PlaySalesSerializer,
+            "halls": TheaterHallSalesSerializer,
+            "days": DailySalesSerializer,
+            "performances": PerformanceOccupancySerializer,
+            "velocity": SalesVelocitySerializer,
+        }[self.action]
+
+    def _report(self, rows):
+        serializer = self.get_serializer(rows, many=True)
+        return Response(serializer.data)
+
+    @extend_schema(parameters=SALES_PERIOD_PARAMETERS)
+    @action(detail=False, methods=["GET"])
+    def plays(self, request):
+        """Tickets sold per play in the period"""
+        sales = sales_between(*parse_period(request))
+        return self._report(sales_by_play(sales))
+
+    @extend_schema(parameters=SALES_PERIOD_PARAMETERS)
+    @action(detail=False, methods=["GET"])
+    def halls(self, request):
+        """Tickets sold per theater hall in the period"""
+        sales = sales_between(*parse_period(request))
+        return self._report(sales_by_hall(sales))
+
+    @extend_schema(parameters=SALES_PERIOD_PARAMETERS)
+    @action(detail=False, methods=["GET"])
+    def days(self, request):
+        """Tickets sold per day of sale in the period"""
+        sales = sales_between(*parse_period(request))
+        return self._report(sales_by_day(sales))
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="from",
+                description="First show day, YYYY-MM-DD",
+                type=OpenApiTypes.DATE,
+                required=False,
+            ),
+            OpenApiParameter(
+                name="to",
+                description="Last show day, YYYY-MM-DD",
+                type=OpenApiTypes.DATE,
+                required=False,
+            ),
+        ]
+    )
+    @action(detail=False, methods=["GET"])
+    def performances(self, request):
+        """Occupancy rate of performances shown in the period"""
+        date_from, date_to = parse_period(request)
+        performances = Performance.objects.all()
+        if date_from:
+            performances = performances.filter(show_time__date__gte=date_from)
+        if date_to:
+            performances = performances.filter(show_time__date__lte=date_to)
+
+        page = self.paginate_queryset(performance_occupancy(performances))
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=False, methods=["GET"])
+    def velocity(self, request):
+        """Tickets sold over the last hour"""
+        serializer = self.get_serializer(sales_velocity())
+        return Response(serializer.data)
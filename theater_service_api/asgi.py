@@ -11,6 +11,13 @@ import os
 
 from django.core.asgi import get_asgi_application
 
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "theater_service_api.settings")
+from theater_service_api.schema import ensure_schema_is_fresh
+
+os.environ.setdefault(
+    "DJANGO_SETTINGS_MODULE", "theater_service_api.settings.prod"
+)
 
 application = get_asgi_application()
+
+# Fail worker startup rather than serve a schema older than the code
+ensure_schema_is_fresh()
@@ -0,0 +1,159 @@
+"""
+Batched API reads.
+
+``POST /api/batch/`` runs a list of GET sub-requests to the theater and
+user APIs inside the one HTTP request. The batch is authenticated once and
+every sub-request reuses its user, so JWT decoding and the middleware
+stack run once per batch, while each sub-request still goes through the
+permissions and throttles of its view. Views that do not accept the
+authentication the batch came with answer 401, as they would on their own.
+"""
+
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+from rest_framework import serializers, status
+from rest_framework.exceptions import NotAuthenticated
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import ForcedAuthentication
+
+# Sub-requests may only target these API prefixes
+BATCH_PATH_PREFIXES = ("/api/theater/", "/api/user/")
+
+# Headers of the batch request that are not passed to sub-requests
+BATCH_ONLY_META = ("CONTENT_LENGTH", "CONTENT_TYPE", "HTTP_IF_NONE_MATCH")
+
+
+class BatchItemSerializer(serializers.Serializer):
+    method = serializers.ChoiceField(choices=["GET"], default="GET")
+    url = serializers.CharField()
+
+    def validate_url(self, value):
+        if not urlsplit(value).path.startswith(BATCH_PATH_PREFIXES):
+            raise serializers.ValidationError(
+                f"Must start with one of: {', '.join(BATCH_PATH_PREFIXES)}."
+            )
+        return value
+
+
+class BatchRequestSerializer(serializers.Serializer):
+    requests = BatchItemSerializer(many=True, allow_empty=False)
+    parallel = serializers.BooleanField(default=False)
+
+    def validate_requests(self, value):
+        if len(value) > settings.BATCH_MAX_REQUESTS:
+            raise serializers.ValidationError(
+                f"At most {settings.BATCH_MAX_REQUESTS} requests per batch."
+            )
+        return value
+
+
+class BatchResponseItemSerializer(serializers.Serializer):
+    url = serializers.CharField()
+    status = serializers.IntegerField()
+    body = serializers.JSONField(allow_null=True)
+
+
+class BatchResponseSerializer(serializers.Serializer):
+    responses = BatchResponseItemSerializer(many=True)
+
+
+def _sub_request(request, url: str) -> HttpRequest:
+    """GET request for url carrying the batch's user and headers"""
+    parts = urlsplit(url)
+    sub_request = HttpRequest()
+    sub_request.method = "GET"
+    sub_request.path = sub_request.path_info = parts.path
+    sub_request.META = {
+        key: value
+        for key, value in request.META.items()
+        if key not in BATCH_ONLY_META
+    }
+    sub_request.META.update(
+        {
+            "REQUEST_METHOD": "GET",
+            "PATH_INFO": parts.path,
+            "QUERY_STRING": parts.query,
+            "HTTP_ACCEPT": JSONRenderer.media_type,
+        }
+    )
+    sub_request.GET = QueryDict(parts.query)
+    sub_request.COOKIES = request.COOKIES
+    # Read by DRF in place of the authentication classes of the view
+    sub_request._force_auth_user = request.user
+    sub_request._force_auth_token = request.auth
+    return sub_request
+
+
+def _accepts_authenticator(view_func, authenticator) -> bool:
+    """Whether the view would have authenticated the batch's credentials"""
+    view_class = getattr(view_func, "cls", None)
+    if view_class is None or isinstance(authenticator, ForcedAuthentication):
+        # Not a DRF view, or the test client forcing a user on every view
+        return True
+    return isinstance(authenticator, tuple(view_class.authentication_classes))
+
+
+def _run(request, url: str) -> dict:
+    path = urlsplit(url).path
+    try:
+        match = resolve(path)
+    except Resolver404:
+        return {"url": url, "status": 404, "body": {"detail": "Not found."}}
+
+    authenticator = request.successful_authenticator
+    if not _accepts_authenticator(match.func, authenticator):
+        return {
+            "url": url,
+            "status": status.HTTP_401_UNAUTHORIZED,
+            "body": {"detail": NotAuthenticated.default_detail},
+        }
+
+    sub_request = _sub_request(request, url)
+    sub_request.resolver_match = match
+    response = match.func(sub_request, *match.args, **match.kwargs)
+
+    renderer = getattr(response, "accepted_renderer", None)
+    if not isinstance(renderer, JSONRenderer):
+        return {
+            "url": url,
+            "status": 406,
+            "body": {"detail": "Only JSON responses can be batched."},
+        }
+
+    return {"url": url, "status": response.status_code, "body": response.data}
+
+
+def _run_in_thread(context, request, url: str) -> dict:
+    try:
+        return context.run(_run, request, url)
+    finally:
+        # Worker threads open their own connections
+        connections.close_all()
+
+
+def run_batch(request, urls: list[str], parallel: bool = False) -> list:
+    """
+    Responses of GET requests to urls, in order.
+
+    Sequential sub-requests share the batch's database connection. With
+    ``parallel`` they are spread over ``BATCH_MAX_WORKERS`` threads, each
+    with its own connection, which only pays off for independent reads
+    slower than opening a connection.
+    """
+    if not parallel or len(urls) == 1:
+        return [_run(request, url) for url in urls]
+
+    # Each thread runs in a copy of this context, to keep replica routing
+    contexts = [contextvars.copy_context() for _ in urls]
+    workers = min(settings.BATCH_MAX_WORKERS, len(urls))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(
+            executor.map(_run_in_thread, contexts, repeat(request), urls)
+        )
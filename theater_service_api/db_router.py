@@ -0,0 +1,60 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA_APPS = {"theater", "user"}
+
+# Replica serving the reads of the current request, if any
+_replica = ContextVar("replica", default=None)
+
+
+@contextmanager
+def reads_from_replica(enabled=True):
+    """
+    Allow reads in the block to be served by a replica, the same one for
+    the whole block, so queries of one request agree with each other
+    """
+    replicas = getattr(settings, "DATABASE_REPLICAS", [])
+    replica = random.choice(replicas) if enabled and replicas else None
+    token = _replica.set(replica)
+    try:
+        yield
+    finally:
+        _replica.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Send reads of the theater and user apps to the request's replica.
+
+    Only reads inside ``reads_from_replica()`` blocks (see
+    ``ReplicaRoutingMiddleware``) are routed, and never while a
+    transaction is open on the primary, so a request always sees its
+    own writes.
+    """
+
+    def db_for_read(self, model, **hints):
+        replica = _replica.get()
+
+        if (
+            replica is not None
+            and model._meta.app_label in REPLICA_APPS
+            and not connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return replica
+
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in getattr(settings, "DATABASE_REPLICAS", []):
+            return False
+        return None
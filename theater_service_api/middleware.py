@@ -0,0 +1,58 @@
+from django.conf import settings
+from rest_framework.permissions import SAFE_METHODS
+
+from theater_service_api.db_router import reads_from_replica
+
+PRIMARY_PIN_COOKIE = "primary_pin"
+PRIMARY_PIN_SALT = "theater_service_api.primary_pin"
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Serve safe requests from read replicas with read-your-writes.
+
+    A successful unsafe request sets a signed cookie that pins the
+    client's reads to the primary for ``REPLICA_STICKY_SECONDS``, so it
+    does not read stale data while replicas catch up. Views that only read
+    despite their method, like the batch endpoint, set ``read_only`` on
+    the request to skip the pin.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        use_replica = request.method in SAFE_METHODS and not self.is_pinned(
+            request
+        )
+
+        with reads_from_replica(use_replica):
+            response = self.get_response(request)
+
+        if (
+            request.method not in SAFE_METHODS
+            and not getattr(request, "read_only", False)
+            and response.status_code < 400
+        ):
+            response.set_signed_cookie(
+                PRIMARY_PIN_COOKIE,
+                "1",
+                salt=PRIMARY_PIN_SALT,
+                max_age=settings.REPLICA_STICKY_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+
+        return response
+
+    @staticmethod
+    def is_pinned(request) -> bool:
+        return (
+            request.get_signed_cookie(
+                PRIMARY_PIN_COOKIE,
+                default=None,
+                salt=PRIMARY_PIN_SALT,
+                max_age=settings.REPLICA_STICKY_SECONDS,
+            )
+            is not None
+        )
@@ -0,0 +1,160 @@
+"""
+Prebuilt OpenAPI schema.
+
+``manage.py build_schema`` renders the schema once at deploy time into
+``OPENAPI_SCHEMA_DIR`` as JSON and YAML, each with a gzip copy, and writes
+a manifest with the ETag of every file and a fingerprint of the code the
+schema was generated from. The schema view serves these files instead of
+introspecting every viewset per request. The ``openapi`` system check
+reports a schema older than the code to management commands, and
+``ensure_schema_is_fresh`` refuses to start the WSGI and ASGI
+applications with it.
+"""
+
+import gzip
+import hashlib
+import json
+from functools import lru_cache
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+from django.core.exceptions import ImproperlyConfigured
+
+MANIFEST_NAME = "manifest.json"
+SCHEMA_FORMATS = {
+    "json": "application/vnd.oai.openapi+json",
+    "yaml": "application/vnd.oai.openapi",
+}
+
+# Code the schema is generated from, tests and migrations excluded
+SOURCE_PACKAGES = ("theater", "user", "theater_service_api")
+SOURCE_EXCLUDED_DIRS = {"tests", "migrations", "__pycache__"}
+SCHEMA_DISTRIBUTIONS = (
+    "Django",
+    "djangorestframework",
+    "djangorestframework-simplejwt",
+    "drf-spectacular",
+)
+
+
+def schema_dir() -> Path:
+    return Path(settings.OPENAPI_SCHEMA_DIR)
+
+
+def source_fingerprint() -> str:
+    """Hash of the project sources and library versions behind the schema"""
+    digest = hashlib.sha256()
+
+    for package in SOURCE_PACKAGES:
+        root = Path(settings.BASE_DIR) / package
+        for path in sorted(root.rglob("*.py")):
+            relative = path.relative_to(settings.BASE_DIR)
+            if SOURCE_EXCLUDED_DIRS.intersection(relative.parts):
+                continue
+            digest.update(relative.as_posix().encode())
+            digest.update(path.read_bytes())
+
+    for distribution in SCHEMA_DISTRIBUTIONS:
+        try:
+            digest.update(f"{distribution}=={version(distribution)}".encode())
+        except PackageNotFoundError:
+            pass
+
+    return digest.hexdigest()
+
+
+def render_schema() -> dict[str, bytes]:
+    """Generate the schema and render it in every served format"""
+    from drf_spectacular.renderers import (
+        OpenApiJsonRenderer,
+        OpenApiYamlRenderer,
+    )
+    from drf_spectacular.settings import spectacular_settings
+
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+    schema = generator.get_schema(request=None, public=True)
+
+    return {
+        "json": OpenApiJsonRenderer().render(schema, renderer_context={}),
+        "yaml": OpenApiYamlRenderer().render(schema, renderer_context={}),
+    }
+
+
+def build_schema() -> dict:
+    """Write the schema files and their manifest, return the manifest"""
+    directory = schema_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    manifest = {"fingerprint": source_fingerprint(), "files": {}}
+
+    for schema_format, content in render_schema().items():
+        etag = hashlib.sha256(content).hexdigest()[:32]
+        name = f"schema.{schema_format}"
+        (directory / name).write_bytes(content)
+        # mtime=0 keeps the archive identical across builds
+        (directory / f"{name}.gz").write_bytes(
+            gzip.compress(content, compresslevel=9, mtime=0)
+        )
+        manifest["files"][schema_format] = {"name": name, "etag": etag}
+
+    (directory / MANIFEST_NAME).write_text(json.dumps(manifest, indent=4))
+    load_manifest.cache_clear()
+    load_schema_file.cache_clear()
+    return manifest
+
+
+@lru_cache(maxsize=None)
+def load_manifest() -> dict | None:
+    try:
+        return json.loads((schema_dir() / MANIFEST_NAME).read_text())
+    except (OSError, ValueError):
+        return None
+
+
+@lru_cache(maxsize=None)
+def load_schema_file(name: str) -> bytes:
+    return (schema_dir() / name).read_bytes()
+
+
+@register("openapi", Tags.urls)
+def check_schema_is_fresh(app_configs, **kwargs):
+    if not settings.OPENAPI_SCHEMA_CACHED:
+        return []
+
+    manifest = load_manifest()
+    hint = "Run `python manage.py build_schema` as part of the deploy."
+
+    if manifest is None:
+        return [
+            Error(
+                f"No prebuilt OpenAPI schema in {schema_dir()}.",
+                hint=hint,
+                id="theater_service_api.E001",
+            )
+        ]
+
+    if manifest["fingerprint"] != source_fingerprint():
+        return [
+            Error(
+                "The prebuilt OpenAPI schema is stale, the code changed "
+                "after it was built.",
+                hint=hint,
+                id="theater_service_api.E002",
+            )
+        ]
+
+    return []
+
+
+def ensure_schema_is_fresh() -> None:
+    """
+    Raise ImproperlyConfigured when the prebuilt schema is missing or
+    stale. System checks do not run when a server loads the application,
+    so wsgi.py and asgi.py call this instead.
+    """
+    errors = check_schema_is_fresh(None)
+    if errors:
+        raise ImproperlyConfigured(
+            " ".join(f"{error.msg} {error.hint}" for error in errors)
+        )
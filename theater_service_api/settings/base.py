@@ -0,0 +1,296 @@
+"""
+Django settings shared by every profile of theater_service_api.
+
+Profiles live next to this module: ``dev`` for local work with the debug
+toolbar and ``prod`` for deployed workers.
+
+Generated by 'django-admin startproject' using Django 5.2.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/5.2/topics/settings/
+
+For the full list of settings and their values, see
+https://docs.djangoproject.com/en/5.2/ref/settings/
+"""
+
+import copy
+import os
+from datetime import timedelta
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def env_bool(name: str, default: bool = False) -> bool:
+    return os.getenv(name, str(default)).lower() in ("1", "true", "yes")
+
+
+# Build paths inside the project like this: BASE_DIR / 'subdir'.
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+
+# Quick-start development settings - unsuitable for production
+# See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
+
+# SECURITY WARNING: keep the secret key used in production secret!
+SECRET_KEY = os.getenv("DJANGO_SECRET_KEY")
+
+DEBUG = False
+
+ALLOWED_HOSTS = []
+
+# Application definition
+
+INSTALLED_APPS = [
+    "django.contrib.admin",
+    "django.contrib.auth",
+    "django.contrib.contenttypes",
+    "django.contrib.sessions",
+    "django.contrib.messages",
+    "django.contrib.staticfiles",
+    "rest_framework",
+    "rest_framework.authtoken",
+    "drf_spectacular",
+    "theater",
+    "user",
+]
+
+MIDDLEWARE = [
+    "django.middleware.security.SecurityMiddleware",
+    "theater_service_api.middleware.ReplicaRoutingMiddleware",
+    "django.contrib.sessions.middleware.SessionMiddleware",
+    "django.middleware.common.CommonMiddleware",
+    "django.middleware.csrf.CsrfViewMiddleware",
+    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "django.contrib.messages.middleware.MessageMiddleware",
+    "django.middleware.clickjacking.XFrameOptionsMiddleware",
+]
+
+ROOT_URLCONF = "theater_service_api.urls"
+
+TEMPLATES = [
+    {
+        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "DIRS": [],
+        "APP_DIRS": True,
+        "OPTIONS": {
+            "context_processors": [
+                "django.template.context_processors.request",
+                "django.contrib.auth.context_processors.auth",
+                "django.contrib.messages.context_processors.messages",
+            ],
+        },
+    },
+]
+
+WSGI_APPLICATION = "theater_service_api.wsgi.application"
+
+
+# Database
+# https://docs.djangoproject.com/en/5.2/ref/settings/#databases
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": os.getenv("POSTGRES_DB"),
+        "USER": os.getenv("POSTGRES_USER"),
+        "PASSWORD": os.getenv("POSTGRES_PASSWORD"),
+        "HOST": os.getenv("POSTGRES_HOST"),
+        "PORT": os.getenv("POSTGRES_PORT"),
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {
+            # Bind parameters on the server, lets psycopg prepare statements
+            "server_side_binding": env_bool("POSTGRES_SERVER_SIDE_BINDING"),
+        },
+    }
+}
+
+# With server-side binding psycopg prepares a statement after it ran this
+# many times on a connection. Set "off" behind PgBouncer in transaction
+# pooling mode, where prepared statements are not safe.
+if os.getenv("POSTGRES_PREPARE_THRESHOLD"):
+    DATABASES["default"]["OPTIONS"]["prepare_threshold"] = (
+        None
+        if os.getenv("POSTGRES_PREPARE_THRESHOLD") == "off"
+        else int(os.getenv("POSTGRES_PREPARE_THRESHOLD"))
+    )
+
+# Django's native psycopg connection pool, or persistent connections
+# kept for POSTGRES_CONN_MAX_AGE seconds when the pool is disabled
+if env_bool("POSTGRES_POOL"):
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"]["OPTIONS"]["pool"] = {
+        "min_size": int(os.getenv("POSTGRES_POOL_MIN_SIZE", 2)),
+        "max_size": int(os.getenv("POSTGRES_POOL_MAX_SIZE", 10)),
+        "timeout": int(os.getenv("POSTGRES_POOL_TIMEOUT", 10)),
+    }
+else:
+    DATABASES["default"]["CONN_MAX_AGE"] = int(
+        os.getenv("POSTGRES_CONN_MAX_AGE", 60)
+    )
+
+# Read replicas, comma separated hosts. Point it at POSTGRES_HOST to try
+# replica routing locally against a second alias of the same database.
+DATABASE_REPLICAS = []
+
+for index, host in enumerate(
+    filter(None, os.getenv("POSTGRES_REPLICA_HOSTS", "").split(",")), 1
+):
+    alias = f"replica_{index}"
+    DATABASES[alias] = {
+        **copy.deepcopy(DATABASES["default"]),
+        "HOST": host.strip(),
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["theater_service_api.db_router.ReplicaRouter"]
+
+# Seconds reads stay on the primary after a client's write
+REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", 5))
+
+# Sub-requests accepted by POST /api/batch/ and threads of a parallel batch
+BATCH_MAX_REQUESTS = int(os.getenv("BATCH_MAX_REQUESTS", 20))
+BATCH_MAX_WORKERS = int(os.getenv("BATCH_MAX_WORKERS", 4))
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHES = {
+    "default": (
+        {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("REDIS_URL"),
+        }
+        if os.getenv("REDIS_URL")
+        else {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    )
+}
+
+
+# Password validation
+# https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        "NAME": "django.contrib.auth.password_validation."
+                "UserAttributeSimilarityValidator",
+    },
+    {
+        "NAME": "django.contrib.auth.password_validation."
+                "MinimumLengthValidator",
+    },
+    {
+        "NAME": "django.contrib.auth.password_validation."
+                "CommonPasswordValidator",
+    },
+    {
+        "NAME": "django.contrib.auth.password_validation."
+                "NumericPasswordValidator",
+    },
+]
+
+AUTH_USER_MODEL = "user.User"
+
+# Password hashing runs on a bounded pool, requests beyond
+# MAX_WORKERS + MAX_QUEUE concurrent hashes are rejected with a 503
+PASSWORD_HASHING_POOL = {
+    "MAX_WORKERS": int(os.getenv("PASSWORD_HASHING_WORKERS", 2)),
+    "MAX_QUEUE": int(os.getenv("PASSWORD_HASHING_QUEUE", 8)),
+    "TIMEOUT": 10,
+}
+
+# Internationalization
+# https://docs.djangoproject.com/en/5.2/topics/i18n/
+
+LANGUAGE_CODE = "en-us"
+
+TIME_ZONE = "Europe/Kyiv"
+
+USE_I18N = True
+
+USE_TZ = True
+
+
+# Static files (CSS, JavaScript, Images)
+# https://docs.djangoproject.com/en/5.2/howto/static-files/
+
+STATIC_URL = "static/"
+
+MEDIA_URL = "/media/"
+MEDIA_ROOT = "/files/media"
+
+# Default primary key field type
+# https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
+
+DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+REST_FRAMEWORK = {
+    "DEFAULT_AUTHENTICATION_CLASSES": [
+        "user.authentication.CachedJWTAuthentication",
+    ],
+    "DEFAULT_PERMISSION_CLASSES": [
+        "theater.permissions.IsAdminAllOrAuthenticatedReadOnly",
+    ],
+    "DEFAULT_THROTTLE_CLASSES": [
+        "theater.throttling.AnonCounterThrottle",
+        "theater.throttling.UserCounterThrottle",
+    ],
+    "DEFAULT_THROTTLE_RATES": {
+        "anon": "5/min",
+        "user": "20/min",
+        "user_read": "120/min",
+    },
+    "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+}
+
+# Performance lists and seat maps are served from the cache for SOFT_TTL
+# seconds, then stale while one worker refreshes them, for up to HARD_TTL
+PERFORMANCE_CACHE = {
+    "SOFT_TTL": float(os.getenv("PERFORMANCE_CACHE_SOFT_TTL", 5)),
+    "HARD_TTL": float(os.getenv("PERFORMANCE_CACHE_HARD_TTL", 60)),
+}
+
+# Seconds the response of a request with an Idempotency-Key is kept for
+# replaying retries
+IDEMPOTENCY_KEY_TTL = int(os.getenv("IDEMPOTENCY_KEY_TTL", 24 * 60 * 60))
+
+# Throttle hits are counted in-process and flushed to the shared cache
+# every BATCH_SIZE hits or INTERVAL seconds, whichever comes first
+THROTTLE_SYNC = {
+    "BATCH_SIZE": int(os.getenv("THROTTLE_SYNC_BATCH_SIZE", 10)),
+    "INTERVAL": float(os.getenv("THROTTLE_SYNC_INTERVAL", 1.0)),
+}
+
+SIMPLE_JWT = {
+    "ACCESS_TOKEN_LIFETIME": timedelta(days=1),
+    "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
+    "ROTATE_REFRESH_TOKENS": False,
+}
+
+# Seconds an authenticated user stays in the process-local cache,
+# 0 disables the cache
+USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", 30))
+
+# Schema prebuilt by `manage.py build_schema`, served from OPENAPI_SCHEMA_DIR
+# when OPENAPI_SCHEMA_CACHED is on
+OPENAPI_SCHEMA_DIR = BASE_DIR / "openapi"
+OPENAPI_SCHEMA_CACHED = False
+
+SPECTACULAR_SETTINGS = {
+    "TITLE": "Theater service API",
+    "DESCRIPTION": "A service for a theater that manages ticket reservations",
+    "VERSION": "1.0.0",
+    "SERVE_INCLUDE_SCHEMA": False,
+    "SWAGGER_UI_SETTINGS": {
+        "deepLinking": True,
+        "defaultModelRendering": "model",
+        "defaultModelsExpandDepth": 2,
+        "defaultModelExpandDepth": 2,
+    },
+}
@@ -0,0 +1,24 @@
+"""
+Local development profile: debug mode and the debug toolbar.
+"""
+
+from theater_service_api.settings.base import *  # noqa: F401,F403
+from theater_service_api.settings.base import INSTALLED_APPS, MIDDLEWARE
+
+# SECURITY WARNING: don't run with debug turned on in production!
+DEBUG = True
+
+INTERNAL_IPS = [
+    "127.0.0.1",
+]
+
+INSTALLED_APPS = INSTALLED_APPS + ["debug_toolbar"]
+
+# The toolbar goes right after the middleware that may alter the response
+# encoding, see the django-debug-toolbar installation docs
+MIDDLEWARE = MIDDLEWARE.copy()
+MIDDLEWARE.insert(
+    MIDDLEWARE.index("theater_service_api.middleware.ReplicaRoutingMiddleware")
+    + 1,
+    "debug_toolbar.middleware.DebugToolbarMiddleware",
+)
@@ -0,0 +1,91 @@
+"""
+Production profile for API workers.
+
+Workers only serve JSON, so the stack is trimmed to what the API needs:
+no debug toolbar, no browsable API, template loaders cached up front and
+the session, CSRF and message middleware only when the admin site is
+enabled with ``DJANGO_ADMIN_ENABLED``.
+"""
+
+import os
+
+from theater_service_api.settings.base import *  # noqa: F401,F403
+from theater_service_api.settings.base import (
+    INSTALLED_APPS,
+    REST_FRAMEWORK,
+    env_bool,
+)
+
+DEBUG = False
+
+ALLOWED_HOSTS = list(
+    filter(None, os.getenv("DJANGO_ALLOWED_HOSTS", "").split(","))
+)
+
+# Requires `manage.py build_schema` at deploy, the openapi check fails
+# startup otherwise
+OPENAPI_SCHEMA_CACHED = True
+
+ADMIN_ENABLED = env_bool("DJANGO_ADMIN_ENABLED")
+
+if not ADMIN_ENABLED:
+    INSTALLED_APPS = [
+        app
+        for app in INSTALLED_APPS
+        if app not in (
+            "django.contrib.admin",
+            "django.contrib.sessions",
+            "django.contrib.messages",
+        )
+    ]
+
+MIDDLEWARE = [
+    "django.middleware.security.SecurityMiddleware",
+    "theater_service_api.middleware.ReplicaRoutingMiddleware",
+    "django.middleware.common.CommonMiddleware",
+]
+
+if ADMIN_ENABLED:
+    MIDDLEWARE += [
+        "django.contrib.sessions.middleware.SessionMiddleware",
+        "django.middleware.csrf.CsrfViewMiddleware",
+        "django.contrib.auth.middleware.AuthenticationMiddleware",
+        "django.contrib.messages.middleware.MessageMiddleware",
+        "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    ]
+
+TEMPLATES = [
+    {
+        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "DIRS": [],
+        "OPTIONS": {
+            "context_processors": [
+                "django.template.context_processors.request",
+            ]
+            + (
+                [
+                    "django.contrib.auth.context_processors.auth",
+                    "django.contrib.messages.context_processors.messages",
+                ]
+                if ADMIN_ENABLED
+                else []
+            ),
+            "loaders": [
+                (
+                    "django.template.loaders.cached.Loader",
+                    [
+                        "django.template.loaders.filesystem.Loader",
+                        "django.template.loaders.app_directories.Loader",
+                    ],
+                ),
+            ],
+        },
+    },
+]
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    "DEFAULT_RENDERER_CLASSES": [
+        "rest_framework.renderers.JSONRenderer",
+    ],
+}
@@ -15,22 +15,32 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
+from django.apps import apps
 from django.conf import settings
 from django.conf.urls.static import static
-from django.contrib import admin
 from django.urls import path, include
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
+
+from theater_service_api.views import BatchView, lazy_view, schema_view
 
 urlpatterns = [
-    path("admin/", admin.site.urls),
     path("api/user/", include("user.urls", namespace="user")),
     path("api/theater/", include("theater.urls", namespace="theater")),
-    path("api/doc/", SpectacularAPIView.as_view(), name="schema"),
+    path("api/batch/", BatchView.as_view(), name="batch"),
+    path("api/doc/", schema_view, name="schema"),
     # Optional UI:
     path(
         "api/doc/swagger/",
-        SpectacularSwaggerView.as_view(url_name="schema"),
+        lazy_view(
+            "drf_spectacular.views.SpectacularSwaggerView", url_name="schema"
+        ),
         name="swagger",
     ),
-    path("__debug__/", include("debug_toolbar.urls")),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+
+if apps.is_installed("django.contrib.admin"):
+    from django.contrib import admin
+
+    urlpatterns.insert(0, path("admin/", admin.site.urls))
+
+if apps.is_installed("debug_toolbar"):
+    urlpatterns.append(path("__debug__/", include("debug_toolbar.urls")))
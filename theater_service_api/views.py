@@ -0,0 +1,126 @@
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+    quote_etag,
+)
+from django.utils.module_loading import import_string
+from django.views.decorators.http import require_safe
+from drf_spectacular.utils import extend_schema
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from theater_service_api.batch import (
+    BatchRequestSerializer,
+    BatchResponseSerializer,
+    run_batch,
+)
+from theater_service_api.db_router import reads_from_replica
+from theater_service_api.middleware import ReplicaRoutingMiddleware
+from theater_service_api.schema import (
+    SCHEMA_FORMATS,
+    load_manifest,
+    load_schema_file,
+)
+
+
+def lazy_view(view_path: str, **initkwargs):
+    """
+    Import a class-based view on its first request.
+
+    drf_spectacular pulls in the whole schema generator, which API workers
+    would otherwise load at startup just to serve the docs occasionally.
+    """
+    view = None
+
+    def dispatch(request, *args, **kwargs):
+        nonlocal view
+        if view is None:
+            view = import_string(view_path).as_view(**initkwargs)
+        return view(request, *args, **kwargs)
+
+    return dispatch
+
+
+live_schema_view = lazy_view("drf_spectacular.views.SpectacularAPIView")
+
+
+def _schema_format(request) -> str:
+    """YAML unless JSON is asked for, like SpectacularAPIView"""
+    requested = request.GET.get("format")
+    if requested in SCHEMA_FORMATS:
+        return requested
+    return "json" if "json" in request.headers.get("Accept", "") else "yaml"
+
+
+@require_safe
+def schema_view(request, *args, **kwargs):
+    """
+    Serve the schema prebuilt by ``manage.py build_schema``.
+
+    Clients that accept gzip get the precompressed file, and a matching
+    ``If-None-Match`` gets an empty 304. Without a prebuilt schema, or with
+    ``OPENAPI_SCHEMA_CACHED`` off as in development, the schema is
+    generated live.
+    """
+    manifest = load_manifest() if settings.OPENAPI_SCHEMA_CACHED else None
+    if manifest is None:
+        return live_schema_view(request, *args, **kwargs)
+
+    schema_format = _schema_format(request)
+    schema_file = manifest["files"][schema_format]
+    name = schema_file["name"]
+    etag = schema_file["etag"]
+
+    gzipped = "gzip" in request.headers.get("Accept-Encoding", "")
+    if gzipped:
+        name = f"{name}.gz"
+        etag = f"{etag}-gzip"
+
+    response = get_conditional_response(request, etag=quote_etag(etag))
+    if response is None:
+        response = HttpResponse(
+            load_schema_file(name),
+            content_type=SCHEMA_FORMATS[schema_format],
+        )
+        response.headers["ETag"] = quote_etag(etag)
+        if gzipped:
+            response.headers["Content-Encoding"] = "gzip"
+
+    patch_vary_headers(response, ["Accept", "Accept-Encoding"])
+    patch_cache_control(response, public=True, no_cache=True)
+    return response
+
+
+class BatchView(APIView):
+    """
+    Run up to ``BATCH_MAX_REQUESTS`` GET requests to the theater and user
+    APIs in one round trip and return their responses in order.
+    """
+
+    permission_classes = (IsAuthenticated,)
+    # Every sub-request is throttled by its own view
+    throttle_classes = ()
+
+    @extend_schema(
+        request=BatchRequestSerializer, responses=BatchResponseSerializer
+    )
+    def post(self, request):
+        serializer = BatchRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        batch = serializer.validated_data
+
+        # Only reads run, so neither stay on nor pin to the primary
+        request._request.read_only = True
+        pinned = ReplicaRoutingMiddleware.is_pinned(request)
+        with reads_from_replica(not pinned):
+            responses = run_batch(
+                request,
+                [item["url"] for item in batch["requests"]],
+                batch["parallel"],
+            )
+
+        return Response({"responses": responses})
@@ -0,0 +1,70 @@
+import copy
+import threading
+import time
+
+from django.conf import settings
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+
+class UserCache:
+    """Process-local cache of authenticated users with a short TTL"""
+
+    def __init__(self):
+        self._users = {}
+        self._lock = threading.Lock()
+
+    @property
+    def ttl(self) -> int:
+        return getattr(settings, "USER_CACHE_TTL", 0)
+
+    def get(self, user_id):
+        """Return a copy of the cached user or None if missing or expired"""
+        with self._lock:
+            entry = self._users.get(user_id)
+            if entry is None:
+                return None
+            expires_at, user = entry
+            if expires_at <= time.monotonic():
+                del self._users[user_id]
+                return None
+        return copy.copy(user)
+
+    def set(self, user) -> None:
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._users[user.pk] = (time.monotonic() + self.ttl, user)
+
+    def invalidate(self, user_id) -> None:
+        with self._lock:
+            self._users.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._users.clear()
+
+
+user_cache = UserCache()
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that avoids loading the user row where it can.
+
+    Users are served from the process-local cache, so a user is loaded at
+    most once per ``USER_CACHE_TTL`` seconds. The token's claims are not
+    trusted for ``is_staff`` or ``is_active``, a demoted or deactivated
+    user loses access once the cached instance expires rather than when
+    the token does.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        user = user_cache.get(user_id)
+
+        if user is None:
+            user = super().get_user(validated_token)
+            user_cache.set(user)
+
+        return user
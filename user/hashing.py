@@ -0,0 +1,76 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class HashingPoolBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = _("Service is busy, please retry shortly.")
+    default_code = "hashing_pool_busy"
+
+
+class HashingPool:
+    """
+    Bounded thread pool for password hashing.
+
+    hashlib releases the GIL while running PBKDF2, so hashing on a few
+    dedicated threads caps the CPU spent on logins and registrations and
+    leaves the rest for booking requests. Once ``MAX_WORKERS + MAX_QUEUE``
+    operations are in flight new ones are rejected with a 503 right away
+    instead of queueing behind the others.
+    """
+
+    def __init__(self):
+        self._executor = None
+        self._slots = None
+        self._timeout = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                config = getattr(settings, "PASSWORD_HASHING_POOL", {})
+                workers = config.get("MAX_WORKERS", 2)
+                self._slots = threading.BoundedSemaphore(
+                    workers + config.get("MAX_QUEUE", 8)
+                )
+                self._timeout = config.get("TIMEOUT", 10)
+                self._executor = ThreadPoolExecutor(
+                    max_workers=workers,
+                    thread_name_prefix="password-hashing",
+                )
+        return self._executor
+
+    def shutdown(self) -> None:
+        """Stop the worker threads, a new pool is created on next use"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+    def run(self, func, *args):
+        """Run func on the pool and wait for its result"""
+        executor = self._get_executor()
+
+        if not self._slots.acquire(blocking=False):
+            raise HashingPoolBusy()
+
+        try:
+            future = executor.submit(func, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+
+        future.add_done_callback(lambda _: self._slots.release())
+
+        try:
+            return future.result(timeout=self._timeout)
+        except TimeoutError:
+            raise HashingPoolBusy()
+
+
+hashing_pool = HashingPool()
@@ -1,8 +1,16 @@
+from django.contrib.auth.hashers import (
+    check_password,
+    get_hasher,
+    identify_hasher,
+    make_password,
+)
 from django.contrib.auth.models import AbstractUser
 from django.contrib.auth.models import UserManager as DjangoUserManager
 from django.db import models
 from django.utils.translation import gettext as _
 
+from user.hashing import hashing_pool
+
 
 class UserManager(DjangoUserManager):
     """Define a model manager for User model with no username field."""
@@ -51,3 +59,34 @@ class User(AbstractUser):
     REQUIRED_FIELDS = []
 
     objects = UserManager()
+
+    def set_password(self, raw_password):
+        """Hash the password on the bounded hashing pool."""
+
+        self.password = hashing_pool.run(make_password, raw_password)
+        self._password = raw_password
+
+    def check_password(self, raw_password):
+        """Verify the password on the bounded hashing pool."""
+
+        if not hashing_pool.run(check_password, raw_password, self.password):
+            return False
+
+        if self._password_hash_outdated():
+            self.set_password(raw_password)
+            self._password = None
+            self.save(update_fields=["password"])
+
+        return True
+
+    def _password_hash_outdated(self) -> bool:
+        try:
+            hasher = identify_hasher(self.password)
+        except ValueError:
+            return False
+
+        preferred = get_hasher("default")
+        return (
+            hasher.algorithm != preferred.algorithm
+            or preferred.must_update(self.password)
+        )
@@ -0,0 +1,116 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from theater.throttling import CounterRateThrottle
+from user.authentication import user_cache
+
+TOKEN_URL = reverse("user:token_obtain_pair")
+ME_URL = reverse("user:manage")
+GENRE_URL = reverse("theater:genre-list")
+SALES_URL = reverse("theater:sales-plays")
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    """Test JWT authentication with token claims and user cache"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.test_user = get_user_model().objects.create_user(
+            email="user@test.com", password="1qazcde3"
+        )
+        cls.test_admin = get_user_model().objects.create_user(
+            email="admin@test.com", password="1qazcde3", is_staff=True
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        user_cache.clear()
+        CounterRateThrottle.reset()
+        cache.clear()
+
+    def tearDown(self):
+        CounterRateThrottle.reset()
+        cache.clear()
+
+    def authenticate(self, email):
+        response = self.client.post(
+            TOKEN_URL, {"email": email, "password": "1qazcde3"}
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {response.data['access']}"
+        )
+        return response
+
+    def test_token_has_no_role_claim(self):
+        """Test that tokens carry no is_staff claim that could go stale"""
+        response = self.authenticate(self.test_admin.email)
+        token = AccessToken(response.data["access"])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("is_staff", token.payload)
+
+    def test_safe_request_served_from_cache(self):
+        """Test that read requests load the user once per cache period"""
+        self.authenticate(self.test_user.email)
+        self.client.get(GENRE_URL)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(GENRE_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(user_cache.get(self.test_user.id), self.test_user)
+
+    def test_demoted_staff_loses_admin_reads(self):
+        """Test that is_staff is read from the user, not the token"""
+        self.authenticate(self.test_admin.email)
+        self.assertEqual(
+            self.client.get(SALES_URL).status_code, status.HTTP_200_OK
+        )
+
+        get_user_model().objects.filter(id=self.test_admin.id).update(
+            is_staff=False
+        )
+        user_cache.clear()
+
+        self.assertEqual(
+            self.client.get(SALES_URL).status_code, status.HTTP_403_FORBIDDEN
+        )
+
+    def test_deactivated_user_rejected(self):
+        """Test that a valid token of a deactivated user is refused"""
+        self.authenticate(self.test_user.email)
+        get_user_model().objects.filter(id=self.test_user.id).update(
+            is_active=False
+        )
+
+        response = self.client.get(GENRE_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_unsafe_request_caches_user(self):
+        """Test that write requests load the user once and cache it"""
+        self.authenticate(self.test_admin.email)
+
+        response = self.client.post(GENRE_URL, {"name": "test_genre_1"})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(user_cache.get(self.test_admin.id), self.test_admin)
+
+        # Unique name check and insert, no user lookup
+        with self.assertNumQueries(2):
+            response = self.client.post(GENRE_URL, {"name": "test_genre_2"})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_user_update_invalidates_cache(self):
+        """Test that updating the profile drops the cached user"""
+        user_cache.set(self.test_user)
+        self.client.force_authenticate(user=self.test_user)
+
+        response = self.client.patch(ME_URL, {"email": "new@test.com"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(user_cache.get(self.test_user.id))
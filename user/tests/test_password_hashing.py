@@ -0,0 +1,74 @@
+import threading
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theater.throttling import CounterRateThrottle
+from user.hashing import HashingPool, HashingPoolBusy, hashing_pool
+
+CREATE_USER_URL = reverse("user:create")
+TOKEN_URL = reverse("user:token_obtain_pair")
+
+
+class HashingPoolTests(TestCase):
+    """Test the bounded password hashing pool"""
+
+    @override_settings(
+        PASSWORD_HASHING_POOL={"MAX_WORKERS": 1, "MAX_QUEUE": 0}
+    )
+    def test_pool_rejects_work_beyond_capacity(self):
+        """Test that a full pool sheds new work immediately"""
+        pool = HashingPool()
+        started = threading.Event()
+        release = threading.Event()
+
+        def block():
+            started.set()
+            release.wait(5)
+
+        worker = threading.Thread(target=pool.run, args=(block,))
+        worker.start()
+        started.wait(5)
+
+        with self.assertRaises(HashingPoolBusy):
+            pool.run(str, "test")
+
+        release.set()
+        worker.join()
+        self.assertEqual(pool.run(str, "test"), "test")
+        pool.shutdown()
+
+
+class HashingPoolApiTests(TestCase):
+    """Test that busy hashing pool returns 503 from auth endpoints"""
+
+    def setUp(self):
+        self.client = APIClient()
+        CounterRateThrottle.reset()
+        cache.clear()
+
+    def tearDown(self):
+        CounterRateThrottle.reset()
+        cache.clear()
+
+    @mock.patch.object(hashing_pool, "run", side_effect=HashingPoolBusy)
+    def test_register_returns_503_when_busy(self, _):
+        payload = {"email": "test@test.com", "password": "testpass"}
+        response = self.client.post(CREATE_USER_URL, payload)
+
+        self.assertEqual(
+            response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+
+    @mock.patch.object(hashing_pool, "run", side_effect=HashingPoolBusy)
+    def test_token_returns_503_when_busy(self, _):
+        payload = {"email": "test@test.com", "password": "testpass"}
+        response = self.client.post(TOKEN_URL, payload)
+
+        self.assertEqual(
+            response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE
+        )
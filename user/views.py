@@ -2,6 +2,7 @@ from rest_framework import generics
 from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated, AllowAny
 
+from user.authentication import user_cache
 from user.serializers import UserSerializer
 
 
@@ -17,3 +18,7 @@ class ManageUserView(generics.RetrieveUpdateAPIView):
 
     def get_object(self):
         return self.request.user
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        user_cache.invalidate(serializer.instance.pk)